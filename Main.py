@@ -1,14 +1,15 @@
 ﻿from models import Grafo
 from algorithms import bfs, dfs, camino_mas_corto, recomendar_amistades
+import utils
 from utils import (
     cargar_datos, 
     guardar_datos,
-    visualizar_grafo, 
     generar_datos_aleatorios,
-    mostrar_estadisticas
+    mostrar_estadisticas,
+    RegistroCambios
 )
 
-def interfaz_principal(grafo):
+def interfaz_principal(grafo, registro=None):
     """Interfaz de usuario para interactuar con el sistema"""
     while True:
         print("\n" + "="*60)
@@ -182,8 +183,16 @@ def interfaz_principal(grafo):
             if not grafo.estudiantes:
                 print("Error: No hay estudiantes para visualizar")
             else:
+                nucleo_minimo = None
+                esqueleto = False
+                if len(grafo.estudiantes) > 200:
+                    # En redes grandes el dibujo completo es ilegible: ofrecer solo el nucleo
+                    k = input("Red grande. Mostrar solo el k-nucleo con k >= [todo]: ").strip()
+                    nucleo_minimo = int(k) if k.isdigit() else None
+                    esqueleto = input("Mostrar solo las amistades mas fuertes (esqueleto)? (s/n): ").strip().lower() == 's'
                 print("Generando visualizacion...")
-                visualizar_grafo(grafo)
+                # matplotlib y NetworkX se cargan recien aqui
+                utils.visualizar_grafo(grafo, nucleo_minimo=nucleo_minimo, esqueleto=esqueleto)
 
         elif opcion == '14':
             print("\n--- Generar Datos Aleatorios ---")
@@ -200,8 +209,7 @@ def interfaz_principal(grafo):
                     densidad = 0.15
                 
                 # Limpiar grafo actual
-                grafo.estudiantes.clear()
-                grafo.adj_list.clear()
+                grafo.limpiar()
                 
                 generar_datos_aleatorios(grafo, num_est, densidad)
                 print("\nDatos aleatorios generados exitosamente")
@@ -217,7 +225,13 @@ def interfaz_principal(grafo):
 
         elif opcion == '0':
             print("\nCerrando sistema...")
-            guardar = input("Guardar cambios antes de salir? (s/n): ").strip().lower()
+            if registro is not None:
+                # Los cambios ya estan en el registro; solo falta sincronizarlo
+                registro.cerrar()
+                print("Cambios guardados en el registro")
+                guardar = input("Exportar tambien a CSV antes de salir? (s/n): ").strip().lower()
+            else:
+                guardar = input("Guardar cambios antes de salir? (s/n): ").strip().lower()
             if guardar == 's':
                 guardar_datos(grafo)
             print("Hasta luego!")
@@ -233,9 +247,12 @@ def main():
     print("="*60)
     
     red_universitaria = Grafo()
+    registro = RegistroCambios('red_universitaria.wal', 'red_universitaria_snapshot.json')
     
-    # Intentar cargar datos existentes
-    if not cargar_datos(red_universitaria, 'estudiantes.csv', 'amistades.csv'):
+    # Intentar cargar datos existentes (registro de cambios o CSV)
+    if registro.existe():
+        registro.recuperar(red_universitaria)
+    elif not cargar_datos(red_universitaria, 'estudiantes.csv', 'amistades.csv'):
         print("\nNo se encontraron archivos de datos.")
         opcion = input("Generar datos aleatorios para pruebas? (s/n): ").strip().lower()
         if opcion == 's':
@@ -246,8 +263,12 @@ def main():
     
     print(f"\nRed cargada: {len(red_universitaria.estudiantes)} estudiantes")
     
+    # Registrar cada cambio a partir de aqui
+    if not registro.iniciar(red_universitaria):
+        registro = None
+    
     # Ejecutar interfaz
-    interfaz_principal(red_universitaria)
+    interfaz_principal(red_universitaria, registro)
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,53 @@
-from .busqueda import bfs, dfs, camino_mas_corto
-from .recomendacion import recomendar_amistades, recomendar_por_intereses
-from .comunidades import detectar_comunidades_louvain, estadisticas_comunidades
-from .centralidad import (
-    calcular_centralidad_grado,
-    calcular_centralidad_intermediacion,
-    calcular_centralidad_cercania,
-    calcular_centralidad_eigenvector,
-    obtener_nodos_mas_centrales
-)
+"""
+Algoritmos sobre el grafo
 
-__all__ = [
-    'bfs', 'dfs', 'camino_mas_corto', 
-    'recomendar_amistades', 'recomendar_por_intereses',
-    'detectar_comunidades_louvain', 'estadisticas_comunidades',
-    'calcular_centralidad_grado', 'calcular_centralidad_intermediacion',
-    'calcular_centralidad_cercania', 'calcular_centralidad_eigenvector',
-    'obtener_nodos_mas_centrales'
-]
+Los modulos se importan al usar sus nombres por primera vez, asi NetworkX
+y NumPy solo se cargan si se usa un algoritmo que los necesita.
+"""
+from utils.exportaciones import exportar_perezoso
+
+# Nombre exportado -> modulo que lo define
+_EXPORTACIONES = {
+    'bfs': '.busqueda',
+    'dfs': '.busqueda',
+    'camino_mas_corto': '.busqueda',
+    'recomendar_amistades': '.recomendacion',
+    'recomendar_por_intereses': '.recomendacion',
+    'detectar_comunidades_louvain': '.comunidades',
+    'detectar_comunidades_paralelo': '.comunidades',
+    'louvain_multinivel': '.comunidades',
+    'estadisticas_comunidades': '.comunidades',
+    'grafo_cociente': '.comunidades',
+    'ComunidadesIncrementales': '.comunidades_incrementales',
+    'detectar_comunidades_propagacion': '.propagacion_etiquetas',
+    'guardar_etiquetas_csv': '.propagacion_etiquetas',
+    'cargar_etiquetas_csv': '.propagacion_etiquetas',
+    'calcular_centralidad_grado': '.centralidad',
+    'calcular_centralidad_intermediacion': '.centralidad',
+    'calcular_centralidad_cercania': '.centralidad',
+    'calcular_centralidad_eigenvector': '.centralidad',
+    'obtener_nodos_mas_centrales': '.centralidad',
+    'contar_triangulos': '.estructura',
+    'coeficientes_clustering': '.estructura',
+    'distribucion_grados': '.estructura',
+    'asortatividad_grados': '.estructura',
+    'diametro_efectivo': '.estructura',
+    'metricas_estructurales': '.estructura',
+    'descomponer_nucleos': '.nucleos',
+    'subgrafo_nucleo': '.nucleos',
+    'distribucion_nucleos': '.nucleos',
+    'NucleosIncrementales': '.nucleos',
+    'bosque_expansion_maximo': '.esqueleto',
+    'significancia_disparidad': '.esqueleto',
+    'filtro_disparidad': '.esqueleto',
+    'extraer_esqueleto': '.esqueleto',
+    'hyperanf': '.hyperanf',
+    'top_k': '.ranking',
+    'Clasificacion': '.ranking',
+    'ClasificacionGrado': '.ranking',
+    'ClasificacionCentralidad': '.ranking',
+}
+
+__all__ = list(_EXPORTACIONES)
+__getattr__, __dir__ = exportar_perezoso(__name__, _EXPORTACIONES)
+del exportar_perezoso
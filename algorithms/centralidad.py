@@ -1,4 +1,5 @@
 import networkx as nx
+from .ranking import top_k
 
 def calcular_centralidad_grado(grafo):
     """Calcula la centralidad de grado para cada nodo"""
@@ -52,4 +53,4 @@ def calcular_centralidad_eigenvector(grafo):
 
 def obtener_nodos_mas_centrales(centralidad, top_n=5):
     """Retorna los top N nodos mas centrales"""
-    return sorted(centralidad.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    return top_k(centralidad.items(), top_n, clave=lambda x: x[1])
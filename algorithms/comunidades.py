@@ -1,65 +1,293 @@
 """
 Algoritmo de deteccion de comunidades usando Louvain
 """
-import networkx as nx
-from collections import defaultdict
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
-def detectar_comunidades_louvain(grafo):
+from models.csr import GrafoCSR
+from models.grafo import Grafo
+from .louvain import louvain_csr
+
+def _etiquetas_por_tamano(comunidad):
+    """Renumera las comunidades de mayor a menor tamano (0 = la mas grande)"""
+    tamanos = np.bincount(comunidad)
+    orden = np.argsort(-tamanos, kind='stable')
+    nuevas = np.empty_like(orden)
+    nuevas[orden] = np.arange(len(orden))
+    return nuevas[comunidad]
+
+def louvain_multinivel(grafo, resolucion=1.0, semilla=0, max_niveles=None, refinar=False):
+    """
+    Ejecuta Louvain multinivel y retorna la jerarquia completa
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        resolucion: Parametro gamma de la modularidad (mayor = comunidades mas pequenas)
+        semilla: Semilla del orden de visita, el resultado es determinista
+        max_niveles: Limite de niveles de agregacion (None = hasta converger)
+        refinar: Si aplicar el refinamiento de Leiden en cada nivel
+    
+    Retorna diccionario con:
+        'particion': {id_estudiante: comunidad} del ultimo nivel
+        'dendrograma': lista con la particion {id_estudiante: comunidad} de cada nivel
+        'modularidades': modularidad de cada nivel
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    niveles, modularidades = louvain_csr(
+        csr.offsets, csr.vecinos, csr.pesos,
+        resolucion=resolucion, semilla=semilla,
+        max_niveles=max_niveles, refinar=refinar
+    )
+    
+    dendrograma = []
+    for comunidad in niveles:
+        etiquetas = _etiquetas_por_tamano(comunidad).tolist()
+        dendrograma.append(dict(zip(csr.ids, etiquetas)))
+    
+    return {
+        'particion': dendrograma[-1] if dendrograma else {},
+        'dendrograma': dendrograma,
+        'modularidades': modularidades
+    }
+
+def _louvain_lote(subgrafos, parametros):
+    """Ejecuta Louvain sobre cada subgrafo de un lote (funcion de los procesos hijos)"""
+    resultados = []
+    for offsets, vecinos, pesos in subgrafos:
+        niveles, _ = louvain_csr(offsets, vecinos, pesos, **parametros)
+        resultados.append(niveles[-1])
+    return resultados
+
+def detectar_comunidades_paralelo(grafo, procesos=None, min_tamano_paralelo=5000, resolucion=1.0,
+                                  semilla=0, max_niveles=None, refinar=False):
+    """
+    Detecta comunidades por componente conexa usando varios procesos
+    
+    Las componentes con al menos min_tamano_paralelo nodos se envian cada
+    una a un proceso; las mas pequenas se agrupan en lotes de tamano similar
+    para no pagar el costo de un proceso por componente. Los nodos aislados
+    forman su propia comunidad sin ejecutar Louvain. La modularidad se
+    optimiza dentro de cada componente.
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        procesos: Numero de procesos (None = numero de CPUs)
+        min_tamano_paralelo: Tamano desde el cual una componente va en su propia tarea
+        resolucion, semilla, max_niveles, refinar: Ver louvain_multinivel
+    
+    Retorna diccionario con id_estudiante: comunidad (0 = la mas grande)
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    n = csr.num_nodos
+    if n == 0:
+        return {}
+    
+    componente = csr.componentes()
+    orden = np.argsort(componente, kind='stable')
+    _, inicios, tamanos = np.unique(componente[orden], return_index=True, return_counts=True)
+    
+    # Separar componentes grandes, pequenas y nodos aislados
+    tareas = []
+    lote = []
+    nodos_lote = []
+    tamano_lote = 0
+    resultado = np.full(n, -1, dtype=np.int64)
+    siguiente = 0
+    for inicio, tamano in zip(inicios.tolist(), tamanos.tolist()):
+        nodos = orden[inicio:inicio + tamano]
+        if tamano == 1:
+            resultado[nodos] = siguiente
+            siguiente += 1
+        elif tamano >= min_tamano_paralelo:
+            tareas.append(([nodos], [csr.subgrafo(nodos)]))
+        else:
+            nodos_lote.append(nodos)
+            lote.append(csr.subgrafo(nodos))
+            tamano_lote += tamano
+            if tamano_lote >= min_tamano_paralelo:
+                tareas.append((nodos_lote, lote))
+                lote, nodos_lote, tamano_lote = [], [], 0
+    if lote:
+        tareas.append((nodos_lote, lote))
+    
+    parametros = {
+        'resolucion': resolucion, 'semilla': semilla,
+        'max_niveles': max_niveles, 'refinar': refinar
+    }
+    if len(tareas) > 1 and procesos != 1:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(_louvain_lote, subgrafos, parametros) for _, subgrafos in tareas]
+            etiquetas = [futuro.result() for futuro in futuros]
+    else:
+        etiquetas = [_louvain_lote(subgrafos, parametros) for _, subgrafos in tareas]
+    
+    # Unir las etiquetas locales en una numeracion global unica
+    for (grupos, _), etiquetas_tarea in zip(tareas, etiquetas):
+        for nodos, comunidad in zip(grupos, etiquetas_tarea):
+            resultado[nodos] = comunidad + siguiente
+            siguiente += int(comunidad.max()) + 1
+    
+    return dict(zip(csr.ids, _etiquetas_por_tamano(resultado).tolist()))
+
+def detectar_comunidades_louvain(grafo, resolucion=1.0, semilla=0, max_niveles=None, refinar=False, procesos=1):
     """
     Detecta comunidades en el grafo usando el algoritmo de Louvain
     Retorna diccionario con id_estudiante: comunidad
+    
+    Las comunidades se numeran de mayor a menor tamano. Ver
+    louvain_multinivel para el significado de los parametros. Con
+    procesos distinto de 1 cada componente conexa se procesa por separado
+    en paralelo (ver detectar_comunidades_paralelo).
     """
     if not grafo.estudiantes:
         return {}
     
-    # Crear grafo de NetworkX
-    G = nx.Graph()
-    
-    for id_est in grafo.estudiantes:
-        G.add_node(id_est)
-    
-    for id1 in grafo.adj_list:
-        for id2, peso in grafo.adj_list[id1].items():
-            G.add_edge(id1, id2, weight=peso)
-    
-    # Usar algoritmo de Louvain (greedy modularity)
-    try:
-        from networkx.algorithms import community
-        comunidades = community.greedy_modularity_communities(G, weight='weight')
-        
-        # Convertir a diccionario
-        resultado = {}
-        for i, comunidad in enumerate(comunidades):
-            for nodo in comunidad:
-                resultado[nodo] = i
-        
-        return resultado
-    except ImportError:
-        # Fallback: usar componentes conectados
-        componentes = nx.connected_components(G)
-        resultado = {}
-        for i, componente in enumerate(componentes):
-            for nodo in componente:
-                resultado[nodo] = i
-        return resultado
+    if procesos != 1:
+        return detectar_comunidades_paralelo(
+            grafo, procesos=procesos, resolucion=resolucion, semilla=semilla,
+            max_niveles=max_niveles, refinar=refinar
+        )
+    
+    return louvain_multinivel(
+        grafo, resolucion=resolucion, semilla=semilla,
+        max_niveles=max_niveles, refinar=refinar
+    )['particion']
+
+def _codificar_comunidades(csr, comunidades):
+    """
+    Convierte el diccionario de comunidades a arreglos
+    
+    Retorna (etiquetas, nodos, codigo_nodo, codigo_por_nodo): las etiquetas
+    en orden de primera aparicion, los indices CSR de cada estudiante de
+    `comunidades`, el codigo de comunidad de cada uno y un arreglo con el
+    codigo de cada nodo del grafo (-1 si no tiene comunidad).
+    """
+    codigos = {}
+    nodos = np.fromiter((csr.indice[id_est] for id_est in comunidades), dtype=np.int64, count=len(comunidades))
+    codigo_nodo = np.fromiter(
+        (codigos.setdefault(c, len(codigos)) for c in comunidades.values()),
+        dtype=np.int64, count=len(comunidades)
+    )
+    codigo_por_nodo = np.full(csr.num_nodos, -1, dtype=np.int64)
+    codigo_por_nodo[nodos] = codigo_nodo
+    return list(codigos), nodos, codigo_nodo, codigo_por_nodo
 
 def estadisticas_comunidades(grafo, comunidades):
     """
     Calcula estadisticas sobre las comunidades detectadas
+    
+    Todas las metricas se obtienen en una pasada vectorizada sobre las
+    aristas. Para cada comunidad retorna:
+        tamano, carreras ({carrera: cantidad}), miembros (lista de IDs),
+        peso_interno: Suma de pesos de amistades dentro de la comunidad
+        peso_externo: Suma de pesos de amistades hacia otras comunidades
+        conductancia: peso_externo / min(volumen, volumen del resto)
+        densidad: Amistades internas / amistades posibles entre sus miembros
+        contribucion_modularidad: Aporte de la comunidad a la modularidad
     """
     if not comunidades:
         return {}
     
-    stats = defaultdict(lambda: {
-        'tamano': 0,
-        'carreras': defaultdict(int),
-        'miembros': []
-    })
+    csr = GrafoCSR.desde_grafo(grafo)
+    etiquetas, nodos, codigo_nodo, codigo_por_nodo = _codificar_comunidades(csr, comunidades)
+    k = len(etiquetas)
+    
+    # Tamano, miembros y carreras
+    tamanos = np.bincount(codigo_nodo, minlength=k)
+    orden = np.argsort(codigo_nodo, kind='stable')
+    cortes = np.cumsum(tamanos)[:-1]
+    ids = list(comunidades)
+    miembros = [[ids[i] for i in grupo] for grupo in np.split(orden, cortes)]
+    
+    carreras_idx = {}
+    codigo_carrera = np.fromiter(
+        (carreras_idx.setdefault(grafo.estudiantes[id_est]['carrera'], len(carreras_idx)) for id_est in ids),
+        dtype=np.int64, count=len(ids)
+    )
+    nombres_carreras = list(carreras_idx)
+    conteo_carreras = np.bincount(
+        codigo_nodo * len(nombres_carreras) + codigo_carrera, minlength=k * len(nombres_carreras)
+    ).reshape(k, len(nombres_carreras))
+    
+    # Pesos internos y externos en una pasada sobre las aristas
+    origen, destino, pesos = csr.aristas()
+    cu = codigo_por_nodo[origen]
+    cv = codigo_por_nodo[destino]
+    validas = (cu >= 0) & (cv >= 0)
+    cu, cv, pesos = cu[validas], cv[validas], pesos[validas]
+    internas = cu == cv
+    lazos = origen[validas] == destino[validas]
+    peso_interno = np.bincount(cu[internas], weights=pesos[internas], minlength=k)
+    aristas_internas = np.bincount(cu[internas & ~lazos], minlength=k)
+    peso_externo = (
+        np.bincount(cu[~internas], weights=pesos[~internas], minlength=k)
+        + np.bincount(cv[~internas], weights=pesos[~internas], minlength=k)
+    )
+    
+    volumen = 2 * peso_interno + peso_externo
+    volumen_total = volumen.sum()
+    m = volumen_total / 2
+    
+    stats = {}
+    for c, etiqueta in enumerate(etiquetas):
+        n_c = int(tamanos[c])
+        posibles = n_c * (n_c - 1) / 2
+        denominador = min(volumen[c], volumen_total - volumen[c])
+        stats[etiqueta] = {
+            'tamano': n_c,
+            'carreras': {
+                nombres_carreras[j]: int(conteo_carreras[c, j])
+                for j in np.flatnonzero(conteo_carreras[c])
+            },
+            'miembros': miembros[c],
+            'peso_interno': float(peso_interno[c]),
+            'peso_externo': float(peso_externo[c]),
+            'conductancia': float(peso_externo[c] / denominador) if denominador > 0 else 0.0,
+            'densidad': float(aristas_internas[c] / posibles) if posibles > 0 else 0.0,
+            'contribucion_modularidad': (
+                float(peso_interno[c] / m - (volumen[c] / volumen_total) ** 2) if m > 0 else 0.0
+            )
+        }
+    
+    return stats
+
+def grafo_cociente(grafo, comunidades, incluir_internas=False):
+    """
+    Construye el grafo cociente donde cada comunidad es un nodo
+    
+    El peso de la amistad entre dos comunidades es la suma de los pesos de
+    las amistades entre sus miembros. Cada nodo usa la etiqueta de la
+    comunidad como ID, la carrera predominante como carrera y guarda el
+    numero de miembros en 'tamano'.
+    
+    Args:
+        grafo: Instancia del grafo
+        comunidades: Diccionario id_estudiante: comunidad
+        incluir_internas: Si agregar un lazo con el peso interno de cada comunidad
+    """
+    cociente = Grafo()
+    if not comunidades:
+        return cociente
+    
+    stats = estadisticas_comunidades(grafo, comunidades)
+    for etiqueta, info in stats.items():
+        carrera = max(info['carreras'].items(), key=lambda x: x[1])[0]
+        cociente.agregar_estudiante(etiqueta, f"Comunidad-{etiqueta}", carrera)
+        cociente.estudiantes[etiqueta]['tamano'] = info['tamano']
+        if incluir_internas and info['peso_interno'] > 0:
+            cociente.agregar_amistad(etiqueta, etiqueta, info['peso_interno'])
     
-    for id_est, comunidad in comunidades.items():
-        stats[comunidad]['tamano'] += 1
-        stats[comunidad]['miembros'].append(id_est)
-        carrera = grafo.estudiantes[id_est]['carrera']
-        stats[comunidad]['carreras'][carrera] += 1
+    csr = GrafoCSR.desde_grafo(grafo)
+    etiquetas, _, _, codigo_por_nodo = _codificar_comunidades(csr, comunidades)
+    origen, destino, pesos = csr.aristas()
+    cu = codigo_por_nodo[origen]
+    cv = codigo_por_nodo[destino]
+    mascara = (cu >= 0) & (cv >= 0) & (cu != cv)
+    k = len(etiquetas)
+    claves = np.minimum(cu[mascara], cv[mascara]) * k + np.maximum(cu[mascara], cv[mascara])
+    unicas, inversa = np.unique(claves, return_inverse=True)
+    sumas = np.bincount(inversa, weights=pesos[mascara])
+    for clave, peso in zip(unicas.tolist(), sumas.tolist()):
+        cociente.agregar_amistad(etiquetas[clave // k], etiquetas[clave % k], peso)
     
-    return dict(stats)
+    return cociente
@@ -0,0 +1,221 @@
+"""
+Mantenimiento incremental de comunidades ante cambios en las amistades
+"""
+from collections import deque
+
+from .comunidades import detectar_comunidades_louvain
+
+class ComunidadesIncrementales:
+    """
+    Mantiene una particion en comunidades al dia con el grafo
+    
+    Se registra como observador del grafo. Cada cambio de amistad actualiza
+    los totales de peso por comunidad y reevalua solo los nodos afectados
+    con movimientos de ganancia de modularidad (como la fase local de
+    Louvain). Si la modularidad cae por debajo de (1 - umbral) veces la
+    obtenida en el ultimo calculo completo, se recalcula todo con Louvain.
+    
+    Args:
+        grafo: Instancia del grafo a seguir
+        resolucion: Parametro gamma de la modularidad
+        umbral: Caida relativa de modularidad tolerada antes de recalcular
+        max_visitas: Maximo de nodos reevaluados por cada cambio
+        semilla: Semilla usada en los recalculos completos
+    """
+    
+    def __init__(self, grafo, resolucion=1.0, umbral=0.05, max_visitas=100, semilla=0):
+        self.grafo = grafo
+        self.resolucion = resolucion
+        self.umbral = umbral
+        self.max_visitas = max_visitas
+        self.semilla = semilla
+        self.recalculos = 0
+        self.recalcular()
+        grafo.registrar_observador(self._al_modificar)
+    
+    def cerrar(self):
+        """Deja de seguir las modificaciones del grafo"""
+        self.grafo.eliminar_observador(self._al_modificar)
+    
+    def recalcular(self):
+        """Recalcula la particion completa con Louvain y reinicia los totales"""
+        self.particion = dict(detectar_comunidades_louvain(
+            self.grafo, resolucion=self.resolucion, semilla=self.semilla
+        ))
+        self._siguiente = max(self.particion.values(), default=-1) + 1
+        self.fuerza = {}
+        self.total = {}
+        self.interno = {}
+        self.m2 = 0.0
+        self._suma_interno = 0.0
+        self._suma_total2 = 0.0
+        
+        for id_est in self.grafo.estudiantes:
+            c = self.particion[id_est]
+            k = 0.0
+            for amigo_id, peso in self.grafo.adj_list[id_est].items():
+                aporte = 2 * peso if amigo_id == id_est else peso
+                k += aporte
+                if self.particion[amigo_id] == c:
+                    self.interno[c] = self.interno.get(c, 0.0) + aporte
+            self.fuerza[id_est] = k
+            self.total[c] = self.total.get(c, 0.0) + k
+            self.m2 += k
+        
+        self._suma_interno = sum(self.interno.values())
+        self._suma_total2 = sum(t * t for t in self.total.values())
+        self.modularidad_base = self.modularidad()
+        self.recalculos += 1
+    
+    def modularidad(self):
+        """Modularidad de la particion actual, en O(1)"""
+        if self.m2 == 0:
+            return 0.0
+        return self._suma_interno / self.m2 - self.resolucion * self._suma_total2 / (self.m2 * self.m2)
+    
+    def obtener_comunidades(self):
+        """Retorna {id_estudiante: comunidad} con comunidades numeradas 0..k-1"""
+        etiquetas = {}
+        return {
+            id_est: etiquetas.setdefault(c, len(etiquetas))
+            for id_est, c in self.particion.items()
+        }
+    
+    # Actualizacion de totales
+    
+    def _sumar_total(self, c, delta):
+        anterior = self.total.get(c, 0.0)
+        nuevo = anterior + delta
+        self._suma_total2 += nuevo * nuevo - anterior * anterior
+        self.total[c] = nuevo
+    
+    def _sumar_interno(self, c, delta):
+        self.interno[c] = self.interno.get(c, 0.0) + delta
+        self._suma_interno += delta
+    
+    def _cambiar_peso(self, id1, id2, delta):
+        """Aplica a los totales el cambio de peso delta en la amistad id1-id2"""
+        if id1 == id2:
+            delta *= 2
+            self.fuerza[id1] += delta
+            self._sumar_total(self.particion[id1], delta)
+            self._sumar_interno(self.particion[id1], delta)
+            self.m2 += delta
+            return
+        c1 = self.particion[id1]
+        c2 = self.particion[id2]
+        self.fuerza[id1] += delta
+        self.fuerza[id2] += delta
+        self._sumar_total(c1, delta)
+        self._sumar_total(c2, delta)
+        if c1 == c2:
+            self._sumar_interno(c1, 2 * delta)
+        self.m2 += 2 * delta
+    
+    # Movimientos locales
+    
+    def _pesos_por_comunidad(self, id_est):
+        pesos = {}
+        lazo = 0.0
+        for amigo_id, peso in self.grafo.adj_list[id_est].items():
+            if amigo_id == id_est:
+                lazo = 2 * peso
+            else:
+                c = self.particion[amigo_id]
+                pesos[c] = pesos.get(c, 0.0) + peso
+        return pesos, lazo
+    
+    def _mover(self, id_est, destino, pesos, lazo):
+        origen = self.particion[id_est]
+        k = self.fuerza[id_est]
+        self._sumar_total(origen, -k)
+        self._sumar_interno(origen, -(2 * pesos.get(origen, 0.0) + lazo))
+        self._sumar_total(destino, k)
+        self._sumar_interno(destino, 2 * pesos.get(destino, 0.0) + lazo)
+        self.particion[id_est] = destino
+        self._descartar_si_vacia(origen)
+    
+    def _descartar_si_vacia(self, c):
+        if abs(self.total.get(c, 0.0)) < 1e-12 and abs(self.interno.get(c, 0.0)) < 1e-12:
+            self.total.pop(c, None)
+            self.interno.pop(c, None)
+    
+    def _reevaluar(self, nodos):
+        """Mueve los nodos dados (y en cascada sus vecinos) si mejora la modularidad"""
+        if self.m2 == 0:
+            return
+        cola = deque(n for n in dict.fromkeys(nodos) if n in self.particion)
+        en_cola = set(cola)
+        visitas = 0
+        factor = self.resolucion / self.m2
+        while cola and visitas < self.max_visitas:
+            id_est = cola.popleft()
+            en_cola.discard(id_est)
+            visitas += 1
+            
+            actual = self.particion[id_est]
+            k = self.fuerza[id_est]
+            pesos, lazo = self._pesos_por_comunidad(id_est)
+            total_actual = self.total.get(actual, 0.0) - k
+            mejor = actual
+            mejor_ganancia = pesos.get(actual, 0.0) - total_actual * k * factor
+            for c, peso_c in pesos.items():
+                if c == actual:
+                    continue
+                ganancia = peso_c - self.total.get(c, 0.0) * k * factor
+                if ganancia > mejor_ganancia + 1e-12:
+                    mejor = c
+                    mejor_ganancia = ganancia
+            # Quedar solo en una comunidad nueva tiene ganancia 0
+            if mejor_ganancia < -1e-12 and total_actual > 0:
+                mejor = self._siguiente
+                self._siguiente += 1
+            
+            if mejor != actual:
+                self._mover(id_est, mejor, pesos, lazo)
+                for amigo_id in self.grafo.adj_list[id_est]:
+                    if amigo_id not in en_cola and self.particion.get(amigo_id) != mejor:
+                        en_cola.add(amigo_id)
+                        cola.append(amigo_id)
+    
+    def _verificar_calidad(self):
+        base = self.modularidad_base
+        if base > 0 and self.modularidad() < (1 - self.umbral) * base:
+            self.recalcular()
+    
+    def _al_modificar(self, evento, *datos):
+        if evento == 'agregar_estudiante':
+            id_est = datos[0]
+            self.particion[id_est] = self._siguiente
+            self._siguiente += 1
+            self.fuerza[id_est] = 0.0
+            return
+        if evento == 'limpiar':
+            self.recalcular()
+            return
+        
+        if evento == 'eliminar_estudiante':
+            id_est, amigos = datos
+            for amigo_id, peso in amigos.items():
+                self._cambiar_peso(id_est, amigo_id, -peso)
+            c = self.particion.pop(id_est)
+            self.fuerza.pop(id_est)
+            self._descartar_si_vacia(c)
+            afectados = [amigo_id for amigo_id in amigos if amigo_id != id_est]
+        elif evento == 'agregar_amistad':
+            id1, id2, peso = datos
+            self._cambiar_peso(id1, id2, peso)
+            afectados = [id1, id2]
+        elif evento == 'actualizar_peso_amistad':
+            id1, id2, nuevo_peso, peso_anterior = datos
+            self._cambiar_peso(id1, id2, nuevo_peso - peso_anterior)
+            afectados = [id1, id2]
+        elif evento == 'eliminar_amistad':
+            id1, id2, peso = datos
+            self._cambiar_peso(id1, id2, -peso)
+            afectados = [id1, id2]
+        else:
+            return
+        
+        self._reevaluar(afectados)
+        self._verificar_calidad()
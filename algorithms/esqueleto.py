@@ -0,0 +1,142 @@
+"""
+Extraccion del esqueleto de amistades mas fuertes
+
+En redes grandes casi todas las amistades son debiles y dibujarlas o
+analizarlas todas oculta la estructura. El esqueleto conserva:
+- El bosque de expansion maximo (Kruskal con union-find): N - C amistades
+  que mantienen conectada cada componente usando los pesos mas altos.
+- Las amistades significativas segun el filtro de disparidad (Serrano,
+  Boguna y Vespignani, 2009): las que concentran mas peso del que se
+  esperaria si la fuerza de un estudiante se repartiera al azar entre
+  sus amigos.
+"""
+
+def _aristas_unicas(grafo):
+    """Lista de (id1, id2, peso) con cada amistad una vez, sin lazos"""
+    indice = {id_est: i for i, id_est in enumerate(grafo.estudiantes)}
+    return [
+        (id_est, amigo_id, peso)
+        for id_est in grafo.estudiantes
+        for amigo_id, peso in grafo.adj_list[id_est].items()
+        if indice[id_est] < indice[amigo_id]
+    ]
+
+def bosque_expansion_maximo(grafo):
+    """
+    Calcula el bosque de expansion de peso maximo (Kruskal)
+    
+    Las amistades se recorren de mayor a menor peso y se conserva cada una
+    que une dos grupos todavia separados, usando union-find con union por
+    tamano y compresion de caminos. Costo O(E log E).
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR / VistaSubgrafo)
+    
+    Retorna lista de (id1, id2, peso) con N - (numero de componentes) amistades.
+    """
+    aristas = _aristas_unicas(grafo)
+    # sort es estable: ante igual peso se respeta el orden de la red
+    aristas.sort(key=lambda arista: arista[2], reverse=True)
+    
+    padre = {id_est: id_est for id_est in grafo.estudiantes}
+    tamano = dict.fromkeys(padre, 1)
+    
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+    
+    bosque = []
+    objetivo = len(padre) - 1
+    for id1, id2, peso in aristas:
+        r1 = raiz(id1)
+        r2 = raiz(id2)
+        if r1 == r2:
+            continue
+        if tamano[r1] < tamano[r2]:
+            r1, r2 = r2, r1
+        padre[r2] = r1
+        tamano[r1] += tamano[r2]
+        bosque.append((id1, id2, peso))
+        if len(bosque) == objetivo:
+            break
+    return bosque
+
+def significancia_disparidad(grafo):
+    """
+    Calcula el valor p del filtro de disparidad de cada amistad
+    
+    Para un estudiante con k amigos y fuerza s (suma de pesos), la
+    probabilidad de que una amistad de peso w reciba una fraccion p = w / s
+    o mayor bajo reparto uniforme es (1 - p) ** (k - 1). Se toma el menor
+    valor de los dos extremos; los estudiantes con un solo amigo no
+    aportan evidencia (valor 1).
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR / VistaSubgrafo)
+    
+    Retorna lista de (id1, id2, peso, valor_p).
+    """
+    grado = {}
+    fuerza = {}
+    for id_est in grafo.estudiantes:
+        k = 0
+        s = 0
+        for amigo_id, peso in grafo.adj_list[id_est].items():
+            if amigo_id != id_est:
+                k += 1
+                s += peso
+        grado[id_est] = k
+        fuerza[id_est] = s
+    
+    def valor_p(id_est, peso):
+        k = grado[id_est]
+        if k <= 1 or fuerza[id_est] <= 0:
+            return 1.0
+        return (1 - peso / fuerza[id_est]) ** (k - 1)
+    
+    return [
+        (id1, id2, peso, min(valor_p(id1, peso), valor_p(id2, peso)))
+        for id1, id2, peso in _aristas_unicas(grafo)
+    ]
+
+def filtro_disparidad(grafo, alfa=0.05):
+    """
+    Retorna las amistades significativas, [(id1, id2, peso)], con valor p < alfa
+    
+    Args:
+        grafo: Instancia del grafo
+        alfa: Nivel de significancia (menor = esqueleto mas pequeno)
+    """
+    return [(id1, id2, peso) for id1, id2, peso, p in significancia_disparidad(grafo) if p < alfa]
+
+def extraer_esqueleto(grafo, alfa=0.05, bosque=True):
+    """
+    Construye un Grafo con todos los estudiantes y solo las amistades del esqueleto
+    
+    El resultado tiene del orden de N amistades en lugar de E y puede
+    pasarse a la visualizacion, al reporte PDF o a la deteccion de
+    comunidades como cualquier otro grafo.
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR / VistaSubgrafo)
+        alfa: Nivel de significancia del filtro de disparidad
+            (None = no usar el filtro)
+        bosque: Incluir el bosque de expansion maximo, que conserva la
+            conectividad de cada componente
+    """
+    from models.grafo import Grafo, filas_estudiantes
+    
+    aristas = {}
+    if bosque:
+        for id1, id2, peso in bosque_expansion_maximo(grafo):
+            aristas[id1, id2] = peso
+    if alfa is not None:
+        for id1, id2, peso in filtro_disparidad(grafo, alfa):
+            aristas[id1, id2] = peso
+    
+    esqueleto = Grafo()
+    esqueleto.agregar_estudiantes(filas_estudiantes(grafo.estudiantes))
+    esqueleto.agregar_amistades((id1, id2, peso) for (id1, id2), peso in aristas.items())
+    return esqueleto
@@ -0,0 +1,304 @@
+"""
+Metricas estructurales sobre arreglos CSR: triangulos, clustering,
+distribucion de grados, asortatividad y diametro efectivo
+
+Los triangulos se cuentan con el algoritmo forward: cada amistad se orienta
+del nodo de menor grado al de mayor grado y cada triangulo se encuentra una
+sola vez al cerrar los caminos u -> v -> w con la amistad u -> w. El trabajo
+se reparte en bloques de caminos de tamano acotado, opcionalmente en varios
+procesos.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.csr import GrafoCSR
+
+# Caminos u -> v -> w evaluados por bloque (acota la memoria de cada bloque)
+CAMINOS_POR_BLOQUE = 1 << 22
+
+_datos_trabajador = None
+
+def _iniciar_trabajador(datos):
+    global _datos_trabajador
+    _datos_trabajador = datos
+
+def _en_trabajador(funcion, *argumentos):
+    return funcion(_datos_trabajador, *argumentos)
+
+def _ejecutar(funcion, datos, tareas, procesos):
+    """
+    Itera funcion(datos, *tarea) para cada tarea, en orden
+    
+    Con procesos distinto de 1 las tareas se reparten en un pool; los
+    arreglos de `datos` se envian una sola vez a cada proceso.
+    """
+    if procesos == 1 or len(tareas) < 2:
+        for tarea in tareas:
+            yield funcion(datos, *tarea)
+        return
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador, initargs=(datos,)) as ejecutor:
+        futuros = [ejecutor.submit(_en_trabajador, funcion, *tarea) for tarea in tareas]
+        for futuro in futuros:
+            yield futuro.result()
+
+def _posiciones(offsets, nodos):
+    """Posiciones en `vecinos` de los vecinos de cada nodo, concatenadas"""
+    inicios = offsets[nodos]
+    grados = offsets[nodos + 1] - inicios
+    total = int(grados.sum())
+    desplazamiento = np.repeat(inicios - np.concatenate(([0], np.cumsum(grados)[:-1])), grados)
+    return np.arange(total) + desplazamiento, grados
+
+def _grados_simples(csr):
+    """Grado de cada nodo sin contar lazos propios"""
+    origen = csr.origenes()
+    return np.bincount(origen[origen != csr.vecinos], minlength=csr.num_nodos)
+
+def _orientar(csr, grados):
+    """
+    Orienta cada amistad hacia el extremo de mayor (grado, indice)
+    
+    Retorna (offsets, destinos, origenes) de la orientacion, con los
+    destinos de cada nodo ordenados.
+    """
+    n = csr.num_nodos
+    rango = np.empty(n, dtype=np.int64)
+    rango[np.lexsort((np.arange(n), grados))] = np.arange(n)
+    origen = csr.origenes().astype(np.int64)
+    vecinos = np.asarray(csr.vecinos, dtype=np.int64)
+    mascara = rango[origen] < rango[vecinos]
+    u, v = origen[mascara], vecinos[mascara]
+    orden = np.lexsort((v, u))
+    u, v = u[orden], v[orden]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u, minlength=n), out=offsets[1:])
+    return offsets, v, u
+
+def _triangulos_bloque(datos, inicio, fin):
+    """Triangulos por nodo cerrados por las aristas orientadas inicio..fin-1"""
+    offsets, destinos, origenes, claves = datos
+    n = len(offsets) - 1
+    u = origenes[inicio:fin]
+    v = destinos[inicio:fin]
+    posiciones, cantidades = _posiciones(offsets, v)
+    w = destinos[posiciones]
+    u = np.repeat(u, cantidades)
+    v = np.repeat(v, cantidades)
+    
+    # El camino u -> v -> w cierra un triangulo si existe la arista u -> w
+    buscadas = u * n + w
+    k = np.searchsorted(claves, buscadas)
+    cerrados = claves[np.minimum(k, len(claves) - 1)] == buscadas
+    triangulos = np.bincount(u[cerrados], minlength=n)
+    triangulos += np.bincount(v[cerrados], minlength=n)
+    triangulos += np.bincount(w[cerrados], minlength=n)
+    return triangulos
+
+def _triangulos_por_nodo(csr, procesos=1):
+    """Retorna (triangulos de cada nodo, grado sin lazos de cada nodo)"""
+    n = csr.num_nodos
+    grados = _grados_simples(csr)
+    triangulos = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return triangulos, grados
+    offsets, destinos, origenes = _orientar(csr, grados)
+    
+    # Bloques de aristas con a lo sumo CAMINOS_POR_BLOQUE caminos (salvo una arista sola)
+    caminos = np.cumsum(offsets[destinos + 1] - offsets[destinos])
+    tareas = []
+    inicio = 0
+    while inicio < len(destinos):
+        base = caminos[inicio - 1] if inicio else 0
+        fin = max(int(np.searchsorted(caminos, base + CAMINOS_POR_BLOQUE, side='right')), inicio + 1)
+        tareas.append((inicio, fin))
+        inicio = fin
+    
+    # Claves ordenadas de las aristas orientadas para buscarlas con searchsorted
+    datos = (offsets, destinos, origenes, origenes * n + destinos)
+    for parcial in _ejecutar(_triangulos_bloque, datos, tareas, procesos):
+        triangulos += parcial
+    return triangulos, grados
+
+def contar_triangulos(grafo, procesos=1):
+    """
+    Cuenta los triangulos en los que participa cada estudiante
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        procesos: Numero de procesos (None = numero de CPUs)
+    
+    Retorna diccionario id_estudiante: triangulos
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    triangulos, _ = _triangulos_por_nodo(csr, procesos)
+    return dict(zip(csr.ids, triangulos.tolist()))
+
+def _clustering(triangulos, grados):
+    posibles = grados * (grados - 1)
+    local = np.zeros(len(grados), dtype=np.float64)
+    np.divide(2 * triangulos, posibles, out=local, where=posibles > 0)
+    return local
+
+def coeficientes_clustering(grafo, procesos=1):
+    """
+    Coeficiente de clustering local de cada estudiante: fraccion de pares
+    de sus amigos que tambien son amigos entre si (0 con menos de 2 amigos)
+    
+    Retorna diccionario id_estudiante: coeficiente
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    triangulos, grados = _triangulos_por_nodo(csr, procesos)
+    return dict(zip(csr.ids, _clustering(triangulos, grados).tolist()))
+
+def distribucion_grados(grafo):
+    """Retorna [(grado, cantidad de estudiantes)] por grado creciente"""
+    csr = GrafoCSR.desde_grafo(grafo)
+    cantidades = np.bincount(csr.grados())
+    grados = np.flatnonzero(cantidades)
+    return list(zip(grados.tolist(), cantidades[grados].tolist()))
+
+def _asortatividad(csr, grados):
+    origen = csr.origenes()
+    mascara = origen != csr.vecinos
+    if not mascara.any():
+        return None
+    x = grados[origen[mascara]].astype(np.float64)
+    y = grados[csr.vecinos[mascara]].astype(np.float64)
+    varianza = x.var()
+    if varianza == 0:
+        return None
+    return float(((x - x.mean()) * (y - y.mean())).mean() / varianza)
+
+def asortatividad_grados(grafo):
+    """
+    Coeficiente de asortatividad por grado (correlacion de Pearson entre
+    los grados de los extremos de cada amistad), entre -1 y 1
+    
+    Retorna None si no esta definido (sin amistades o todos con el mismo grado).
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    return _asortatividad(csr, _grados_simples(csr))
+
+def _distancias_bfs(datos, fuentes):
+    """Histograma de distancias desde cada fuente a los nodos alcanzables"""
+    offsets, vecinos = datos
+    n = len(offsets) - 1
+    histograma = np.zeros(1, dtype=np.int64)
+    for fuente in fuentes:
+        distancia = np.full(n, -1, dtype=np.int64)
+        distancia[fuente] = 0
+        frontera = np.array([fuente], dtype=np.int64)
+        nivel = 0
+        while len(frontera):
+            nivel += 1
+            posiciones, _ = _posiciones(offsets, frontera)
+            siguientes = vecinos[posiciones]
+            frontera = np.unique(siguientes[distancia[siguientes] < 0])
+            distancia[frontera] = nivel
+        conteo = np.bincount(distancia[distancia > 0])
+        if len(conteo) > len(histograma):
+            conteo[:len(histograma)] += histograma
+            histograma = conteo
+        else:
+            histograma[:len(conteo)] += conteo
+    return histograma
+
+def resumir_distancias(histograma, percentil=0.9):
+    """
+    Resume un histograma de distancias (histograma[d] = pares a distancia d,
+    sin contar d = 0)
+    
+    El diametro efectivo es la distancia, interpolada linealmente entre
+    enteros, dentro de la cual queda el `percentil` de los pares.
+    
+    Retorna diccionario con diametro_efectivo, distancia_maxima y distancia_media.
+    """
+    histograma = np.asarray(histograma, dtype=np.float64)
+    total = histograma.sum()
+    if total <= 0:
+        return {'diametro_efectivo': 0.0, 'distancia_maxima': 0, 'distancia_media': 0.0}
+    acumulado = np.cumsum(histograma) / total
+    d = int(np.searchsorted(acumulado, percentil))
+    d = min(max(d, 1), len(acumulado) - 1)
+    anterior = acumulado[d - 1]
+    return {
+        'diametro_efectivo': float(d - 1 + (percentil - anterior) / (acumulado[d] - anterior)),
+        'distancia_maxima': int(np.flatnonzero(histograma)[-1]),
+        'distancia_media': float((np.arange(len(histograma)) * histograma).sum() / total)
+    }
+
+def diametro_efectivo(grafo, muestras=64, percentil=0.9, semilla=0, procesos=1):
+    """
+    Estima el diametro efectivo con BFS desde una muestra de estudiantes
+    
+    El diametro efectivo es la distancia (interpolada) dentro de la cual
+    quedan el `percentil` de los pares de estudiantes conectados. Con
+    muestras >= N el resultado es exacto.
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        muestras: Cantidad de BFS (fuentes elegidas al azar entre los
+            estudiantes con amigos)
+        percentil: Fraccion de pares (0-1)
+        semilla: Semilla de la eleccion de fuentes
+        procesos: Numero de procesos (None = numero de CPUs)
+    
+    Retorna diccionario con diametro_efectivo, distancia_maxima (la mayor
+    observada, cota inferior del diametro), distancia_media y fuentes.
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    candidatos = np.flatnonzero(csr.grados() > 0)
+    resultado = {'diametro_efectivo': 0.0, 'distancia_maxima': 0, 'distancia_media': 0.0, 'fuentes': 0}
+    if len(candidatos) == 0:
+        return resultado
+    if muestras < len(candidatos):
+        rng = np.random.default_rng(semilla)
+        candidatos = np.sort(rng.choice(candidatos, muestras, replace=False))
+    
+    datos = (np.asarray(csr.offsets, dtype=np.int64), np.asarray(csr.vecinos, dtype=np.int64))
+    bloques = np.array_split(candidatos, min(len(candidatos), 4 * (procesos or 4)))
+    histograma = np.zeros(1, dtype=np.int64)
+    for parcial in _ejecutar(_distancias_bfs, datos, [(bloque,) for bloque in bloques], procesos):
+        if len(parcial) > len(histograma):
+            parcial[:len(histograma)] += histograma
+            histograma = parcial
+        else:
+            histograma[:len(parcial)] += parcial
+    
+    total = histograma.sum()
+    resultado['fuentes'] = len(candidatos)
+    if total == 0:
+        return resultado
+    resultado.update(resumir_distancias(histograma, percentil))
+    return resultado
+
+def metricas_estructurales(grafo, muestras_bfs=32, semilla=0, procesos=1):
+    """
+    Calcula las metricas estructurales de resumen de la red
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        muestras_bfs: BFS usados para estimar el diametro efectivo
+        semilla: Semilla de la eleccion de fuentes de BFS
+        procesos: Numero de procesos (None = numero de CPUs)
+    
+    Retorna diccionario con triangulos, clustering_global (transitividad),
+    clustering_promedio, asortatividad, grado_maximo, distribucion_grados
+    [(grado, cantidad)] y diametro (ver diametro_efectivo).
+    """
+    csr = GrafoCSR.desde_grafo(grafo)
+    triangulos, grados = _triangulos_por_nodo(csr, procesos)
+    caminos = int((grados * (grados - 1)).sum()) // 2
+    total = int(triangulos.sum()) // 3
+    cantidades = np.bincount(csr.grados()) if csr.num_nodos else np.zeros(1, dtype=np.int64)
+    con_grado = np.flatnonzero(cantidades)
+    return {
+        'triangulos': total,
+        'clustering_global': 3 * total / caminos if caminos else 0.0,
+        'clustering_promedio': float(_clustering(triangulos, grados).mean()) if csr.num_nodos else 0.0,
+        'asortatividad': _asortatividad(csr, grados),
+        'grado_maximo': int(con_grado[-1]) if len(con_grado) else 0,
+        'distribucion_grados': list(zip(con_grado.tolist(), cantidades[con_grado].tolist())),
+        'diametro': diametro_efectivo(csr, muestras_bfs, semilla=semilla, procesos=procesos)
+    }
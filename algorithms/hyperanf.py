@@ -0,0 +1,131 @@
+"""
+HyperANF: estimacion de la funcion de vecindad y de los grados de separacion
+
+Cada estudiante tiene un contador HyperLogLog (m registros de un byte) que
+estima cuantos estudiantes hay a distancia <= t de el. En cada pasada el
+contador de cada nodo se une con los de sus amigos (maximo registro a
+registro), por lo que tras t pasadas aproxima la bola de radio t. Sumar
+las estimaciones da la funcion de vecindad N(t) = pares a distancia <= t,
+de la que salen la distancia media y el diametro efectivo.
+
+El costo es O(m * (N + E)) por pasada y el numero de pasadas es el
+diametro de la red; la memoria es N * m bytes mas un bloque acotado.
+Boldi, Rosa y Vigna, "HyperANF: Approximating the Neighbourhood Function
+of Very Large Graphs on a Budget" (2011).
+"""
+import numpy as np
+
+from models.csr import GrafoCSR
+from .estructura import resumir_distancias
+
+def _hash(indices, semilla):
+    """Hash de 64 bits (splitmix64) de cada indice"""
+    with np.errstate(over='ignore'):
+        x = indices.astype(np.uint64) + np.uint64((0x9E3779B97F4A7C15 * (semilla + 1)) & 0xFFFFFFFFFFFFFFFF)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+def _registros_iniciales(n, precision, semilla):
+    """Contadores que contienen solo a su propio nodo"""
+    m = 1 << precision
+    h = _hash(np.arange(n), semilla)
+    cubeta = (h & np.uint64(m - 1)).astype(np.int64)
+    # Posicion del primer bit en 1 de los 32 bits siguientes (33 si son todos 0)
+    resto = ((h >> np.uint64(precision)) & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    longitud = np.frexp(resto)[1]
+    registros = np.zeros((n, m), dtype=np.uint8)
+    registros[np.arange(n), cubeta] = 33 - longitud
+    return registros
+
+def _estimar(registros, tamano_bloque):
+    """Suma de las estimaciones HyperLogLog de todos los contadores"""
+    n, m = registros.shape
+    if m >= 128:
+        alfa = 0.7213 / (1 + 1.079 / m)
+    else:
+        alfa = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+    potencias = np.ldexp(1.0, -np.arange(64))
+    total = 0.0
+    filas = max(1, tamano_bloque // m)
+    for inicio in range(0, n, filas):
+        bloque = registros[inicio:inicio + filas]
+        estimacion = alfa * m * m / potencias[bloque].sum(axis=1)
+        # Correccion para conjuntos pequenos (conteo lineal)
+        ceros = np.count_nonzero(bloque == 0, axis=1)
+        pequenos = (estimacion <= 2.5 * m) & (ceros > 0)
+        estimacion[pequenos] = m * np.log(m / ceros[pequenos])
+        total += estimacion.sum()
+    return total
+
+def _propagar(registros, offsets, vecinos, tamano_bloque):
+    """
+    Une el contador de cada nodo con los de sus amigos
+    
+    Los amigos de cada nodo son contiguos en `vecinos`, asi que el maximo
+    por nodo se obtiene con maximum.reduceat sobre bloques de a lo sumo
+    tamano_bloque bytes de registros. Retorna (registros nuevos, hubo cambios).
+    """
+    n, m = registros.shape
+    nuevos = registros.copy()
+    grados = np.diff(offsets)
+    entradas = max(1, tamano_bloque // m)
+    inicio = 0
+    while inicio < n:
+        fin = int(np.searchsorted(offsets, offsets[inicio] + entradas, side='right')) - 1
+        fin = min(max(fin, inicio + 1), n)
+        a, b = offsets[inicio], offsets[fin]
+        if b > a:
+            con_amigos = grados[inicio:fin] > 0
+            maximos = np.maximum.reduceat(registros[vecinos[a:b]], (offsets[inicio:fin] - a)[con_amigos])
+            nodos = np.arange(inicio, fin)[con_amigos]
+            nuevos[nodos] = np.maximum(nuevos[nodos], maximos)
+        inicio = fin
+    return nuevos, not np.array_equal(nuevos, registros)
+
+def hyperanf(grafo, precision=6, max_iteraciones=None, percentil=0.9, semilla=0, tamano_bloque=1 << 24):
+    """
+    Estima la funcion de vecindad de la red con HyperANF
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+        precision: Bits de cubeta; cada contador usa m = 2**precision
+            registros y el error relativo tipico es 1.04 / sqrt(m)
+            (6 -> 64 registros, ~13% por nodo y mucho menos en la suma)
+        max_iteraciones: Maximo de pasadas (None = hasta que no cambie nada)
+        percentil: Fraccion de pares para el diametro efectivo
+        semilla: Semilla de las funciones de hash
+        tamano_bloque: Bytes de registros procesados a la vez
+    
+    Retorna diccionario con:
+        funcion_vecindad: [N(0), N(1), ...] pares (ordenados, incluido cada
+            nodo consigo mismo) a distancia <= t
+        distancia_media: Grados de separacion promedio entre pares conectados
+        diametro_efectivo, distancia_maxima: Ver algorithms.estructura
+        iteraciones, error_relativo
+    """
+    if not 4 <= precision <= 16:
+        raise ValueError("precision debe estar entre 4 y 16")
+    csr = GrafoCSR.desde_grafo(grafo)
+    n = csr.num_nodos
+    m = 1 << precision
+    offsets = np.asarray(csr.offsets, dtype=np.int64)
+    vecinos = np.asarray(csr.vecinos, dtype=np.int64)
+    
+    registros = _registros_iniciales(n, precision, semilla)
+    funcion = [float(n)]
+    iteraciones = 0
+    while max_iteraciones is None or iteraciones < max_iteraciones:
+        registros, cambio = _propagar(registros, offsets, vecinos, tamano_bloque)
+        if not cambio:
+            break
+        iteraciones += 1
+        # La funcion de vecindad no decrece; se corrige el ruido de la estimacion
+        funcion.append(max(_estimar(registros, tamano_bloque), funcion[-1]))
+    
+    histograma = np.diff(funcion, prepend=funcion[0])
+    resultado = {'funcion_vecindad': funcion}
+    resultado.update(resumir_distancias(histograma, percentil))
+    resultado['iteraciones'] = iteraciones
+    resultado['error_relativo'] = 1.04 / m ** 0.5
+    return resultado
@@ -0,0 +1,230 @@
+"""
+Motor multinivel de Louvain (con refinamiento opcional de Leiden) sobre arreglos CSR
+"""
+from collections import deque
+
+import numpy as np
+
+def preparar_adyacencia(offsets, vecinos, pesos):
+    """
+    Convierte arreglos CSR del grafo a la matriz de adyacencia simetrica A
+    
+    Cada amistad ya aparece en ambas direcciones; los lazos propios se
+    guardan una sola vez en el grafo, por eso se duplican para que la suma
+    de cada fila sea la fuerza (grado ponderado) del nodo.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    vecinos = np.asarray(vecinos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+    origen = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    pesos = np.where(origen == vecinos, 2 * pesos, pesos)
+    return offsets, vecinos, pesos
+
+def modularidad(offsets, vecinos, pesos, comunidad, resolucion=1.0):
+    """Modularidad ponderada de una particion sobre la matriz de adyacencia A"""
+    m2 = pesos.sum()
+    if m2 == 0:
+        return 0.0
+    origen = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    num_com = int(comunidad.max()) + 1 if len(comunidad) else 0
+    interno = np.bincount(
+        comunidad[origen], weights=np.where(comunidad[origen] == comunidad[vecinos], pesos, 0.0),
+        minlength=num_com
+    )
+    total = np.bincount(comunidad[origen], weights=pesos, minlength=num_com)
+    return float((interno / m2 - resolucion * (total / m2) ** 2).sum())
+
+def _renumerar(comunidad):
+    _, nuevas = np.unique(comunidad, return_inverse=True)
+    return nuevas.astype(np.int64)
+
+def _movimiento_local(offsets, vecinos, pesos, fuerza, comunidad, m2, resolucion, rng):
+    """
+    Fase de movimiento local: mueve cada nodo a la comunidad vecina con mayor
+    ganancia de modularidad hasta que ningun movimiento la mejore
+    
+    Usa una cola de nodos pendientes (como el movimiento rapido de Leiden):
+    tras la primera pasada solo se revisan los vecinos de nodos que cambiaron
+    de comunidad, en lugar de recorrer todo el grafo en cada pasada.
+    
+    Retorna True si algun nodo cambio de comunidad.
+    """
+    off = offsets.tolist()
+    vec = vecinos.tolist()
+    w = pesos.tolist()
+    k = fuerza.tolist()
+    com = comunidad.tolist()
+    tot = np.bincount(comunidad, weights=fuerza, minlength=len(com)).tolist()
+    factor = resolucion / m2
+    
+    cola = deque(rng.permutation(len(com)).tolist())
+    en_cola = [True] * len(com)
+    hubo_cambios = False
+    while cola:
+        i = cola.popleft()
+        en_cola[i] = False
+        actual = com[i]
+        ki = k[i]
+        pesos_vecinos = {}
+        for idx in range(off[i], off[i + 1]):
+            j = vec[idx]
+            if j != i:
+                c = com[j]
+                pesos_vecinos[c] = pesos_vecinos.get(c, 0.0) + w[idx]
+        
+        tot[actual] -= ki
+        mejor = actual
+        mejor_ganancia = pesos_vecinos.get(actual, 0.0) - tot[actual] * ki * factor
+        for c, peso_c in pesos_vecinos.items():
+            ganancia = peso_c - tot[c] * ki * factor
+            if ganancia > mejor_ganancia + 1e-12:
+                mejor = c
+                mejor_ganancia = ganancia
+        tot[mejor] += ki
+        
+        if mejor != actual:
+            com[i] = mejor
+            hubo_cambios = True
+            for idx in range(off[i], off[i + 1]):
+                j = vec[idx]
+                if not en_cola[j] and com[j] != mejor:
+                    en_cola[j] = True
+                    cola.append(j)
+    
+    comunidad[:] = com
+    return hubo_cambios
+
+def _refinar(offsets, vecinos, pesos, fuerza, comunidad, m2, resolucion, rng):
+    """
+    Refinamiento de Leiden: divide cada comunidad en subcomunidades bien conectadas
+    
+    Cada nodo parte como subcomunidad propia; los nodos que siguen solos se
+    fusionan con la subcomunidad de su misma comunidad con mayor ganancia,
+    considerando solo nodos y subcomunidades bien conectados al resto de la
+    comunidad. Se usa la eleccion voraz en lugar de la aleatorizada del
+    articulo original para mantener el resultado determinista.
+    """
+    off = offsets.tolist()
+    vec = vecinos.tolist()
+    w = pesos.tolist()
+    k = fuerza.tolist()
+    com = comunidad.tolist()
+    n = len(com)
+    tot_com = np.bincount(comunidad, weights=fuerza).tolist()
+    factor = resolucion / m2
+    
+    sub = list(range(n))
+    tot_sub = list(k)
+    solo = [True] * n
+    # Peso de cada subcomunidad hacia el resto de su comunidad
+    externo = [0.0] * n
+    for i in range(n):
+        for idx in range(off[i], off[i + 1]):
+            j = vec[idx]
+            if j != i and com[j] == com[i]:
+                externo[i] += w[idx]
+    
+    for i in rng.permutation(n).tolist():
+        if not solo[sub[i]] or sub[i] != i:
+            continue
+        ki = k[i]
+        tot_c = tot_com[com[i]]
+        if externo[i] < ki * (tot_c - ki) * factor:
+            continue
+        
+        pesos_vecinos = {}
+        for idx in range(off[i], off[i + 1]):
+            j = vec[idx]
+            if j != i and com[j] == com[i]:
+                s = sub[j]
+                pesos_vecinos[s] = pesos_vecinos.get(s, 0.0) + w[idx]
+        
+        mejor = i
+        mejor_ganancia = 0.0
+        for s, peso_s in pesos_vecinos.items():
+            if externo[s] < tot_sub[s] * (tot_c - tot_sub[s]) * factor:
+                continue
+            ganancia = peso_s - tot_sub[s] * ki * factor
+            if ganancia > mejor_ganancia + 1e-12:
+                mejor = s
+                mejor_ganancia = ganancia
+        
+        if mejor != i:
+            sub[i] = mejor
+            tot_sub[mejor] += ki
+            externo[mejor] += externo[i] - 2 * pesos_vecinos[mejor]
+            solo[mejor] = False
+            solo[i] = False
+    
+    return np.array(sub, dtype=np.int64)
+
+def _agregar(offsets, vecinos, pesos, grupo):
+    """Construye la matriz A del grafo agregado donde cada grupo es un nodo"""
+    num_grupos = int(grupo.max()) + 1
+    origen = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    claves = grupo[origen] * num_grupos + grupo[vecinos]
+    unicas, inversa = np.unique(claves, return_inverse=True)
+    nuevos_pesos = np.bincount(inversa, weights=pesos)
+    nuevos_origenes = unicas // num_grupos
+    nuevos_vecinos = unicas % num_grupos
+    nuevos_offsets = np.zeros(num_grupos + 1, dtype=np.int64)
+    np.cumsum(np.bincount(nuevos_origenes, minlength=num_grupos), out=nuevos_offsets[1:])
+    return nuevos_offsets, nuevos_vecinos, nuevos_pesos
+
+def louvain_csr(offsets, vecinos, pesos, resolucion=1.0, semilla=0, max_niveles=None, refinar=False):
+    """
+    Ejecuta Louvain multinivel sobre arreglos CSR
+    
+    Args:
+        offsets, vecinos, pesos: Arreglos CSR (cada amistad en ambas direcciones)
+        resolucion: Parametro gamma de la modularidad (mayor = comunidades mas pequenas)
+        semilla: Semilla del orden aleatorio de visita (resultado determinista)
+        max_niveles: Numero maximo de niveles de agregacion (None = sin limite)
+        refinar: Si aplicar el refinamiento de Leiden antes de cada agregacion
+    
+    Retorna (niveles, modularidades) donde niveles[l] es un arreglo con la
+    comunidad de cada nodo original al terminar el nivel l.
+    """
+    offsets, vecinos, pesos = preparar_adyacencia(offsets, vecinos, pesos)
+    n = len(offsets) - 1
+    if n == 0:
+        return [], []
+    
+    rng = np.random.default_rng(semilla)
+    m2 = pesos.sum()
+    pertenencia = np.arange(n, dtype=np.int64)
+    comunidad = np.arange(n, dtype=np.int64)
+    niveles = []
+    modularidades = []
+    
+    if m2 == 0:
+        return [pertenencia], [0.0]
+    
+    while max_niveles is None or len(niveles) < max_niveles:
+        fuerza = np.bincount(
+            np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)),
+            weights=pesos, minlength=len(offsets) - 1
+        )
+        hubo_cambios = _movimiento_local(offsets, vecinos, pesos, fuerza, comunidad, m2, resolucion, rng)
+        comunidad = _renumerar(comunidad)
+        
+        if niveles and not hubo_cambios:
+            break
+        
+        niveles.append(comunidad[pertenencia])
+        modularidades.append(modularidad(offsets, vecinos, pesos, comunidad, resolucion))
+        
+        grupo = _refinar(offsets, vecinos, pesos, fuerza, comunidad, m2, resolucion, rng) if refinar else comunidad
+        grupo = _renumerar(grupo)
+        num_grupos = int(grupo.max()) + 1
+        if num_grupos == len(offsets) - 1:
+            break
+        
+        # La comunidad inicial de cada nodo agregado es la de sus miembros
+        comunidad_grupo = np.zeros(num_grupos, dtype=np.int64)
+        comunidad_grupo[grupo] = comunidad
+        offsets, vecinos, pesos = _agregar(offsets, vecinos, pesos, grupo)
+        pertenencia = grupo[pertenencia]
+        comunidad = comunidad_grupo if refinar else np.arange(num_grupos, dtype=np.int64)
+    
+    return niveles, modularidades
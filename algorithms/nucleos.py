@@ -0,0 +1,211 @@
+"""
+Descomposicion en k-nucleos de la red de amistades
+
+El k-nucleo es el mayor subgrafo en el que cada estudiante tiene al menos
+k amigos dentro del propio subgrafo; el numero de nucleo de un estudiante
+es el mayor k cuyo nucleo lo contiene. Los nucleos altos son los grupos
+mas unidos de la red y permiten dibujar solo su parte central.
+"""
+
+def descomponer_nucleos(grafo):
+    """
+    Calcula el numero de nucleo de cada estudiante
+    
+    Algoritmo de Batagelj y Zaversnik: los estudiantes se ordenan por grado
+    en cubetas y se retiran de menor a mayor grado, actualizando el grado de
+    sus amigos en O(1). El costo total es O(N + E). Los lazos (amistad de un
+    estudiante consigo mismo) no se cuentan.
+    
+    Args:
+        grafo: Instancia del grafo (o GrafoCSR)
+    
+    Retorna diccionario {id_estudiante: numero de nucleo}.
+    """
+    ids = list(grafo.estudiantes)
+    indice = {id_est: i for i, id_est in enumerate(ids)}
+    adj_list = grafo.adj_list
+    vecinos = [
+        [indice[amigo_id] for amigo_id in adj_list[id_est] if amigo_id != id_est]
+        for id_est in ids
+    ]
+    n = len(ids)
+    grado = [len(amigos) for amigos in vecinos]
+    maximo = max(grado, default=0)
+    
+    # Ordenar por grado con conteo: inicio[d] = primera posicion con grado d
+    inicio = [0] * (maximo + 1)
+    for d in grado:
+        inicio[d] += 1
+    acumulado = 0
+    for d in range(maximo + 1):
+        inicio[d], acumulado = acumulado, acumulado + inicio[d]
+    posicion = [0] * n
+    orden = [0] * n
+    for v in range(n):
+        posicion[v] = inicio[grado[v]]
+        orden[posicion[v]] = v
+        inicio[grado[v]] += 1
+    for d in range(maximo, 0, -1):
+        inicio[d] = inicio[d - 1]
+    inicio[0] = 0
+    
+    for i in range(n):
+        v = orden[i]
+        for u in vecinos[v]:
+            if grado[u] > grado[v]:
+                # Mover u al comienzo de su cubeta y achicar la cubeta
+                du = grado[u]
+                pw = inicio[du]
+                w = orden[pw]
+                if u != w:
+                    orden[posicion[u]], orden[pw] = w, u
+                    posicion[w], posicion[u] = posicion[u], pw
+                inicio[du] += 1
+                grado[u] -= 1
+    
+    return dict(zip(ids, grado))
+
+def subgrafo_nucleo(grafo, k, nucleos=None):
+    """
+    Retorna el k-nucleo como VistaSubgrafo (sin copiar la red): los
+    estudiantes con numero de nucleo >= k y las amistades entre ellos
+    
+    Args:
+        grafo: Instancia del grafo
+        k: Nucleo minimo
+        nucleos: Numeros de nucleo ya calculados (p.ej. de
+            NucleosIncrementales); si es None se calculan
+    """
+    from models.vista import VistaSubgrafo
+    
+    if nucleos is None:
+        nucleos = descomponer_nucleos(grafo)
+    return VistaSubgrafo(grafo, ids=(id_est for id_est, nucleo in nucleos.items() if nucleo >= k))
+
+class NucleosIncrementales:
+    """
+    Mantiene los numeros de nucleo al dia con el grafo
+    
+    Se registra como observador del grafo. Al agregar una amistad solo
+    pueden subir en 1 los estudiantes del "subnucleo" del extremo de menor
+    nucleo (los alcanzables a traves de estudiantes con su mismo numero de
+    nucleo), y solo esos se revisan. Al eliminar amistades o estudiantes
+    los numeros solo pueden bajar: se recalcula el indice h de los
+    afectados y se propaga a los amigos cuyo nucleo cambia. Llamar
+    cerrar() para desconectarlo.
+    
+    Args:
+        grafo: Instancia del grafo a seguir
+    """
+    
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.nucleo = descomponer_nucleos(grafo)
+        grafo.registrar_observador(self._al_modificar)
+    
+    def cerrar(self):
+        """Deja de seguir las modificaciones del grafo"""
+        self.grafo.eliminar_observador(self._al_modificar)
+    
+    def obtener_nucleos(self):
+        """Retorna {id_estudiante: numero de nucleo}"""
+        return dict(self.nucleo)
+    
+    def degeneracion(self):
+        """Mayor numero de nucleo de la red"""
+        return max(self.nucleo.values(), default=0)
+    
+    def estudiantes_en_nucleo(self, k):
+        """Retorna los IDs de los estudiantes del k-nucleo"""
+        return [id_est for id_est, nucleo in self.nucleo.items() if nucleo >= k]
+    
+    def _al_modificar(self, evento, *datos):
+        if evento == 'agregar_estudiante':
+            self.nucleo[datos[0]] = 0
+        elif evento == 'eliminar_estudiante':
+            id_est, amigos = datos
+            self.nucleo.pop(id_est, None)
+            self._reducir(amigo_id for amigo_id in amigos if amigo_id != id_est)
+        elif evento == 'agregar_amistad':
+            if datos[0] != datos[1]:
+                self._insertar(datos[0], datos[1])
+        elif evento == 'eliminar_amistad':
+            if datos[0] != datos[1]:
+                self._reducir((datos[0], datos[1]))
+        elif evento == 'limpiar':
+            self.nucleo.clear()
+    
+    def _insertar(self, u, v):
+        """Actualiza los nucleos tras agregar la amistad u-v"""
+        adj_list = self.grafo.adj_list
+        nucleo = self.nucleo
+        k = min(nucleo[u], nucleo[v])
+        
+        # Subnucleo: alcanzables desde las raices pasando por nucleo == k
+        candidatos = {x for x in (u, v) if nucleo[x] == k}
+        pila = list(candidatos)
+        while pila:
+            w = pila.pop()
+            for x in adj_list[w]:
+                if x not in candidatos and nucleo[x] == k:
+                    candidatos.add(x)
+                    pila.append(x)
+        
+        # Retirar los que no tendrian k + 1 amigos con nucleo >= k + 1
+        soporte = {
+            w: sum(1 for x in adj_list[w] if x != w and nucleo[x] >= k)
+            for w in candidatos
+        }
+        retirados = {w for w, s in soporte.items() if s <= k}
+        pila = list(retirados)
+        while pila:
+            w = pila.pop()
+            for x in adj_list[w]:
+                if x in candidatos and x not in retirados:
+                    soporte[x] -= 1
+                    if soporte[x] <= k:
+                        retirados.add(x)
+                        pila.append(x)
+        
+        for w in candidatos:
+            if w not in retirados:
+                nucleo[w] = k + 1
+    
+    def _reducir(self, afectados):
+        """Baja los nucleos que dejaron de sostenerse tras quitar amistades"""
+        adj_list = self.grafo.adj_list
+        nucleo = self.nucleo
+        pendientes = list(afectados)
+        en_espera = set(pendientes)
+        while pendientes:
+            w = pendientes.pop()
+            en_espera.discard(w)
+            anterior = nucleo.get(w)
+            if anterior is None:
+                continue
+            
+            # Indice h de los nucleos de los amigos, acotado por el actual
+            cuenta = [0] * (anterior + 1)
+            for x in adj_list[w]:
+                if x != w:
+                    cuenta[min(nucleo[x], anterior)] += 1
+            nuevo = anterior
+            acumulado = cuenta[anterior]
+            while nuevo > acumulado:
+                nuevo -= 1
+                acumulado += cuenta[nuevo]
+            if nuevo == anterior:
+                continue
+            
+            nucleo[w] = nuevo
+            for x in adj_list[w]:
+                if x != w and nuevo < nucleo[x] <= anterior and x not in en_espera:
+                    en_espera.add(x)
+                    pendientes.append(x)
+
+def distribucion_nucleos(nucleos):
+    """Retorna [(k, estudiantes con numero de nucleo k)] por k creciente"""
+    conteo = {}
+    for nucleo in nucleos.values():
+        conteo[nucleo] = conteo.get(nucleo, 0) + 1
+    return sorted(conteo.items())
@@ -0,0 +1,190 @@
+"""
+Deteccion de comunidades por propagacion de etiquetas para grafos muy grandes
+"""
+import csv
+import os
+from array import array
+
+import numpy as np
+
+from models.csr import GrafoCSR
+from .comunidades import _etiquetas_por_tamano
+
+def _csr_desde_aristas(origen, destino, pesos, num_nodos):
+    """Ordena las aristas (en ambas direcciones) por nodo origen"""
+    fuentes = np.concatenate((origen, destino))
+    vecinos = np.concatenate((destino, origen))
+    pesos = np.concatenate((pesos, pesos))
+    orden = np.argsort(fuentes, kind='stable')
+    offsets = np.zeros(num_nodos + 1, dtype=np.int64)
+    np.cumsum(np.bincount(fuentes, minlength=num_nodos), out=offsets[1:])
+    return offsets, vecinos[orden], pesos[orden]
+
+def _mejores_etiquetas(offsets, vecinos, pesos, etiqueta, inicio, fin, rng):
+    """
+    Calcula la etiqueta con mayor peso entre los vecinos de los nodos [inicio, fin)
+    
+    Los empates se resuelven conservando la etiqueta actual y, si no esta
+    entre las empatadas, eligiendo al azar entre ellas.
+    """
+    a, b = offsets[inicio], offsets[fin]
+    nuevas = etiqueta[inicio:fin].copy()
+    if a == b:
+        return nuevas
+    nodo = np.repeat(np.arange(fin - inicio), np.diff(offsets[inicio:fin + 1]))
+    etiquetas_vecinas = etiqueta[vecinos[a:b]]
+    claves = nodo.astype(np.int64) * len(etiqueta) + etiquetas_vecinas
+    unicas, inversa = np.unique(claves, return_inverse=True)
+    sumas = np.bincount(inversa, weights=pesos[a:b])
+    nodo_u = unicas // len(etiqueta)
+    etiqueta_u = unicas % len(etiqueta)
+    es_actual = etiqueta_u == nuevas[nodo_u]
+    orden = np.lexsort((rng.random(len(unicas)), ~es_actual, -sumas, nodo_u))
+    primeros = np.unique(nodo_u[orden], return_index=True)
+    nuevas[primeros[0]] = etiqueta_u[orden][primeros[1]]
+    return nuevas
+
+def propagacion_etiquetas(origen, destino, pesos, num_nodos, modo='asincrono',
+                          max_iteraciones=20, semilla=0, tamano_bloque=100000):
+    """
+    Propagacion de etiquetas vectorizada sobre arreglos de aristas
+    
+    Cada nodo adopta la etiqueta con mayor peso total entre sus vecinos.
+    En modo 'sincrono' todos los nodos se actualizan a partir de las
+    etiquetas de la iteracion anterior. En modo 'asincrono' los nodos se
+    recorren en bloques de un orden aleatorio y cada bloque ya ve las
+    etiquetas actualizadas por los bloques previos, lo que evita las
+    oscilaciones del modo sincrono. La memoria temporal por paso es
+    proporcional al bloque, no al grafo.
+    
+    Args:
+        origen, destino, pesos: Arreglos con cada amistad una sola vez
+        num_nodos: Numero de nodos (indices 0..num_nodos-1)
+        modo: 'sincrono' o 'asincrono'
+        max_iteraciones: Presupuesto fijo de iteraciones
+        semilla: Semilla del orden aleatorio y de los desempates
+        tamano_bloque: Nodos procesados por paso vectorizado
+    
+    Retorna arreglo con la etiqueta de cada nodo.
+    """
+    if modo not in ('sincrono', 'asincrono'):
+        raise ValueError(f"Modo desconocido: {modo}")
+    rng = np.random.default_rng(semilla)
+    origen = np.asarray(origen, dtype=np.int64)
+    destino = np.asarray(destino, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+    
+    # Renumerar los nodos en orden aleatorio: cada bloque contiguo es una muestra al azar
+    permutacion = rng.permutation(num_nodos) if modo == 'asincrono' else np.arange(num_nodos)
+    offsets, vecinos, pesos = _csr_desde_aristas(permutacion[origen], permutacion[destino], pesos, num_nodos)
+    del origen, destino
+    etiqueta = np.arange(num_nodos, dtype=np.int64)
+    
+    for _ in range(max_iteraciones):
+        anteriores = etiqueta if modo == 'asincrono' else etiqueta.copy()
+        cambios = 0
+        for inicio in range(0, num_nodos, tamano_bloque):
+            fin = min(inicio + tamano_bloque, num_nodos)
+            nuevas = _mejores_etiquetas(offsets, vecinos, pesos, anteriores, inicio, fin, rng)
+            cambios += int(np.count_nonzero(nuevas != etiqueta[inicio:fin]))
+            etiqueta[inicio:fin] = nuevas
+        if cambios == 0:
+            break
+    
+    # Volver a la numeracion original de los nodos
+    return etiqueta[permutacion]
+
+def leer_aristas(archivo, tamano_lote=100000):
+    """
+    Lee las amistades de un CSV o JSON por lotes sin construir un Grafo
+    
+    Solo se guardan los IDs (internados) y arreglos compactos de aristas.
+    
+    Retorna (ids, origen, destino, pesos) con origen/destino como indices en ids.
+    """
+    if os.path.splitext(archivo)[1].lower() == '.json':
+        from utils.persistencia_json import iterar_seccion_json
+        filas = (
+            (a['id1'], a['id2'], a.get('peso', 1))
+            for a in iterar_seccion_json(archivo, 'amistades')
+        )
+    else:
+        from utils.carga_datos import iterar_amistades_csv
+        filas = iterar_amistades_csv(archivo)
+    
+    indice = {}
+    origen = array('q')
+    destino = array('q')
+    pesos = array('d')
+    lote_o, lote_d, lote_p = [], [], []
+    for id1, id2, peso in filas:
+        lote_o.append(indice.setdefault(id1, len(indice)))
+        lote_d.append(indice.setdefault(id2, len(indice)))
+        lote_p.append(peso)
+        if len(lote_o) >= tamano_lote:
+            origen.extend(lote_o)
+            destino.extend(lote_d)
+            pesos.extend(lote_p)
+            lote_o, lote_d, lote_p = [], [], []
+    origen.extend(lote_o)
+    destino.extend(lote_d)
+    pesos.extend(lote_p)
+    
+    return (
+        list(indice),
+        np.frombuffer(origen, dtype=np.int64),
+        np.frombuffer(destino, dtype=np.int64),
+        np.frombuffer(pesos, dtype=np.float64)
+    )
+
+def detectar_comunidades_propagacion(fuente, modo='asincrono', max_iteraciones=20, semilla=0,
+                                     tamano_bloque=100000, archivo_salida=None):
+    """
+    Detecta comunidades por propagacion de etiquetas
+    
+    Args:
+        fuente: Grafo, GrafoCSR o ruta a un archivo de amistades (.csv o .json)
+        modo: 'sincrono' o 'asincrono'
+        max_iteraciones: Presupuesto fijo de iteraciones
+        semilla: Semilla para resultados reproducibles
+        tamano_bloque: Nodos procesados por paso vectorizado
+        archivo_salida: Si se indica, guarda las etiquetas en CSV (id,comunidad)
+    
+    Retorna diccionario con id_estudiante: comunidad (0 = la mas grande),
+    compatible con estadisticas_comunidades. Al leer desde archivo solo se
+    incluyen los estudiantes que aparecen en alguna amistad.
+    """
+    if isinstance(fuente, str):
+        ids, origen, destino, pesos = leer_aristas(fuente)
+    else:
+        csr = GrafoCSR.desde_grafo(fuente)
+        ids = csr.ids
+        origen, destino, pesos = csr.aristas()
+    
+    if not ids:
+        return {}
+    
+    etiqueta = propagacion_etiquetas(
+        origen, destino, pesos, len(ids), modo=modo,
+        max_iteraciones=max_iteraciones, semilla=semilla, tamano_bloque=tamano_bloque
+    )
+    
+    # Numerar de mayor a menor tamano como detectar_comunidades_louvain
+    _, etiqueta = np.unique(etiqueta, return_inverse=True)
+    comunidades = dict(zip(ids, _etiquetas_por_tamano(etiqueta).tolist()))
+    
+    if archivo_salida:
+        guardar_etiquetas_csv(comunidades, archivo_salida)
+    return comunidades
+
+def guardar_etiquetas_csv(comunidades, archivo='comunidades.csv'):
+    """Guarda un diccionario id_estudiante: comunidad en CSV"""
+    with open(archivo, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'comunidad'])
+        writer.writerows(comunidades.items())
+
+def cargar_etiquetas_csv(archivo='comunidades.csv'):
+    """Carga un diccionario id_estudiante: comunidad desde CSV"""
+    with open(archivo, 'r', encoding='utf-8', newline='') as file:
+        return {row['id']: int(row['comunidad']) for row in csv.DictReader(file)}
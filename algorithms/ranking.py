@@ -0,0 +1,165 @@
+"""
+Seleccion de los K mejores elementos sin ordenar la coleccion completa
+"""
+import heapq
+from itertools import count
+
+def top_k(elementos, k, clave=None):
+    """
+    Retorna los k elementos con mayor clave en orden descendente
+    
+    Equivale a sorted(elementos, key=clave, reverse=True)[:k], incluido el
+    desempate estable (ante igualdad gana el que aparece primero), pero usa
+    un heap de tamano k: O(N log k) en lugar de O(N log N).
+    
+    Args:
+        elementos: Iterable de elementos a clasificar
+        k: Cantidad de elementos a retornar
+        clave: Funcion que extrae el valor de comparacion (por defecto el elemento)
+    """
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, elementos, key=clave)
+
+class Clasificacion:
+    """
+    Tabla de posiciones que mantiene el top-k bajo actualizaciones de puntaje
+    
+    Cada actualizacion cuesta O(log N) y consultar el top-k cuesta
+    O(k log N) mas las entradas obsoletas descartadas. Ante empates gana
+    la clave registrada primero.
+    """
+    
+    def __init__(self, puntajes=None):
+        self._puntajes = {}
+        self._orden = {}
+        self._heap = []
+        self._contador = count()
+        if puntajes:
+            for clave, valor in puntajes.items():
+                self.actualizar(clave, valor)
+    
+    def __len__(self):
+        return len(self._puntajes)
+    
+    def __contains__(self, clave):
+        return clave in self._puntajes
+    
+    def obtener(self, clave, defecto=None):
+        """Retorna el puntaje actual de una clave"""
+        return self._puntajes.get(clave, defecto)
+    
+    def actualizar(self, clave, valor):
+        """Asigna un nuevo puntaje a una clave (la agrega si no existe)"""
+        if clave not in self._orden:
+            self._orden[clave] = next(self._contador)
+        self._puntajes[clave] = valor
+        heapq.heappush(self._heap, (-valor, self._orden[clave], clave, valor))
+        # Las entradas obsoletas se descartan al consultar; compactar si se acumulan
+        if len(self._heap) > 2 * len(self._puntajes) + 64:
+            self._compactar()
+    
+    def incrementar(self, clave, delta=1):
+        """Suma delta al puntaje de una clave existente o nueva (desde 0)"""
+        self.actualizar(clave, self._puntajes.get(clave, 0) + delta)
+    
+    def eliminar(self, clave):
+        """Quita una clave de la clasificacion"""
+        self._puntajes.pop(clave, None)
+        self._orden.pop(clave, None)
+    
+    def limpiar(self):
+        """Elimina todas las claves"""
+        self._puntajes.clear()
+        self._orden.clear()
+        self._heap = []
+    
+    def top(self, k=5):
+        """Retorna lista de (clave, puntaje) con los k mayores puntajes"""
+        resultado = []
+        vistos = set()
+        validos = []
+        while self._heap and len(resultado) < k:
+            entrada = heapq.heappop(self._heap)
+            _, orden, clave, valor = entrada
+            if clave in vistos or self._orden.get(clave) != orden or self._puntajes[clave] != valor:
+                continue
+            vistos.add(clave)
+            validos.append(entrada)
+            resultado.append((clave, valor))
+        for entrada in validos:
+            heapq.heappush(self._heap, entrada)
+        return resultado
+    
+    def _compactar(self):
+        self._heap = [(-valor, self._orden[clave], clave, valor) for clave, valor in self._puntajes.items()]
+        heapq.heapify(self._heap)
+
+class ClasificacionGrado(Clasificacion):
+    """
+    Clasificacion por numero de amigos que se mantiene al dia con el grafo
+    
+    Se registra como observador del grafo, por lo que cada agregar/eliminar
+    ajusta solo los grados afectados. Llamar cerrar() para desconectarla.
+    """
+    
+    def __init__(self, grafo):
+        super().__init__()
+        self.grafo = grafo
+        for id_est in grafo.estudiantes:
+            self.actualizar(id_est, len(grafo.adj_list[id_est]))
+        grafo.registrar_observador(self._al_modificar)
+    
+    def _al_modificar(self, evento, *datos):
+        if evento == 'agregar_estudiante':
+            self.actualizar(datos[0], 0)
+        elif evento == 'eliminar_estudiante':
+            id_est, amigos = datos
+            self.eliminar(id_est)
+            for amigo_id in amigos:
+                if amigo_id != id_est:
+                    self.incrementar(amigo_id, -1)
+        elif evento == 'agregar_amistad':
+            id1, id2 = datos[0], datos[1]
+            self.incrementar(id1, 1)
+            if id2 != id1:
+                self.incrementar(id2, 1)
+        elif evento == 'eliminar_amistad':
+            id1, id2 = datos[0], datos[1]
+            self.incrementar(id1, -1)
+            if id2 != id1:
+                self.incrementar(id2, -1)
+        elif evento == 'limpiar':
+            self.limpiar()
+    
+    def cerrar(self):
+        """Deja de seguir las modificaciones del grafo"""
+        self.grafo.eliminar_observador(self._al_modificar)
+
+class ClasificacionCentralidad(Clasificacion):
+    """
+    Clasificacion por una metrica de centralidad global del grafo
+    
+    Metricas como intermediacion o cercania dependen de toda la red, asi que
+    se recalculan de forma perezosa: solo en la primera consulta posterior
+    a una modificacion del grafo (detectada por grafo.version).
+    
+    Args:
+        grafo: Instancia del grafo
+        calcular: Funcion grafo -> {id_estudiante: valor}, p.ej.
+            calcular_centralidad_intermediacion
+    """
+    
+    def __init__(self, grafo, calcular):
+        super().__init__()
+        self.grafo = grafo
+        self.calcular = calcular
+        self._version = None
+    
+    def top(self, k=5):
+        if self._version != self.grafo.version:
+            self.limpiar()
+            for clave, valor in self.calcular(self.grafo).items():
+                self.actualizar(clave, valor)
+            self._version = self.grafo.version
+        return super().top(k)
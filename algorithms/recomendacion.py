@@ -1,3 +1,5 @@
+from .ranking import top_k
+
 def recomendar_amistades(grafo, id_estudiante, max_recomendaciones=5):
     """
     Recomienda amistades basandose en:
@@ -39,11 +41,11 @@ def recomendar_amistades(grafo, id_estudiante, max_recomendaciones=5):
                 'misma_carrera': grafo.estudiantes[posible_amigo]['carrera'] == carrera_estudiante
             }
     
-    recomendaciones_ordenadas = sorted(
+    recomendaciones_ordenadas = top_k(
         recomendaciones.items(),
-        key=lambda x: x[1]['puntaje'],
-        reverse=True
-    )[:max_recomendaciones]
+        max_recomendaciones,
+        clave=lambda x: x[1]['puntaje']
+    )
     
     return recomendaciones_ordenadas
 
@@ -87,10 +89,10 @@ def recomendar_por_intereses(grafo, id_estudiante, max_recomendaciones=5):
                 'num_intereses_comunes': len(intereses_comunes)
             }
     
-    recomendaciones_ordenadas = sorted(
+    recomendaciones_ordenadas = top_k(
         recomendaciones.items(),
-        key=lambda x: x[1]['puntaje'],
-        reverse=True
-    )[:max_recomendaciones]
+        max_recomendaciones,
+        clave=lambda x: x[1]['puntaje']
+    )
     
     return recomendaciones_ordenadas
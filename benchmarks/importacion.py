@@ -0,0 +1,71 @@
+"""
+Benchmark del tiempo de arranque del CLI
+
+Importa Main en interpretes nuevos y mide el tiempo en frio. Falla (codigo
+de salida 1) si se cargan matplotlib, NetworkX, ReportLab o NumPy al
+arrancar, o si la mediana supera el limite indicado.
+
+Uso:
+    python benchmarks/importacion.py [--repeticiones 10] [--limite-ms 150]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modulos que no deben cargarse solo por arrancar el CLI
+MODULOS_PESADOS = ['matplotlib', 'networkx', 'reportlab', 'numpy']
+
+_CODIGO = """
+import sys, time
+inicio = time.perf_counter()
+import Main
+fin = time.perf_counter()
+cargados = [m for m in {pesados!r} if m in sys.modules]
+print(fin - inicio, ','.join(cargados))
+"""
+
+def medir_importacion(repeticiones=10):
+    """
+    Mide el tiempo de `import Main` en interpretes nuevos
+    
+    Retorna (tiempos en segundos, modulos pesados cargados)
+    """
+    codigo = _CODIGO.format(pesados=MODULOS_PESADOS)
+    tiempos = []
+    cargados = set()
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.split()
+        tiempos.append(float(salida[0]))
+        if len(salida) > 1:
+            cargados.update(salida[1].split(','))
+    return tiempos, sorted(cargados)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque del CLI")
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--limite-ms', type=float, default=150.0)
+    args = parser.parse_args()
+    
+    tiempos, cargados = medir_importacion(args.repeticiones)
+    mediana = statistics.median(tiempos) * 1000
+    print(f"import Main: mediana {mediana:.1f} ms, minimo {min(tiempos) * 1000:.1f} ms "
+          f"({args.repeticiones} repeticiones)")
+    
+    correcto = True
+    if cargados:
+        print(f"Error: se cargan al arrancar: {', '.join(cargados)}")
+        correcto = False
+    if mediana > args.limite_ms:
+        print(f"Error: la mediana supera el limite de {args.limite_ms:.0f} ms")
+        correcto = False
+    return 0 if correcto else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,21 @@
-from .grafo import Grafo
-from .estudiante import Estudiante
+"""
+Modelos del grafo
 
-__all__ = ['Grafo', 'Estudiante']
+GrafoCSR (NumPy) y GrafoSQLite se importan solo al usarlos.
+"""
+from utils.exportaciones import exportar_perezoso
+
+# Nombre exportado -> modulo que lo define
+_EXPORTACIONES = {
+    'Grafo': '.grafo',
+    'Estudiante': '.estudiante',
+    'GrafoCSR': '.csr',
+    'GrafoSQLite': '.grafo_sqlite',
+    'VistaSubgrafo': '.vista',
+    'RedTemporal': '.temporal',
+    'VistaTemporal': '.temporal',
+}
+
+__all__ = list(_EXPORTACIONES)
+__getattr__, __dir__ = exportar_perezoso(__name__, _EXPORTACIONES)
+del exportar_perezoso
@@ -0,0 +1,252 @@
+"""
+Representacion compacta (CSR) del grafo sobre arreglos enteros de NumPy
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+from .vista import VistaSubgrafo
+
+class _Amigos(Mapping):
+    """Vista {id_amigo: peso} de los amigos de un nodo"""
+    
+    def __init__(self, csr, i):
+        self._csr = csr
+        self._inicio = int(csr.offsets[i])
+        self._fin = int(csr.offsets[i + 1])
+    
+    def __getitem__(self, id_amigo):
+        j = self._csr.indice.get(id_amigo)
+        if j is not None:
+            posiciones = np.flatnonzero(self._csr.vecinos[self._inicio:self._fin] == j)
+            if len(posiciones):
+                return self._csr.pesos[self._inicio + posiciones[0]].item()
+        raise KeyError(id_amigo)
+    
+    def __iter__(self):
+        ids = self._csr.ids
+        return (ids[j] for j in self._csr.vecinos[self._inicio:self._fin].tolist())
+    
+    def __len__(self):
+        return self._fin - self._inicio
+    
+    def items(self):
+        ids = self._csr.ids
+        return [
+            (ids[j], peso) for j, peso in zip(
+                self._csr.vecinos[self._inicio:self._fin].tolist(),
+                self._csr.pesos[self._inicio:self._fin].tolist()
+            )
+        ]
+
+class _Adyacencia(Mapping):
+    """Vista {id_estudiante: {id_amigo: peso}} compatible con Grafo.adj_list"""
+    
+    def __init__(self, csr):
+        self._csr = csr
+    
+    def __getitem__(self, id_est):
+        return _Amigos(self._csr, self._csr.indice[id_est])
+    
+    def __iter__(self):
+        return iter(self._csr.ids)
+    
+    def __len__(self):
+        return self._csr.num_nodos
+    
+    def __contains__(self, id_est):
+        return id_est in self._csr.indice
+
+class _Estudiantes(Mapping):
+    """Vista {id_estudiante: info} compatible con Grafo.estudiantes"""
+    
+    def __init__(self, csr):
+        self._csr = csr
+    
+    def __getitem__(self, id_est):
+        return self._csr.atributos[self._csr.indice[id_est]]
+    
+    def __iter__(self):
+        return iter(self._csr.ids)
+    
+    def __len__(self):
+        return self._csr.num_nodos
+    
+    def __contains__(self, id_est):
+        return id_est in self._csr.indice
+
+class GrafoCSR:
+    """
+    Grafo de solo lectura en formato CSR (compressed sparse row)
+    
+    Los estudiantes se numeran 0..N-1 en el orden de `ids`. Los amigos del
+    nodo i son vecinos[offsets[i]:offsets[i+1]] con sus pesos en la misma
+    posicion de `pesos`. Cada amistad aparece en ambas direcciones.
+    
+    Ofrece la misma API de lectura que Grafo (estudiantes, adj_list,
+    obtener_amigos, son_amigos, ...), por lo que los algoritmos de
+    algorithms/ pueden ejecutarse sobre el sin convertirlo.
+    
+    Args:
+        ids: Secuencia con el ID de cada nodo
+        offsets, vecinos, pesos: Arreglos CSR
+        atributos: Secuencia con el diccionario de informacion de cada nodo
+            ({'nombre', 'carrera', 'intereses'})
+    """
+    
+    # No se modifica nunca; se expone para quienes cachean por version
+    version = 0
+    
+    def __init__(self, ids, offsets, vecinos, pesos, atributos=None):
+        self.ids = ids
+        self.offsets = offsets
+        self.vecinos = vecinos
+        self.pesos = pesos
+        self.atributos = atributos
+        self._indice = None
+        self.estudiantes = _Estudiantes(self)
+        self.adj_list = _Adyacencia(self)
+    
+    @classmethod
+    def desde_grafo(cls, grafo):
+        """Construye la representacion CSR a partir de un Grafo (o de una VistaSubgrafo)"""
+        if isinstance(grafo, GrafoCSR):
+            return grafo
+        if isinstance(grafo, VistaSubgrafo) and isinstance(grafo.base, GrafoCSR):
+            # Vista sobre un CSR: se recortan los arreglos sin pasar por diccionarios
+            base = grafo.base
+            ids = list(grafo.estudiantes)
+            nodos = [base.indice[id_est] for id_est in ids]
+            offsets, vecinos, pesos = base.subgrafo(np.array(nodos, dtype=np.int64))
+            atributos = None if base.atributos is None else [base.atributos[i] for i in nodos]
+            csr = cls(ids, offsets, vecinos.astype(np.int32), pesos, atributos)
+            csr._indice = {id_est: i for i, id_est in enumerate(ids)}
+            return csr
+        
+        ids = list(grafo.estudiantes)
+        indice = {id_est: i for i, id_est in enumerate(ids)}
+        grados = np.zeros(len(ids) + 1, dtype=np.int64)
+        vecinos = []
+        pesos = []
+        for i, id_est in enumerate(ids):
+            amigos = grafo.adj_list.get(id_est, {})
+            grados[i + 1] = len(amigos)
+            for amigo_id, peso in amigos.items():
+                vecinos.append(indice[amigo_id])
+                pesos.append(peso)
+        
+        csr = cls(
+            ids,
+            np.cumsum(grados),
+            np.array(vecinos, dtype=np.int32),
+            np.array(pesos) if pesos else np.zeros(0, dtype=np.float64),
+            list(grafo.estudiantes.values())
+        )
+        csr._indice = indice
+        return csr
+    
+    @property
+    def num_nodos(self):
+        return len(self.offsets) - 1
+    
+    @property
+    def num_aristas(self):
+        """Numero de amistades (cada lazo propio cuenta una vez)"""
+        lazos = int(np.count_nonzero(self.vecinos == self.origenes()))
+        return (len(self.vecinos) - lazos) // 2 + lazos
+    
+    @property
+    def indice(self):
+        """Diccionario id_estudiante -> posicion en los arreglos"""
+        if self._indice is None:
+            self._indice = {id_est: i for i, id_est in enumerate(self.ids)}
+        return self._indice
+    
+    def obtener_amigos(self, id_estudiante):
+        """Retorna la lista de IDs de amigos de un estudiante"""
+        return list(self.adj_list[id_estudiante])
+    
+    def obtener_peso_amistad(self, id1, id2):
+        """Retorna el peso de la amistad entre dos estudiantes"""
+        if id1 not in self.indice:
+            return None
+        return self.adj_list[id1].get(id2)
+    
+    def son_amigos(self, id1, id2):
+        """Verifica si dos estudiantes son amigos"""
+        return self.obtener_peso_amistad(id1, id2) is not None
+    
+    def obtener_info_estudiante(self, id_estudiante):
+        """Retorna la informacion de un estudiante"""
+        return self.estudiantes.get(id_estudiante)
+    
+    def a_grafo(self):
+        """Copia el contenido a un Grafo modificable"""
+        from .grafo import Grafo, filas_estudiantes
+        
+        grafo = Grafo()
+        grafo.agregar_estudiantes(filas_estudiantes(self.estudiantes))
+        origen, destino, pesos = self.aristas()
+        for u, v, peso in zip(origen.tolist(), destino.tolist(), pesos.tolist()):
+            grafo.agregar_amistad(self.ids[u], self.ids[v], peso)
+        return grafo
+    
+    def grados(self):
+        """Arreglo con el numero de amigos de cada nodo"""
+        return np.diff(self.offsets)
+    
+    def origenes(self):
+        """Arreglo con el nodo origen de cada posicion de `vecinos`"""
+        return np.repeat(np.arange(self.num_nodos, dtype=np.int32), self.grados())
+    
+    def aristas(self):
+        """Retorna (origen, destino, peso) con cada amistad una sola vez (origen <= destino)"""
+        origen = self.origenes()
+        mascara = origen <= self.vecinos
+        return origen[mascara], self.vecinos[mascara], self.pesos[mascara]
+    
+    def componentes(self):
+        """
+        Retorna un arreglo con la componente conexa de cada nodo
+        
+        Cada componente se identifica con el menor indice de sus nodos. Se
+        propaga la etiqueta minima por las aristas con saltos de puntero,
+        por lo que basta un numero pequeno de pasadas vectorizadas.
+        """
+        etiqueta = np.arange(self.num_nodos, dtype=np.int64)
+        origen = self.origenes()
+        while True:
+            nueva = etiqueta.copy()
+            np.minimum.at(nueva, etiqueta[origen], etiqueta[self.vecinos])
+            nueva = nueva[nueva]
+            while True:
+                saltada = nueva[nueva]
+                if np.array_equal(saltada, nueva):
+                    break
+                nueva = saltada
+            if np.array_equal(nueva, etiqueta):
+                return etiqueta
+            etiqueta = nueva
+    
+    def subgrafo(self, nodos):
+        """
+        Retorna (offsets, vecinos, pesos) del subgrafo inducido por `nodos`
+        
+        Los indices del resultado son posiciones dentro de `nodos`. Si los
+        nodos forman una union de componentes conexas no se pierde ninguna arista.
+        """
+        nodos = np.asarray(nodos, dtype=np.int64)
+        local = np.full(self.num_nodos, -1, dtype=np.int64)
+        local[nodos] = np.arange(len(nodos))
+        inicios = self.offsets[nodos]
+        grados = self.offsets[nodos + 1] - inicios
+        total = int(grados.sum())
+        desplazamiento = np.repeat(inicios - np.concatenate(([0], np.cumsum(grados)[:-1])), grados)
+        posiciones = np.arange(total) + desplazamiento
+        vecinos = local[self.vecinos[posiciones]]
+        pesos = self.pesos[posiciones]
+        mascara = vecinos >= 0
+        grados = np.bincount(np.repeat(np.arange(len(nodos)), grados)[mascara], minlength=len(nodos))
+        offsets = np.zeros(len(nodos) + 1, dtype=np.int64)
+        np.cumsum(grados, out=offsets[1:])
+        return offsets, vecinos[mascara], pesos[mascara]
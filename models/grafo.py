@@ -4,9 +4,39 @@ class Grafo:
     def __init__(self):
         self.adj_list = defaultdict(dict)
         self.estudiantes = {}
+        # Contador de modificaciones y funciones notificadas en cada cambio
+        self.version = 0
+        self._observadores = []
+    
+    def registrar_observador(self, observador):
+        """
+        Registra una funcion que se llama despues de cada modificacion del grafo
+        
+        La funcion recibe (evento, *datos) con los eventos:
+            ('agregar_estudiante', id)
+            ('actualizar_estudiante', id)
+            ('eliminar_estudiante', id, amigos)  # amigos: {id_amigo: peso}
+            ('agregar_amistad', id1, id2, peso)
+            ('actualizar_peso_amistad', id1, id2, nuevo_peso, peso_anterior)
+            ('eliminar_amistad', id1, id2, peso)
+            ('limpiar',)
+        """
+        if observador not in self._observadores:
+            self._observadores.append(observador)
+    
+    def eliminar_observador(self, observador):
+        """Deja de notificar a un observador registrado"""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+    
+    def _notificar(self, evento, *datos):
+        self.version += 1
+        for observador in list(self._observadores):
+            observador(evento, *datos)
     
     def agregar_estudiante(self, id_estudiante, nombre, carrera, intereses=None):
         """Agrega un estudiante al grafo"""
+        existente = id_estudiante in self.estudiantes
         self.estudiantes[id_estudiante] = {
             'nombre': nombre,
             'carrera': carrera,
@@ -14,6 +44,7 @@ class Grafo:
         }
         if id_estudiante not in self.adj_list:
             self.adj_list[id_estudiante] = {}
+        self._notificar('actualizar_estudiante' if existente else 'agregar_estudiante', id_estudiante)
     
     def eliminar_estudiante(self, id_estudiante):
         """Elimina un estudiante y todas sus amistades"""
@@ -21,39 +52,135 @@ class Grafo:
             return False
         
         # Eliminar amistades donde este estudiante es parte
-        for amigo_id in list(self.adj_list[id_estudiante].keys()):
+        amigos = dict(self.adj_list[id_estudiante])
+        for amigo_id in amigos:
             if amigo_id in self.adj_list:
                 self.adj_list[amigo_id].pop(id_estudiante, None)
         
         # Eliminar el estudiante del grafo
         self.adj_list.pop(id_estudiante, None)
         self.estudiantes.pop(id_estudiante, None)
+        self._notificar('eliminar_estudiante', id_estudiante, amigos)
         return True
     
     def agregar_amistad(self, id1, id2, peso=1):
         """Agrega una relacion de amistad con peso entre dos estudiantes"""
         if id1 in self.estudiantes and id2 in self.estudiantes:
+            peso_anterior = self.adj_list[id1].get(id2)
             self.adj_list[id1][id2] = peso
             self.adj_list[id2][id1] = peso
+            if peso_anterior is None:
+                self._notificar('agregar_amistad', id1, id2, peso)
+            else:
+                self._notificar('actualizar_peso_amistad', id1, id2, peso, peso_anterior)
             return True
         return False
     
     def actualizar_peso_amistad(self, id1, id2, nuevo_peso):
         """Actualiza el peso de una amistad existente"""
         if self.son_amigos(id1, id2):
+            peso_anterior = self.adj_list[id1][id2]
             self.adj_list[id1][id2] = nuevo_peso
             self.adj_list[id2][id1] = nuevo_peso
+            self._notificar('actualizar_peso_amistad', id1, id2, nuevo_peso, peso_anterior)
             return True
         return False
     
     def eliminar_amistad(self, id1, id2):
         """Elimina una relacion de amistad"""
         if self.son_amigos(id1, id2):
-            self.adj_list[id1].pop(id2, None)
+            peso = self.adj_list[id1].pop(id2, None)
             self.adj_list[id2].pop(id1, None)
+            self._notificar('eliminar_amistad', id1, id2, peso)
             return True
         return False
     
+    def agregar_estudiantes(self, estudiantes):
+        """
+        Agrega varios estudiantes (id, nombre, carrera, intereses) de una vez
+        
+        Sin observadores registrados evita el costo de notificar cada uno.
+        Retorna la cantidad de estudiantes procesados.
+        """
+        if self._observadores:
+            cantidad = 0
+            for id_estudiante, nombre, carrera, intereses in estudiantes:
+                self.agregar_estudiante(id_estudiante, nombre, carrera, intereses)
+                cantidad += 1
+            return cantidad
+        
+        cantidad = 0
+        for id_estudiante, nombre, carrera, intereses in estudiantes:
+            self.estudiantes[id_estudiante] = {
+                'nombre': nombre,
+                'carrera': carrera,
+                'intereses': intereses if intereses else []
+            }
+            if id_estudiante not in self.adj_list:
+                self.adj_list[id_estudiante] = {}
+            cantidad += 1
+        self.version += 1
+        return cantidad
+    
+    def agregar_amistades(self, amistades):
+        """
+        Agrega varias amistades (id1, id2, peso) de una vez
+        
+        Retorna la cantidad de amistades agregadas (se omiten las que
+        involucran estudiantes inexistentes).
+        """
+        if self._observadores:
+            return sum(1 for id1, id2, peso in amistades if self.agregar_amistad(id1, id2, peso))
+        
+        agregadas = 0
+        estudiantes = self.estudiantes
+        adj_list = self.adj_list
+        for id1, id2, peso in amistades:
+            if id1 in estudiantes and id2 in estudiantes:
+                adj_list[id1][id2] = peso
+                adj_list[id2][id1] = peso
+                agregadas += 1
+        self.version += 1
+        return agregadas
+    
+    def limpiar(self):
+        """Elimina todos los estudiantes y amistades del grafo"""
+        self.estudiantes.clear()
+        self.adj_list.clear()
+        self._notificar('limpiar')
+    
+    def reemplazar(self, otro):
+        """
+        Reemplaza el contenido del grafo por el de otro Grafo, que no debe
+        seguir usandose (p.ej. uno recien cargado)
+        
+        Sin observadores se toman directamente sus diccionarios; con
+        observadores se notifica cada estudiante y amistad agregados.
+        """
+        self.limpiar()
+        if self._observadores:
+            self.agregar_estudiantes(filas_estudiantes(otro.estudiantes))
+            self.agregar_amistades(amistades_unicas(otro.adj_list))
+            return
+        self.estudiantes.update(otro.estudiantes)
+        self.adj_list.update(otro.adj_list)
+        self.version += 1
+    
+    def copiar(self):
+        """Retorna una copia independiente del grafo (sin observadores)"""
+        copia = Grafo()
+        copia.estudiantes = {
+            id_est: {
+                'nombre': info['nombre'],
+                'carrera': info['carrera'],
+                'intereses': list(info.get('intereses', []))
+            }
+            for id_est, info in self.estudiantes.items()
+        }
+        copia.adj_list = defaultdict(dict, {id_est: dict(amigos) for id_est, amigos in self.adj_list.items()})
+        copia.version = self.version
+        return copia
+    
     def obtener_amigos(self, id_estudiante):
         """Retorna la lista de IDs de amigos de un estudiante"""
         return list(self.adj_list[id_estudiante].keys())
@@ -78,3 +205,30 @@ class Grafo:
             amigos = self.obtener_amigos(estudiante)
             result += f"{self.estudiantes[estudiante]['nombre']}: {[self.estudiantes[amigo]['nombre'] for amigo in amigos]}\n"
         return result
+
+def filas_estudiantes(estudiantes):
+    """
+    Itera (id, nombre, carrera, intereses) con una copia de los intereses,
+    en el formato de Grafo.agregar_estudiantes
+    
+    Args:
+        estudiantes: Diccionario {id_estudiante: info} de cualquier red
+            (Grafo, GrafoCSR, GrafoSQLite o una vista)
+    """
+    for id_est, info in estudiantes.items():
+        yield id_est, info['nombre'], info['carrera'], list(info.get('intereses', []))
+
+def amistades_unicas(adj_list):
+    """
+    Itera (id1, id2, peso) con cada amistad una sola vez, desde el extremo
+    que aparece primero en adj_list
+    
+    Args:
+        adj_list: Diccionario {id_estudiante: {id_amigo: peso}}
+    """
+    procesados = set()
+    for id1, amigos in adj_list.items():
+        for id2, peso in amigos.items():
+            if id2 not in procesados:
+                yield id1, id2, peso
+        procesados.add(id1)
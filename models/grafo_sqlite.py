@@ -0,0 +1,432 @@
+"""
+Grafo almacenado en un archivo SQLite con acceso perezoso e indexado
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS estudiantes (
+    id PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    carrera TEXT NOT NULL,
+    intereses TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS amistades (
+    id1 NOT NULL,
+    id2 NOT NULL,
+    peso NOT NULL,
+    UNIQUE (id1, id2)
+);
+CREATE INDEX IF NOT EXISTS amistades_id1 ON amistades (id1);
+"""
+
+# Actualizar el peso conserva el rowid, y con el la posicion del amigo en la lista
+_GUARDAR_AMISTAD = (
+    "INSERT INTO amistades (id1, id2, peso) VALUES (?, ?, ?) "
+    "ON CONFLICT (id1, id2) DO UPDATE SET peso = excluded.peso"
+)
+
+class _Estudiantes(Mapping):
+    """Vista {id_estudiante: info} compatible con Grafo.estudiantes"""
+    
+    def __init__(self, grafo):
+        self._grafo = grafo
+    
+    def __getitem__(self, id_est):
+        fila = self._grafo._consultar(
+            "SELECT nombre, carrera, intereses FROM estudiantes WHERE id = ?", (id_est,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(id_est)
+        return {'nombre': fila[0], 'carrera': fila[1], 'intereses': json.loads(fila[2])}
+    
+    def __iter__(self):
+        return (fila[0] for fila in self._grafo._consultar("SELECT id FROM estudiantes ORDER BY rowid"))
+    
+    def __len__(self):
+        return self._grafo._consultar("SELECT COUNT(*) FROM estudiantes").fetchone()[0]
+    
+    def __contains__(self, id_est):
+        return self._grafo._consultar("SELECT 1 FROM estudiantes WHERE id = ?", (id_est,)).fetchone() is not None
+    
+    def items(self):
+        # Un solo recorrido de la tabla en lugar de una consulta por estudiante
+        return [
+            (id_est, {'nombre': nombre, 'carrera': carrera, 'intereses': json.loads(intereses)})
+            for id_est, nombre, carrera, intereses in self._grafo._consultar(
+                "SELECT id, nombre, carrera, intereses FROM estudiantes ORDER BY rowid"
+            )
+        ]
+    
+    def values(self):
+        return [info for _, info in self.items()]
+
+class _Adyacencia(Mapping):
+    """
+    Vista {id_estudiante: {id_amigo: peso}} compatible con Grafo.adj_list
+    
+    Como el defaultdict de Grafo, un ID sin amistades (o inexistente)
+    retorna un diccionario vacio. Las listas leidas se guardan en una cache
+    LRU de tamano_cache entradas y se retornan como vistas de solo lectura.
+    
+    La cache es compartida por todos los hilos, asi que solo guarda datos
+    confirmados: las listas con escrituras sin confirmar de alguna conexion
+    se leen siempre de la base (cada hilo ve su propia version) y no se
+    guardan hasta que esa conexion confirma. Las demas listas se siguen
+    cacheando normalmente.
+    """
+    
+    def __init__(self, grafo, tamano_cache):
+        self._grafo = grafo
+        self._tamano_cache = tamano_cache
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Listas escritas por cada conexion con una transaccion sin confirmar (None = todas)
+        self._sucias = {}
+        # Cambia con cada invalidacion; una lectura hecha antes no se guarda
+        self._generacion = 0
+    
+    def __getitem__(self, id_est):
+        with self._lock:
+            amigos = self._cache.get(id_est)
+            if amigos is not None:
+                self._cache.move_to_end(id_est)
+                return amigos
+            generacion = self._generacion
+        
+        amigos = MappingProxyType(dict(self._grafo._consultar(
+            "SELECT id2, peso FROM amistades WHERE id1 = ? ORDER BY rowid", (id_est,)
+        )))
+        with self._lock:
+            if self._generacion == generacion and not self._sucia(id_est):
+                self._cache[id_est] = amigos
+                if len(self._cache) > self._tamano_cache:
+                    self._cache.popitem(last=False)
+        return amigos
+    
+    def __iter__(self):
+        return iter(self._grafo.estudiantes)
+    
+    def __len__(self):
+        return len(self._grafo.estudiantes)
+    
+    def __contains__(self, id_est):
+        return id_est in self._grafo.estudiantes
+    
+    def get(self, id_est, default=None):
+        amigos = self[id_est]
+        if not amigos and id_est not in self._grafo.estudiantes:
+            return default
+        return amigos
+    
+    def invalidar(self, *ids):
+        """Descarta de la cache las listas de los IDs dados (todas si no se indican)"""
+        with self._lock:
+            self._descartar(ids or None)
+    
+    def _descartar(self, ids):
+        # Llamar con el lock tomado; ids None = todas
+        self._generacion += 1
+        if ids is None:
+            self._cache.clear()
+            return
+        for id_est in ids:
+            self._cache.pop(id_est, None)
+    
+    def _sucia(self, id_est):
+        # Llamar con el lock tomado
+        return any(ids is None or id_est in ids for ids in self._sucias.values())
+    
+    def marcar_escritas(self, conexion, ids):
+        """La transaccion abierta de conexion modifico las listas `ids` (None = todas)"""
+        with self._lock:
+            escritas = self._sucias.setdefault(conexion, set())
+            if ids is None:
+                self._sucias[conexion] = None
+            elif escritas is not None:
+                escritas.update(ids)
+            self._descartar(ids)
+    
+    def terminar_escritura(self, conexion):
+        """conexion confirmo su transaccion: sus listas vuelven a poder cachearse"""
+        with self._lock:
+            if conexion in self._sucias:
+                # Descartar lo que otros hilos hayan leido de estas listas antes del commit
+                self._descartar(self._sucias.pop(conexion))
+    
+    def reiniciar(self):
+        """Vacia la cache y olvida las transacciones abiertas (al cerrar las conexiones)"""
+        with self._lock:
+            self._sucias.clear()
+            self._descartar(None)
+
+class GrafoSQLite:
+    """
+    Grafo guardado en un archivo SQLite, con la misma API que Grafo
+    
+    Los estudiantes y las amistades (en ambas direcciones, como adj_list)
+    viven en tablas indexadas por ID; solo se leen al pedirlos,
+    por lo que la red no necesita caber en memoria. Las escrituras se
+    acumulan en una transaccion por hilo que se confirma cada tamano_lote
+    cambios o al llamar a confirmar() desde ese hilo. Cada hilo usa su
+    propia conexion y la base esta en modo WAL, asi varios hilos pueden
+    leer mientras otro escribe; los demas hilos ven los cambios recien
+    cuando se confirman.
+    Los algoritmos de algorithms/ funcionan sobre el sin cambios.
+    
+    Args:
+        archivo: Ruta del archivo SQLite
+        tamano_cache: Listas de amigos guardadas en la cache LRU
+        tamano_lote: Cambios por transaccion
+    """
+    
+    def __init__(self, archivo='red_universitaria.db', tamano_cache=4096, tamano_lote=10000):
+        self.archivo = archivo
+        self.tamano_lote = tamano_lote
+        self.version = 0
+        self._observadores = []
+        self._local = threading.local()
+        self._conexiones = []
+        self._lock_conexiones = threading.Lock()
+        
+        conexion = self._conexion()
+        conexion.executescript(_ESQUEMA)
+        self.estudiantes = _Estudiantes(self)
+        self.adj_list = _Adyacencia(self, tamano_cache)
+    
+    @classmethod
+    def desde_grafo(cls, grafo, archivo='red_universitaria.db', **opciones):
+        """Crea (o reemplaza el contenido de) una base SQLite con los datos de un grafo"""
+        from .grafo import filas_estudiantes
+        
+        destino = cls(archivo, **opciones)
+        destino.limpiar()
+        destino.agregar_estudiantes(filas_estudiantes(grafo.estudiantes))
+        destino.agregar_amistades(
+            (id1, id2, peso)
+            for id1, amigos in grafo.adj_list.items()
+            for id2, peso in amigos.items()
+        )
+        destino.confirmar()
+        return destino
+    
+    # Conexiones
+    
+    def _conexion(self):
+        """Conexion del hilo actual (se crea la primera vez)"""
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.archivo, check_same_thread=False, cached_statements=256)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+            # Cambios sin confirmar de esta conexion
+            self._local.pendientes = 0
+            with self._lock_conexiones:
+                self._conexiones.append(conexion)
+        return conexion
+    
+    def _consultar(self, sql, parametros=()):
+        # sqlite3 guarda las sentencias preparadas por conexion (cached_statements)
+        return self._conexion().execute(sql, parametros)
+    
+    def _escribir(self, sql, parametros=(), ids=()):
+        """Ejecuta una escritura que modifica las listas de amigos de `ids` (None = todas)"""
+        cursor = self._conexion().execute(sql, parametros)
+        self._registrar_escritura(1, ids)
+        return cursor
+    
+    def _registrar_escritura(self, cantidad, ids=()):
+        local = self._local
+        local.pendientes += cantidad
+        if ids is None or ids:
+            self.adj_list.marcar_escritas(local.conexion, ids)
+        if local.pendientes >= self.tamano_lote:
+            self.confirmar()
+    
+    def confirmar(self):
+        """Confirma la transaccion del hilo actual con sus cambios pendientes"""
+        conexion = self._conexion()
+        conexion.commit()
+        self._local.pendientes = 0
+        self.adj_list.terminar_escritura(conexion)
+    
+    def cerrar(self):
+        """
+        Confirma los cambios del hilo actual y cierra todas las conexiones
+        (los cambios sin confirmar de otros hilos se descartan)
+        """
+        self.confirmar()
+        with self._lock_conexiones:
+            for conexion in self._conexiones:
+                conexion.close()
+            self._conexiones = []
+        self._local = threading.local()
+        self.adj_list.reiniciar()
+    
+    # Observadores (como en Grafo)
+    
+    def registrar_observador(self, observador):
+        """Registra una funcion que se llama despues de cada modificacion del grafo"""
+        if observador not in self._observadores:
+            self._observadores.append(observador)
+    
+    def eliminar_observador(self, observador):
+        """Deja de notificar a un observador registrado"""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+    
+    def _notificar(self, evento, *datos):
+        self.version += 1
+        for observador in list(self._observadores):
+            observador(evento, *datos)
+    
+    # Modificaciones
+    
+    def agregar_estudiante(self, id_estudiante, nombre, carrera, intereses=None):
+        """Agrega un estudiante al grafo"""
+        existente = id_estudiante in self.estudiantes
+        self._escribir(
+            "INSERT INTO estudiantes (id, nombre, carrera, intereses) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET nombre = excluded.nombre, carrera = excluded.carrera, "
+            "intereses = excluded.intereses",
+            (id_estudiante, nombre, carrera, json.dumps(intereses if intereses else [], ensure_ascii=False))
+        )
+        self._notificar('actualizar_estudiante' if existente else 'agregar_estudiante', id_estudiante)
+    
+    def eliminar_estudiante(self, id_estudiante):
+        """Elimina un estudiante y todas sus amistades"""
+        if id_estudiante not in self.estudiantes:
+            return False
+        
+        amigos = dict(self.adj_list[id_estudiante])
+        afectados = (id_estudiante, *amigos)
+        self._escribir("DELETE FROM amistades WHERE id1 = ?", (id_estudiante,), afectados)
+        self._escribir("DELETE FROM amistades WHERE id2 = ?", (id_estudiante,), afectados)
+        self._escribir("DELETE FROM estudiantes WHERE id = ?", (id_estudiante,))
+        self._notificar('eliminar_estudiante', id_estudiante, amigos)
+        return True
+    
+    def _guardar_amistad(self, id1, id2, peso):
+        self._escribir(_GUARDAR_AMISTAD, (id1, id2, peso), (id1, id2))
+        self._escribir(_GUARDAR_AMISTAD, (id2, id1, peso), (id1, id2))
+    
+    def agregar_amistad(self, id1, id2, peso=1):
+        """Agrega una relacion de amistad con peso entre dos estudiantes"""
+        if id1 in self.estudiantes and id2 in self.estudiantes:
+            peso_anterior = self.obtener_peso_amistad(id1, id2)
+            self._guardar_amistad(id1, id2, peso)
+            if peso_anterior is None:
+                self._notificar('agregar_amistad', id1, id2, peso)
+            else:
+                self._notificar('actualizar_peso_amistad', id1, id2, peso, peso_anterior)
+            return True
+        return False
+    
+    def actualizar_peso_amistad(self, id1, id2, nuevo_peso):
+        """Actualiza el peso de una amistad existente"""
+        peso_anterior = self.obtener_peso_amistad(id1, id2)
+        if peso_anterior is not None:
+            self._guardar_amistad(id1, id2, nuevo_peso)
+            self._notificar('actualizar_peso_amistad', id1, id2, nuevo_peso, peso_anterior)
+            return True
+        return False
+    
+    def eliminar_amistad(self, id1, id2):
+        """Elimina una relacion de amistad"""
+        peso = self.obtener_peso_amistad(id1, id2)
+        if peso is not None:
+            self._escribir("DELETE FROM amistades WHERE id1 = ? AND id2 = ?", (id1, id2), (id1, id2))
+            self._escribir("DELETE FROM amistades WHERE id1 = ? AND id2 = ?", (id2, id1), (id1, id2))
+            self._notificar('eliminar_amistad', id1, id2, peso)
+            return True
+        return False
+    
+    def agregar_estudiantes(self, estudiantes):
+        """
+        Agrega varios estudiantes (id, nombre, carrera, intereses) de una vez
+        
+        Sin observadores registrados se insertan con executemany en la
+        transaccion actual. Retorna la cantidad de estudiantes procesados.
+        """
+        if self._observadores:
+            cantidad = 0
+            for id_estudiante, nombre, carrera, intereses in estudiantes:
+                self.agregar_estudiante(id_estudiante, nombre, carrera, intereses)
+                cantidad += 1
+            return cantidad
+        
+        filas = [
+            (id_estudiante, nombre, carrera, json.dumps(intereses if intereses else [], ensure_ascii=False))
+            for id_estudiante, nombre, carrera, intereses in estudiantes
+        ]
+        self._conexion().executemany(
+            "INSERT INTO estudiantes (id, nombre, carrera, intereses) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET nombre = excluded.nombre, carrera = excluded.carrera, "
+            "intereses = excluded.intereses",
+            filas
+        )
+        self._registrar_escritura(len(filas))
+        self.version += 1
+        return len(filas)
+    
+    def agregar_amistades(self, amistades):
+        """
+        Agrega varias amistades (id1, id2, peso) de una vez
+        
+        Retorna la cantidad de amistades agregadas (se omiten las que
+        involucran estudiantes inexistentes).
+        """
+        if self._observadores:
+            return sum(1 for id1, id2, peso in amistades if self.agregar_amistad(id1, id2, peso))
+        
+        filas = [(id1, id2, peso) for id1, id2, peso in amistades]
+        sql = (
+            "INSERT INTO amistades (id1, id2, peso) SELECT ?1, ?2, ?3 "
+            "WHERE EXISTS (SELECT 1 FROM estudiantes WHERE id = ?1) "
+            "AND EXISTS (SELECT 1 FROM estudiantes WHERE id = ?2) "
+            "ON CONFLICT (id1, id2) DO UPDATE SET peso = excluded.peso"
+        )
+        conexion = self._conexion()
+        agregadas = conexion.executemany(sql, filas).rowcount
+        conexion.executemany(sql, [(id2, id1, peso) for id1, id2, peso in filas])
+        self._registrar_escritura(len(filas), None)
+        self.version += 1
+        return agregadas
+    
+    def limpiar(self):
+        """Elimina todos los estudiantes y amistades del grafo"""
+        self._escribir("DELETE FROM amistades", ids=None)
+        self._escribir("DELETE FROM estudiantes")
+        self._notificar('limpiar')
+    
+    # Consultas
+    
+    def obtener_amigos(self, id_estudiante):
+        """Retorna la lista de IDs de amigos de un estudiante"""
+        return list(self.adj_list[id_estudiante].keys())
+    
+    def obtener_peso_amistad(self, id1, id2):
+        """Retorna el peso de la amistad entre dos estudiantes"""
+        return self.adj_list[id1].get(id2)
+    
+    def son_amigos(self, id1, id2):
+        """Verifica si dos estudiantes son amigos"""
+        return id2 in self.adj_list[id1]
+    
+    def obtener_info_estudiante(self, id_estudiante):
+        """Retorna la informacion de un estudiante"""
+        return self.estudiantes.get(id_estudiante)
+    
+    def a_grafo(self):
+        """Copia el contenido a un Grafo en memoria"""
+        from .grafo import Grafo, filas_estudiantes
+        
+        copia = Grafo()
+        copia.agregar_estudiantes(filas_estudiantes(self.estudiantes))
+        copia.agregar_amistades(self._consultar("SELECT id1, id2, peso FROM amistades ORDER BY rowid"))
+        return copia
@@ -0,0 +1,399 @@
+"""
+Red temporal: historial de estudiantes y amistades con marcas de tiempo
+
+Grafo solo guarda el estado actual. RedTemporal guarda ademas cuando
+empezo y termino cada estudiante y cada amistad (con su peso), en lineas
+de tiempo por estudiante ordenadas por fecha de inicio, y permite
+consultar la red en una fecha o ventana como una vista de solo lectura
+con la misma API que Grafo, sin copiar la red para cada instante.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from datetime import datetime
+
+def _fecha(valor):
+    """Acepta datetime, texto ISO o cualquier valor comparable (p.ej. numeros)"""
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    return valor
+
+class _LineaTemporal:
+    """Intervalos de un estudiante ordenados por inicio (inicios en paralelo para bisect)"""
+    
+    __slots__ = ('inicios', 'intervalos')
+    
+    def __init__(self):
+        self.inicios = []
+        self.intervalos = []
+    
+    def agregar(self, intervalo):
+        if not self.inicios or self.inicios[-1] <= intervalo[0]:
+            # Caso comun en vivo: los cambios llegan en orden
+            self.inicios.append(intervalo[0])
+            self.intervalos.append(intervalo)
+            return
+        i = bisect_right(self.inicios, intervalo[0])
+        self.inicios.insert(i, intervalo[0])
+        self.intervalos.insert(i, intervalo)
+    
+    def hasta(self, fecha, incluir=True):
+        """Intervalos que empezaron antes de fecha (o en fecha si incluir)"""
+        fin = bisect_right(self.inicios, fecha) if incluir else bisect_left(self.inicios, fecha)
+        return self.intervalos[:fin]
+
+class _EstudiantesTemporales(Mapping):
+    """Vista {id_estudiante: info} de los estudiantes vigentes en la vista"""
+    
+    def __init__(self, vista):
+        self._vista = vista
+    
+    def __getitem__(self, id_est):
+        linea = self._vista.red._estudiantes.get(id_est)
+        if linea is not None:
+            for intervalo in reversed(linea.hasta(*self._vista._limite)):
+                if self._vista._vigente(intervalo):
+                    return intervalo[2]
+        raise KeyError(id_est)
+    
+    def __iter__(self):
+        for id_est, linea in self._vista.red._estudiantes.items():
+            if any(self._vista._vigente(intervalo) for intervalo in linea.hasta(*self._vista._limite)):
+                yield id_est
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __contains__(self, id_est):
+        try:
+            self[id_est]
+            return True
+        except KeyError:
+            return False
+
+class _AdyacenciaTemporal(Mapping):
+    """Vista {id_estudiante: {id_amigo: peso}} de las amistades vigentes en la vista"""
+    
+    def __init__(self, vista):
+        self._vista = vista
+    
+    def __getitem__(self, id_est):
+        if id_est not in self._vista.estudiantes:
+            raise KeyError(id_est)
+        amigos = {}
+        linea = self._vista.red._amistades.get(id_est)
+        if linea is not None:
+            for intervalo in linea.hasta(*self._vista._limite):
+                if self._vista._vigente(intervalo):
+                    _, _, id1, id2, peso = intervalo
+                    # En una ventana vale el peso mas reciente
+                    amigos[id2 if id1 == id_est else id1] = peso
+        return amigos
+    
+    def __iter__(self):
+        return iter(self._vista.estudiantes)
+    
+    def __len__(self):
+        return len(self._vista.estudiantes)
+    
+    def __contains__(self, id_est):
+        return id_est in self._vista.estudiantes
+
+class VistaTemporal:
+    """
+    La red en una fecha (o en una ventana de tiempo), de solo lectura
+    
+    Ofrece la misma API de lectura que Grafo, por lo que los algoritmos de
+    algorithms/ y las funciones de guardado (guardar_json, guardar_datos)
+    funcionan sobre ella. Los amigos de cada estudiante se obtienen de su
+    linea de tiempo con busqueda binaria al consultarlos.
+    
+    Args:
+        red: RedTemporal
+        desde: Fecha consultada (o inicio de la ventana)
+        hasta: Fin de la ventana (excluido); None = solo el instante `desde`
+    """
+    
+    def __init__(self, red, desde, hasta=None):
+        self.red = red
+        self.desde = _fecha(desde)
+        self.hasta = _fecha(hasta) if hasta is not None else None
+        # (fecha, incluir): los intervalos relevantes empiezan hasta aqui
+        self._limite = (self.desde, True) if self.hasta is None else (self.hasta, False)
+        self.estudiantes = _EstudiantesTemporales(self)
+        self.adj_list = _AdyacenciaTemporal(self)
+    
+    @property
+    def version(self):
+        return self.red.version
+    
+    def _vigente(self, intervalo):
+        """Si el intervalo [inicio, fin) toca la fecha o ventana consultada"""
+        fin = intervalo[1]
+        return fin is None or fin > self.desde
+    
+    def obtener_amigos(self, id_estudiante):
+        """Retorna la lista de IDs de amigos de un estudiante"""
+        return list(self.adj_list[id_estudiante])
+    
+    def obtener_peso_amistad(self, id1, id2):
+        """Retorna el peso de la amistad entre dos estudiantes"""
+        if id1 not in self.estudiantes:
+            return None
+        return self.adj_list[id1].get(id2)
+    
+    def son_amigos(self, id1, id2):
+        """Verifica si dos estudiantes son amigos"""
+        return self.obtener_peso_amistad(id1, id2) is not None
+    
+    def obtener_info_estudiante(self, id_estudiante):
+        """Retorna la informacion de un estudiante"""
+        return self.estudiantes.get(id_estudiante)
+    
+    def a_grafo(self):
+        """Copia la red de la vista a un Grafo modificable"""
+        from .grafo import Grafo, filas_estudiantes
+        
+        grafo = Grafo()
+        grafo.agregar_estudiantes(filas_estudiantes(self.estudiantes))
+        grafo.agregar_amistades(
+            (id_est, amigo_id, peso)
+            for id_est in grafo.estudiantes
+            for amigo_id, peso in self.adj_list[id_est].items()
+            if amigo_id in grafo.estudiantes
+        )
+        return grafo
+
+class RedTemporal:
+    """
+    Historial de la red con marcas de tiempo en estudiantes y amistades
+    
+    Cada estudiante y cada amistad se guarda como intervalos [inicio, fin)
+    (fin None = vigente); un cambio de peso cierra el intervalo anterior y
+    abre otro. Cada estudiante tiene su linea de tiempo de amistades ordenada
+    por inicio, y hay un indice global por fecha de creacion.
+    
+    Las fechas pueden ser datetime, texto ISO o numeros (siempre del mismo
+    tipo). Se pueden cargar intervalos historicos con inicio y fin
+    explicitos, o seguir un Grafo en vivo: con grafo se registra como
+    observador y usa reloj() como fecha de cada cambio.
+    
+    Args:
+        grafo: Grafo a seguir (opcional); su contenido actual se registra
+            con la fecha de hoy
+        reloj: Funcion sin argumentos que retorna la fecha actual
+    """
+    
+    def __init__(self, grafo=None, reloj=datetime.now):
+        self.reloj = reloj
+        self.version = 0
+        self._estudiantes = {}
+        self._amistades = {}
+        self._abiertas = {}
+        # Fin del ultimo intervalo cerrado de cada par, para reconocer cambios de peso
+        self._cerradas = {}
+        self._creaciones = []
+        self.grafo = grafo
+        if grafo is not None:
+            fecha = reloj()
+            for id_est, info in grafo.estudiantes.items():
+                self._abrir_estudiante(id_est, info, fecha)
+            for id_est in grafo.estudiantes:
+                for amigo_id, peso in grafo.adj_list[id_est].items():
+                    if (id_est, amigo_id) not in self._abiertas:
+                        self._abrir_amistad(id_est, amigo_id, peso, fecha)
+            grafo.registrar_observador(self._al_modificar)
+    
+    def cerrar(self):
+        """Deja de seguir las modificaciones del grafo"""
+        if self.grafo is not None:
+            self.grafo.eliminar_observador(self._al_modificar)
+    
+    # Registro de cambios
+    
+    def _abrir_estudiante(self, id_est, info, inicio, fin=None):
+        info = {
+            'nombre': info['nombre'],
+            'carrera': info['carrera'],
+            'intereses': list(info.get('intereses', []))
+        }
+        self._estudiantes.setdefault(id_est, _LineaTemporal()).agregar([inicio, fin, info])
+    
+    def _estudiante_abierto(self, id_est):
+        linea = self._estudiantes.get(id_est)
+        if linea is not None:
+            for intervalo in reversed(linea.intervalos):
+                if intervalo[1] is None:
+                    return intervalo
+        return None
+    
+    def _abrir_amistad(self, id1, id2, peso, inicio, fin=None):
+        # El mismo intervalo se comparte entre las lineas de ambos estudiantes
+        intervalo = [inicio, fin, id1, id2, peso]
+        self._amistades.setdefault(id1, _LineaTemporal()).agregar(intervalo)
+        if id2 != id1:
+            self._amistades.setdefault(id2, _LineaTemporal()).agregar(intervalo)
+        # Un intervalo que empieza cuando termino el anterior del par es un cambio de peso
+        nueva = self._cerradas.get((id1, id2)) != inicio
+        creacion = (inicio, len(self._creaciones), intervalo, nueva)
+        if not self._creaciones or self._creaciones[-1][0] <= inicio:
+            self._creaciones.append(creacion)
+        else:
+            insort(self._creaciones, creacion)
+        if fin is None:
+            self._abiertas[id1, id2] = intervalo
+            self._abiertas[id2, id1] = intervalo
+        else:
+            self._registrar_cierre(id1, id2, fin)
+    
+    def _registrar_cierre(self, id1, id2, fin):
+        anterior = self._cerradas.get((id1, id2))
+        if anterior is None or anterior < fin:
+            self._cerradas[id1, id2] = fin
+            self._cerradas[id2, id1] = fin
+    
+    def _cerrar_amistad(self, id1, id2, fin):
+        intervalo = self._abiertas.pop((id1, id2), None)
+        if intervalo is None:
+            return False
+        self._abiertas.pop((id2, id1), None)
+        intervalo[1] = fin
+        self._registrar_cierre(id1, id2, fin)
+        return True
+    
+    def agregar_estudiante(self, id_estudiante, nombre, carrera, intereses=None, inicio=None, fin=None):
+        """
+        Registra un estudiante vigente desde `inicio` (por defecto ahora)
+        
+        Si ya estaba vigente y cambian sus datos, el intervalo anterior se
+        cierra en `inicio` y se abre uno nuevo con los datos nuevos.
+        """
+        inicio = self.reloj() if inicio is None else _fecha(inicio)
+        info = {'nombre': nombre, 'carrera': carrera, 'intereses': intereses if intereses else []}
+        actual = self._estudiante_abierto(id_estudiante)
+        if actual is not None and fin is None:
+            if actual[2] == info:
+                return
+            actual[1] = inicio
+        self._abrir_estudiante(id_estudiante, info, inicio, _fecha(fin) if fin is not None else None)
+        self.version += 1
+    
+    def eliminar_estudiante(self, id_estudiante, fin=None):
+        """Termina el estudiante y todas sus amistades vigentes en `fin` (por defecto ahora)"""
+        fin = self.reloj() if fin is None else _fecha(fin)
+        actual = self._estudiante_abierto(id_estudiante)
+        if actual is None:
+            return False
+        actual[1] = fin
+        linea = self._amistades.get(id_estudiante)
+        if linea is not None:
+            for _, fin_amistad, id1, id2, _ in linea.intervalos:
+                if fin_amistad is None:
+                    self._cerrar_amistad(id1, id2, fin)
+        self.version += 1
+        return True
+    
+    def agregar_amistad(self, id1, id2, peso=1, inicio=None, fin=None):
+        """
+        Registra una amistad vigente desde `inicio` (por defecto ahora)
+        
+        Con fin se registra un intervalo historico ya terminado. Si la
+        amistad estaba vigente con otro peso, se cierra y se abre con el
+        peso nuevo.
+        """
+        inicio = self.reloj() if inicio is None else _fecha(inicio)
+        if fin is not None:
+            self._abrir_amistad(id1, id2, peso, inicio, _fecha(fin))
+            self.version += 1
+            return
+        actual = self._abiertas.get((id1, id2))
+        if actual is not None:
+            if actual[4] == peso:
+                return
+            self._cerrar_amistad(id1, id2, inicio)
+        self._abrir_amistad(id1, id2, peso, inicio)
+        self.version += 1
+    
+    def actualizar_peso_amistad(self, id1, id2, nuevo_peso, fecha=None):
+        """Cambia el peso de una amistad vigente a partir de `fecha`"""
+        if (id1, id2) not in self._abiertas:
+            return False
+        self.agregar_amistad(id1, id2, nuevo_peso, inicio=fecha)
+        return True
+    
+    def eliminar_amistad(self, id1, id2, fin=None):
+        """Termina una amistad vigente en `fin` (por defecto ahora)"""
+        fin = self.reloj() if fin is None else _fecha(fin)
+        if not self._cerrar_amistad(id1, id2, fin):
+            return False
+        self.version += 1
+        return True
+    
+    def _al_modificar(self, evento, *datos):
+        if evento in ('agregar_estudiante', 'actualizar_estudiante'):
+            info = self.grafo.estudiantes[datos[0]]
+            self.agregar_estudiante(datos[0], info['nombre'], info['carrera'], info.get('intereses'))
+        elif evento == 'eliminar_estudiante':
+            self.eliminar_estudiante(datos[0])
+        elif evento in ('agregar_amistad', 'actualizar_peso_amistad'):
+            self.agregar_amistad(datos[0], datos[1], datos[2])
+        elif evento == 'eliminar_amistad':
+            self.eliminar_amistad(datos[0], datos[1])
+        elif evento == 'limpiar':
+            fecha = self.reloj()
+            for id_est in list(self._estudiantes):
+                self.eliminar_estudiante(id_est, fecha)
+    
+    # Consultas
+    
+    def en_fecha(self, fecha):
+        """Retorna la red tal como estaba en `fecha` (VistaTemporal)"""
+        return VistaTemporal(self, fecha)
+    
+    def en_ventana(self, desde, hasta):
+        """
+        Retorna la red de los estudiantes y amistades vigentes en algun
+        momento de [desde, hasta) (VistaTemporal)
+        """
+        return VistaTemporal(self, desde, hasta)
+    
+    def instantaneas(self, fechas):
+        """Itera (fecha, VistaTemporal) para cada fecha, sin copiar la red"""
+        for fecha in fechas:
+            yield fecha, self.en_fecha(fecha)
+    
+    def amistades_creadas(self, desde, hasta):
+        """
+        Retorna [(inicio, id1, id2, peso)] de las amistades que empezaron en
+        [desde, hasta); los cambios de peso de una amistad vigente no cuentan
+        """
+        desde = _fecha(desde)
+        hasta = _fecha(hasta)
+        resultado = []
+        i = bisect_left(self._creaciones, (desde,))
+        while i < len(self._creaciones) and self._creaciones[i][0] < hasta:
+            _, _, (inicio, _, id1, id2, peso), nueva = self._creaciones[i]
+            if nueva:
+                resultado.append((inicio, id1, id2, peso))
+            i += 1
+        return resultado
+    
+    def linea_temporal(self, id_estudiante):
+        """Retorna [(inicio, fin, id_amigo, peso)] de un estudiante, por inicio creciente"""
+        linea = self._amistades.get(id_estudiante)
+        if linea is None:
+            return []
+        return [
+            (inicio, fin, id2 if id1 == id_estudiante else id1, peso)
+            for inicio, fin, id1, id2, peso in linea.intervalos
+        ]
+    
+    def intervalos_estudiantes(self):
+        """Itera (id, inicio, fin, info) de todos los intervalos de estudiantes"""
+        for id_est, linea in self._estudiantes.items():
+            for inicio, fin, info in linea.intervalos:
+                yield id_est, inicio, fin, info
+    
+    def intervalos_amistades(self):
+        """Itera (id1, id2, peso, inicio, fin) de todas las amistades, por inicio creciente"""
+        for _, _, (inicio, fin, id1, id2, peso), _ in self._creaciones:
+            yield id1, id2, peso, inicio, fin
@@ -0,0 +1,196 @@
+"""
+Vistas de subgrafo sin copia sobre un Grafo, GrafoCSR o GrafoSQLite
+"""
+from collections.abc import Mapping
+
+class _Amigos(Mapping):
+    """Vista {id_amigo: peso} de los amigos de un nodo que estan en la seleccion"""
+    
+    def __init__(self, amigos, seleccion):
+        self._amigos = amigos
+        self._seleccion = seleccion
+    
+    def __getitem__(self, id_amigo):
+        if id_amigo not in self._seleccion:
+            raise KeyError(id_amigo)
+        return self._amigos[id_amigo]
+    
+    def __iter__(self):
+        seleccion = self._seleccion
+        return (id_amigo for id_amigo in self._amigos if id_amigo in seleccion)
+    
+    def __len__(self):
+        seleccion = self._seleccion
+        return sum(1 for id_amigo in self._amigos if id_amigo in seleccion)
+    
+    def __contains__(self, id_amigo):
+        return id_amigo in self._seleccion and id_amigo in self._amigos
+    
+    def items(self):
+        seleccion = self._seleccion
+        return [(id_amigo, peso) for id_amigo, peso in self._amigos.items() if id_amigo in seleccion]
+    
+    def values(self):
+        return [peso for _, peso in self.items()]
+
+class _Adyacencia(Mapping):
+    """Vista {id_estudiante: {id_amigo: peso}} compatible con Grafo.adj_list"""
+    
+    def __init__(self, vista):
+        self._vista = vista
+    
+    def __getitem__(self, id_est):
+        if id_est not in self._vista:
+            raise KeyError(id_est)
+        return _Amigos(self._vista.base.adj_list[id_est], self._vista._seleccion)
+    
+    def __iter__(self):
+        return iter(self._vista)
+    
+    def __len__(self):
+        return len(self._vista)
+    
+    def __contains__(self, id_est):
+        return id_est in self._vista
+
+class _Estudiantes(Mapping):
+    """Vista {id_estudiante: info} compatible con Grafo.estudiantes"""
+    
+    def __init__(self, vista):
+        self._vista = vista
+    
+    def __getitem__(self, id_est):
+        if id_est not in self._vista._seleccion:
+            raise KeyError(id_est)
+        return self._vista.base.estudiantes[id_est]
+    
+    def __iter__(self):
+        return iter(self._vista)
+    
+    def __len__(self):
+        return len(self._vista)
+    
+    def __contains__(self, id_est):
+        return id_est in self._vista
+
+class VistaSubgrafo:
+    """
+    Subgrafo inducido por un conjunto de estudiantes, sin copiar la red
+    
+    Solo guarda los IDs seleccionados; estudiantes, adj_list y los metodos
+    de consulta filtran al vuelo los de la red base, por lo que ofrece la
+    misma API de lectura que Grafo y los algoritmos de algorithms/ corren
+    sobre ella sin cambios. Su costo es el de los estudiantes seleccionados
+    y sus amistades, no el de toda la red.
+    
+    La vista refleja los cambios posteriores de la red base (los
+    estudiantes eliminados dejan de aparecer) y expone su version, asi que
+    los resultados cacheados por version se invalidan igual que con la base.
+    
+    Args:
+        base: Grafo, GrafoCSR o GrafoSQLite
+        ids: IDs de estudiantes a incluir (se ignoran los que no existen)
+        filtro: Funcion (id, info) -> bool; si se indica junto con ids,
+            se aplica sobre ellos, si no sobre toda la red
+        mascara: Secuencia de booleanos alineada con base.estudiantes
+            (p.ej. un arreglo de NumPy sobre los nodos de un GrafoCSR)
+    """
+    
+    def __init__(self, base, ids=None, filtro=None, mascara=None):
+        if isinstance(base, VistaSubgrafo):
+            # Una vista de una vista filtra directamente la red original
+            seleccion_base = base._seleccion
+            base = base.base
+        else:
+            seleccion_base = None
+        
+        estudiantes = base.estudiantes
+        if mascara is not None:
+            candidatos = (id_est for id_est, incluido in zip(estudiantes, mascara) if incluido)
+        elif ids is not None:
+            candidatos = (id_est for id_est in ids if id_est in estudiantes)
+        else:
+            candidatos = iter(estudiantes)
+        if seleccion_base is not None:
+            candidatos = (id_est for id_est in candidatos if id_est in seleccion_base)
+        if filtro is not None:
+            candidatos = (id_est for id_est in candidatos if filtro(id_est, estudiantes[id_est]))
+        
+        self.base = base
+        self._seleccion = dict.fromkeys(candidatos)
+        self.estudiantes = _Estudiantes(self)
+        self.adj_list = _Adyacencia(self)
+    
+    @classmethod
+    def por_carrera(cls, base, carreras):
+        """Vista con los estudiantes de una carrera (o de una lista de carreras)"""
+        if isinstance(carreras, str):
+            carreras = [carreras]
+        carreras = set(carreras)
+        return cls(base, filtro=lambda id_est, info: info['carrera'] in carreras)
+    
+    @classmethod
+    def por_comunidad(cls, base, comunidades, comunidad):
+        """
+        Vista con los estudiantes de una comunidad
+        
+        Args:
+            base: Red base
+            comunidades: Diccionario {id_estudiante: comunidad}, p.ej. de
+                detectar_comunidades_louvain
+            comunidad: Comunidad (o lista de comunidades) a incluir
+        """
+        if isinstance(comunidad, (list, tuple, set, frozenset)):
+            incluidas = set(comunidad)
+        else:
+            incluidas = {comunidad}
+        return cls(base, ids=(id_est for id_est, c in comunidades.items() if c in incluidas))
+    
+    @property
+    def version(self):
+        return getattr(self.base, 'version', None)
+    
+    def __contains__(self, id_est):
+        return id_est in self._seleccion and id_est in self.base.estudiantes
+    
+    def __iter__(self):
+        estudiantes = self.base.estudiantes
+        return (id_est for id_est in self._seleccion if id_est in estudiantes)
+    
+    def __len__(self):
+        estudiantes = self.base.estudiantes
+        return sum(1 for id_est in self._seleccion if id_est in estudiantes)
+    
+    def obtener_amigos(self, id_estudiante):
+        """Retorna la lista de IDs de amigos de un estudiante dentro de la vista"""
+        return list(self.adj_list[id_estudiante])
+    
+    def obtener_peso_amistad(self, id1, id2):
+        """Retorna el peso de la amistad entre dos estudiantes de la vista"""
+        if id1 not in self or id2 not in self._seleccion:
+            return None
+        return self.base.obtener_peso_amistad(id1, id2)
+    
+    def son_amigos(self, id1, id2):
+        """Verifica si dos estudiantes de la vista son amigos"""
+        return self.obtener_peso_amistad(id1, id2) is not None
+    
+    def obtener_info_estudiante(self, id_estudiante):
+        """Retorna la informacion de un estudiante de la vista"""
+        return self.estudiantes.get(id_estudiante)
+    
+    def a_grafo(self):
+        """Copia el subgrafo a un Grafo modificable"""
+        from .grafo import Grafo, filas_estudiantes
+        
+        grafo = Grafo()
+        grafo.agregar_estudiantes(filas_estudiantes(self.estudiantes))
+        grafo.agregar_amistades(
+            (id_est, amigo_id, peso)
+            for id_est in self
+            for amigo_id, peso in self.adj_list[id_est].items()
+        )
+        return grafo
+    
+    def __str__(self):
+        return f"VistaSubgrafo: {len(self)} de {len(self.base.estudiantes)} estudiantes"
@@ -1,21 +1,50 @@
-from .carga_datos import cargar_datos, guardar_datos
-from .visualizacion import visualizar_grafo
-from .visualizacion_avanzada import visualizar_grafo_avanzado, LAYOUTS
-from .generador import generar_datos_aleatorios
-from .estadisticas import mostrar_estadisticas
-from .persistencia_json import guardar_json, cargar_json, exportar_backup
-from .reportes_pdf import generar_reporte_pdf
+"""
+Utilidades de carga, persistencia, estadisticas y visualizacion
 
-__all__ = [
-    'cargar_datos', 
-    'guardar_datos',
-    'visualizar_grafo',
-    'visualizar_grafo_avanzado',
-    'LAYOUTS',
-    'generar_datos_aleatorios',
-    'mostrar_estadisticas',
-    'guardar_json',
-    'cargar_json',
-    'exportar_backup',
-    'generar_reporte_pdf'
-]
+Los modulos se importan al usar sus nombres por primera vez: matplotlib,
+NetworkX y ReportLab no se cargan hasta que se visualiza o se genera un reporte.
+"""
+from .exportaciones import exportar_perezoso
+
+# Nombre exportado -> modulo que lo define
+_EXPORTACIONES = {
+    'cargar_datos': '.carga_datos',
+    'guardar_datos': '.carga_datos',
+    'cargar_datos_paralelo': '.carga_datos',
+    'visualizar_grafo': '.visualizacion',
+    'visualizar_grafo_avanzado': '.visualizacion_avanzada',
+    'LAYOUTS': '.visualizacion_avanzada',
+    'generar_datos_aleatorios': '.generador',
+    'generar_datos_paralelo': '.generador',
+    'BarabasiAlbert': '.modelos_red',
+    'WattsStrogatz': '.modelos_red',
+    'BloquesEstocasticos': '.modelos_red',
+    'poblar_grafo': '.modelos_red',
+    'exportar_csv': '.modelos_red',
+    'exportar_json': '.modelos_red',
+    'exportar_binario': '.modelos_red',
+    'mostrar_estadisticas': '.estadisticas',
+    'calcular_estadisticas': '.estadisticas',
+    'guardar_json': '.persistencia_json',
+    'cargar_json': '.persistencia_json',
+    'guardar_temporal_csv': '.persistencia_temporal',
+    'cargar_temporal_csv': '.persistencia_temporal',
+    'cargar_subgrafo': '.carga_parcial',
+    'cargar_ego': '.carga_parcial',
+    'vecindario': '.carga_parcial',
+    'exportar_backup': '.backups',
+    'restaurar_backup': '.backups',
+    'listar_backups': '.backups',
+    'diferenciar': '.diferencias',
+    'aplicar_diferencia': '.diferencias',
+    'diferenciar_backups': '.diferencias',
+    'guardar_binario': '.persistencia_binaria',
+    'cargar_binario': '.persistencia_binaria',
+    'RegistroCambios': '.registro_cambios',
+    'reaplicar_registro': '.registro_cambios',
+    'generar_reporte_pdf': '.reportes_pdf',
+}
+
+__all__ = list(_EXPORTACIONES)
+__getattr__, __dir__ = exportar_perezoso(__name__, _EXPORTACIONES)
+del exportar_perezoso
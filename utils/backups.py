@@ -0,0 +1,291 @@
+"""
+Backups incrementales comprimidos del grafo
+
+Cada cadena de backups empieza con una base (el grafo completo, en el
+formato de guardar_json) seguida de deltas con los cambios respecto al
+backup anterior, en el formato del registro de cambios. El tamano y el
+tiempo de un delta dependen de la cantidad de cambios y no del tamano
+del grafo.
+"""
+import json
+import os
+import re
+import weakref
+from datetime import datetime
+
+from .persistencia_json import (
+    guardar_json, cargar_json, abrir_archivo, sincronizar_archivo, reemplazar_contenido
+)
+from .registro_cambios import reaplicar_registro
+from .diferencias import diferenciar
+
+EXTENSIONES = {'gzip': '.gz', 'lzma': '.xz', None: ''}
+_PATRON = re.compile(r'^backup_(\d{8}_\d{6}(?:_\d{6})?)(?:_(base|delta))?\.jsonl?(?:\.gz|\.xz)?$')
+
+# Cambios de cada grafo desde su ultimo backup en cada directorio
+_seguimiento = weakref.WeakKeyDictionary()
+
+class _CambiosPendientes:
+    """Observador que anota los estudiantes y amistades modificados"""
+    
+    def __init__(self):
+        self.reiniciar(None, 0)
+    
+    def reiniciar(self, ultimo, num_deltas):
+        self.ultimo = ultimo
+        self.num_deltas = num_deltas
+        self.estudiantes = set()
+        self.amistades = set()
+        self.completo = False
+    
+    def registrar(self, evento, *datos):
+        if evento in ('agregar_estudiante', 'actualizar_estudiante'):
+            self.estudiantes.add(datos[0])
+        elif evento == 'eliminar_estudiante':
+            id_est, amigos = datos
+            self.estudiantes.add(id_est)
+            for amigo_id in amigos:
+                self.amistades.add(frozenset((id_est, amigo_id)))
+        elif evento in ('agregar_amistad', 'actualizar_peso_amistad', 'eliminar_amistad'):
+            self.amistades.add(frozenset(datos[:2]))
+        elif evento == 'limpiar':
+            self.completo = True
+
+def listar_backups(directorio='backups'):
+    """
+    Lista los backups de un directorio en orden cronologico
+    
+    Retorna lista de diccionarios con 'archivo', 'ruta', 'fecha' (datetime)
+    y 'tipo' ('base' o 'delta'). Los backups completos del formato anterior
+    (backup_<fecha>.json) se consideran bases.
+    """
+    if not os.path.isdir(directorio):
+        return []
+    
+    backups = []
+    for archivo in os.listdir(directorio):
+        coincidencia = _PATRON.match(archivo)
+        if not coincidencia:
+            continue
+        marca, tipo = coincidencia.groups()
+        formato = '%Y%m%d_%H%M%S_%f' if marca.count('_') == 2 else '%Y%m%d_%H%M%S'
+        backups.append({
+            'archivo': archivo,
+            'ruta': os.path.join(directorio, archivo),
+            'fecha': datetime.strptime(marca, formato),
+            'tipo': tipo or 'base'
+        })
+    backups.sort(key=lambda b: (b['fecha'], b['tipo'] == 'delta'))
+    return backups
+
+def _registros_delta(grafo, cambios):
+    """Genera los registros que llevan el backup anterior al estado actual"""
+    eliminados = []
+    for id_est in cambios.estudiantes:
+        info = grafo.estudiantes.get(id_est)
+        if info is None:
+            eliminados.append(id_est)
+        else:
+            yield ['agregar_estudiante', id_est, info['nombre'], info['carrera'], info.get('intereses', [])]
+    for par in cambios.amistades:
+        id1, id2 = tuple(par) if len(par) == 2 else (next(iter(par)),) * 2
+        peso = grafo.obtener_peso_amistad(id1, id2)
+        if peso is None:
+            yield ['eliminar_amistad', id1, id2]
+        else:
+            yield ['agregar_amistad', id1, id2, peso]
+    # Al final, cuando ya no quedan amistades que dependan de ellos
+    for id_est in eliminados:
+        yield ['eliminar_estudiante', id_est]
+
+def _escribir_delta(grafo, cambios, archivo):
+    raiz, extension = os.path.splitext(archivo)
+    temporal = raiz + '.tmp' + extension
+    with abrir_archivo(temporal, 'wt') as f:
+        for registro in _registros_delta(grafo, cambios):
+            f.write(json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n')
+    sincronizar_archivo(temporal)
+    os.replace(temporal, archivo)
+
+def _aplicar_retencion(directorio, max_cadenas):
+    """
+    Elimina las cadenas (base y sus deltas) mas antiguas que excedan max_cadenas
+    
+    Los backups completos del formato anterior (backup_<fecha>.json) no
+    forman parte de ninguna cadena de exportar_backup y nunca se eliminan.
+    """
+    cadenas = []
+    for backup in listar_backups(directorio):
+        if backup['tipo'] == 'base' or not cadenas:
+            cadenas.append([])
+        cadenas[-1].append(backup)
+    cadenas = [cadena for cadena in cadenas if '_base.' in cadena[0]['archivo'] or cadena[0]['tipo'] == 'delta']
+    for cadena in cadenas[:-max_cadenas]:
+        for backup in cadena:
+            os.remove(backup['ruta'])
+
+def _contar_registros(archivo):
+    with abrir_archivo(archivo, 'rb') as f:
+        return sum(1 for _ in f)
+
+def _reconstruir(grafo, backups):
+    """
+    Carga en el grafo la base de la ultima cadena de backups y aplica sus deltas
+    
+    Retorna la cantidad de deltas aplicados, o None si falta la base o algun
+    delta no pudo aplicarse completo (archivo truncado o corrupto).
+    """
+    bases = [i for i, backup in enumerate(backups) if backup['tipo'] == 'base']
+    if not bases:
+        print("No se encontro el backup base")
+        return None
+    inicio = bases[-1]
+    
+    if not cargar_json(grafo, backups[inicio]['ruta']):
+        return None
+    for backup in backups[inicio + 1:]:
+        try:
+            esperados = _contar_registros(backup['ruta'])
+            aplicados = reaplicar_registro(grafo, backup['ruta'])
+        except Exception as e:
+            print(f"Error al aplicar {backup['archivo']}: {e}")
+            return None
+        if aplicados < esperados:
+            print(f"Delta {backup['archivo']} incompleto: {aplicados} de {esperados} cambios aplicados")
+            return None
+    return len(backups) - inicio - 1
+
+def _cambios_desde_backups(grafo, backups, max_deltas):
+    """
+    Reconstruye el ultimo backup y lo compara con el grafo cuando no hay
+    seguimiento en memoria (p.ej. en un proceso nuevo)
+    
+    Retorna (Diferencia, deltas de la cadena) o None si conviene escribir una
+    base: no hay cadena, esta llena, no puede reconstruirse, los IDs no son
+    comparables entre si o los cambios superan a los estudiantes.
+    """
+    from models.grafo import Grafo
+    
+    bases = [i for i, backup in enumerate(backups) if backup['tipo'] == 'base']
+    if not bases or len(backups) - bases[-1] - 1 >= max_deltas:
+        return None
+    anterior = Grafo()
+    num_deltas = _reconstruir(anterior, backups)
+    if num_deltas is None:
+        return None
+    try:
+        diferencia = diferenciar(anterior, grafo)
+    except (ValueError, TypeError):
+        return None
+    if len(diferencia) > len(grafo.estudiantes):
+        # Mas cambios que estudiantes: una base nueva es mas chica que el delta
+        return None
+    return diferencia, num_deltas
+
+def exportar_backup(grafo, directorio='backups', compresion='gzip', max_deltas=20, max_cadenas=5):
+    """
+    Crea un backup con timestamp del grafo
+    
+    El primer backup de un grafo en el directorio es una base completa; los
+    siguientes guardan solo lo que cambio desde el backup anterior. Si el
+    grafo no se siguio desde el ultimo backup (p.ej. en un proceso nuevo),
+    se reconstruye ese backup y se guarda su diferencia con el grafo. Tras
+    max_deltas deltas se escribe una base nueva (compactacion), y solo se
+    conservan las ultimas max_cadenas cadenas de base y deltas.
+    
+    Args:
+        grafo: Instancia del grafo
+        directorio: Directorio de los backups
+        compresion: 'gzip', 'lzma' o None
+        max_deltas: Deltas permitidos antes de escribir una base nueva
+        max_cadenas: Cadenas de backups conservadas (None = todas)
+    """
+    if compresion not in EXTENSIONES:
+        raise ValueError(f"Compresion desconocida: {compresion}")
+    if not os.path.exists(directorio):
+        os.makedirs(directorio)
+    
+    clave = os.path.abspath(directorio)
+    por_directorio = _seguimiento.get(grafo)
+    cambios = por_directorio.get(clave) if por_directorio is not None else None
+    backups = listar_backups(directorio)
+    diferencia = None
+    es_delta = (
+        cambios is not None and not cambios.completo
+        and cambios.num_deltas < max_deltas
+        and backups and backups[-1]['archivo'] == cambios.ultimo
+    )
+    if es_delta:
+        num_deltas = cambios.num_deltas + 1
+    else:
+        # Sin seguimiento en memoria valido: comparar con el estado del ultimo backup
+        reconstruido = _cambios_desde_backups(grafo, backups, max_deltas)
+        es_delta = reconstruido is not None
+        if es_delta:
+            diferencia, num_deltas = reconstruido
+            num_deltas += 1
+        else:
+            num_deltas = 0
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    extension = EXTENSIONES[compresion]
+    try:
+        if es_delta:
+            archivo = os.path.join(directorio, f'backup_{timestamp}_delta.jsonl{extension}')
+            if diferencia is not None:
+                diferencia.guardar(archivo)
+            else:
+                _escribir_delta(grafo, cambios, archivo)
+        else:
+            archivo = os.path.join(directorio, f'backup_{timestamp}_base.json{extension}')
+            if not guardar_json(grafo, archivo):
+                return False
+    except Exception as e:
+        print(f"Error al crear backup: {e}")
+        return False
+    
+    # Seguir los cambios del grafo para el proximo backup
+    if cambios is None and hasattr(grafo, 'registrar_observador'):
+        cambios = _CambiosPendientes()
+        grafo.registrar_observador(cambios.registrar)
+        _seguimiento.setdefault(grafo, {})[clave] = cambios
+    if cambios is not None:
+        cambios.reiniciar(os.path.basename(archivo), num_deltas)
+    
+    if max_cadenas:
+        _aplicar_retencion(directorio, max_cadenas)
+    return True
+
+def restaurar_backup(grafo, fecha=None, directorio='backups'):
+    """
+    Restaura el grafo al estado del ultimo backup hasta una fecha
+    
+    Carga la base de la cadena correspondiente y aplica sus deltas en orden.
+    Si algun delta no puede aplicarse completo, se informa, retorna False
+    y el grafo conserva su contenido.
+    
+    Args:
+        grafo: Instancia del grafo (se reemplaza su contenido)
+        fecha: datetime o texto ISO ('2025-10-03T11:42:33'); None = el mas reciente
+        directorio: Directorio de los backups
+    """
+    if isinstance(fecha, str):
+        fecha = datetime.fromisoformat(fecha)
+    backups = [
+        backup for backup in listar_backups(directorio)
+        if fecha is None or backup['fecha'] <= fecha
+    ]
+    if not backups:
+        print("No hay backups hasta la fecha indicada")
+        return False
+    
+    from models.grafo import Grafo
+    
+    # Se reconstruye aparte: si algun delta falla el grafo queda como estaba
+    restaurado = Grafo()
+    if _reconstruir(restaurado, backups) is None:
+        print("No se pudo restaurar el backup")
+        return False
+    reemplazar_contenido(grafo, restaurado)
+    print(f"Backup restaurado al {backups[-1]['fecha'].isoformat(sep=' ', timespec='seconds')}")
+    return True
@@ -1,13 +1,79 @@
 import csv
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-def cargar_datos(grafo, archivo_estudiantes='estudiantes.csv', archivo_amistades='amistades.csv'):
-    """Carga estudiantes y amistades desde archivos CSV"""
+def iterar_amistades_csv(archivo_amistades='amistades.csv'):
+    """
+    Itera las amistades (id1, id2, peso) de un CSV sin cargar el archivo completo
+    
+    Las filas sin los campos requeridos o con peso no numerico se omiten.
+    """
+    with open(archivo_amistades, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        encabezado = next(reader, None)
+        if encabezado is None:
+            return
+        i1 = encabezado.index('id1')
+        i2 = encabezado.index('id2')
+        ip = encabezado.index('peso') if 'peso' in encabezado else None
+        for row in reader:
+            try:
+                peso = int(row[ip]) if ip is not None and row[ip] != '' else 1
+                yield row[i1], row[i2], peso
+            except (IndexError, ValueError):
+                continue
+
+def crear_seleccion(filtro=None, ids=None):
+    """
+    Combina un predicado y un conjunto de IDs en una sola funcion de seleccion
+    
+    Args:
+        filtro: Funcion (id_estudiante, info) -> bool, con info
+            {'nombre', 'carrera', 'intereses'}
+        ids: Coleccion de IDs a conservar
+    
+    Retorna la funcion (id_estudiante, info) -> bool, o None si no hay
+    criterios (se carga todo).
+    """
+    if filtro is None and ids is None:
+        return None
+    ids = set(ids) if ids is not None else None
+    
+    def seleccionar(id_est, info):
+        if ids is not None and id_est not in ids:
+            return False
+        return filtro is None or filtro(id_est, info)
+    
+    return seleccionar
+
+def cargar_datos(grafo, archivo_estudiantes='estudiantes.csv', archivo_amistades='amistades.csv',
+                 filtro=None, ids=None):
+    """
+    Carga estudiantes y amistades desde archivos CSV
+    
+    Con filtro o ids solo se cargan los estudiantes seleccionados y las
+    amistades entre ellos (el subgrafo inducido).
+    
+    Args:
+        grafo: Instancia del grafo
+        archivo_estudiantes, archivo_amistades: Rutas de los CSV
+        filtro: Funcion (id_estudiante, info) -> bool (ver crear_seleccion)
+        ids: Coleccion de IDs a cargar
+    """
+    seleccionar = crear_seleccion(filtro, ids)
     
     # Cargar estudiantes
     try:
         with open(archivo_estudiantes, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row in reader:
+                if seleccionar and not seleccionar(
+                    row['id'], {'nombre': row['nombre'], 'carrera': row['carrera'], 'intereses': []}
+                ):
+                    continue
                 grafo.agregar_estudiante(
                     row['id'],
                     row['nombre'],
@@ -18,7 +84,7 @@ def cargar_datos(grafo, archivo_estudiantes='estudiantes.csv', archivo_amistades
         print(f"Archivo {archivo_estudiantes} no encontrado")
         return False
     
-    # Cargar amistades
+    # Cargar amistades (agregar_amistad descarta las de estudiantes no cargados)
     try:
         with open(archivo_amistades, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
@@ -72,3 +138,204 @@ def guardar_datos(grafo, archivo_estudiantes='estudiantes.csv', archivo_amistade
         return False
     
     return True
+
+def _leer_encabezado(archivo):
+    """Retorna (columnas, desplazamiento donde empiezan los datos)"""
+    with open(archivo, 'rb') as f:
+        linea = f.readline()
+        inicio = f.tell()
+    columnas = next(csv.reader([linea.decode('utf-8-sig')]), [])
+    return [columna.strip() for columna in columnas], inicio
+
+def _limites_bloques(archivo, inicio, tamano_bloque):
+    """Divide el archivo en rangos de bytes [inicio, fin) que terminan en un salto de linea"""
+    tamano = os.path.getsize(archivo)
+    limites = []
+    with open(archivo, 'rb') as f:
+        while inicio < tamano:
+            fin = inicio + tamano_bloque
+            if fin >= tamano:
+                fin = tamano
+            else:
+                f.seek(fin)
+                f.readline()
+                fin = f.tell()
+            limites.append((inicio, fin))
+            inicio = fin
+    return limites
+
+def _parsear_bloque(archivo, inicio, fin, indices, tipo):
+    """
+    Parsea un rango de bytes del CSV a columnas (funcion de los procesos hijos)
+    
+    Retorna (columnas, rechazadas, num_lineas) donde rechazadas es una lista
+    de (linea dentro del bloque, contenido, motivo).
+    """
+    with open(archivo, 'rb') as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+    num_lineas = datos.count(b'\n') + (0 if datos.endswith(b'\n') or not datos else 1)
+    
+    rechazadas = []
+    try:
+        texto = datos.decode('utf-8')
+    except UnicodeDecodeError:
+        # Descartar solo las lineas con bytes invalidos
+        lineas = []
+        for numero, linea in enumerate(datos.split(b'\n'), 1):
+            try:
+                lineas.append(linea.decode('utf-8'))
+            except UnicodeDecodeError:
+                rechazadas.append((numero, linea.decode('utf-8', 'replace'), 'codificacion invalida'))
+                lineas.append('')
+        texto = '\n'.join(lineas)
+    
+    reader = csv.reader(io.StringIO(texto, newline=''))
+    if tipo == 'estudiantes':
+        i_id, i_nombre, i_carrera = indices
+        ids, nombres, carreras = [], [], []
+        for row in reader:
+            if not row:
+                continue
+            try:
+                id_est = row[i_id]
+                nombre = row[i_nombre]
+                carrera = row[i_carrera]
+            except IndexError:
+                rechazadas.append((reader.line_num, ','.join(row), 'faltan columnas'))
+                continue
+            if not id_est:
+                rechazadas.append((reader.line_num, ','.join(row), 'id vacio'))
+                continue
+            ids.append(id_est)
+            nombres.append(nombre)
+            carreras.append(carrera)
+        return (ids, nombres, carreras), rechazadas, num_lineas
+    
+    i1, i2, ip = indices
+    ids1, ids2, pesos, lineas = [], [], array('q'), array('q')
+    for row in reader:
+        if not row:
+            continue
+        try:
+            id1 = row[i1]
+            id2 = row[i2]
+            peso = int(row[ip]) if ip is not None and row[ip] != '' else 1
+        except IndexError:
+            rechazadas.append((reader.line_num, ','.join(row), 'faltan columnas'))
+            continue
+        except ValueError:
+            rechazadas.append((reader.line_num, ','.join(row), 'peso no numerico'))
+            continue
+        ids1.append(id1)
+        ids2.append(id2)
+        pesos.append(peso)
+        lineas.append(reader.line_num)
+    return (ids1, ids2, pesos, lineas), rechazadas, num_lineas
+
+def _parsear_archivo(archivo, columnas_requeridas, tipo, ejecutor, tamano_bloque):
+    """
+    Parsea un CSV por bloques
+    
+    Retorna (datos, rechazadas): datos tiene (columnas, linea inicial) de
+    cada bloque y rechazadas las filas descartadas con su linea en el archivo.
+    """
+    columnas, inicio = _leer_encabezado(archivo)
+    faltantes = [c for c in columnas_requeridas if c not in columnas]
+    if faltantes:
+        raise ValueError(f"{archivo}: faltan las columnas {', '.join(faltantes)}")
+    indices = [columnas.index(c) for c in columnas_requeridas]
+    if tipo == 'amistades':
+        indices.append(columnas.index('peso') if 'peso' in columnas else None)
+    
+    bloques = _limites_bloques(archivo, inicio, tamano_bloque)
+    argumentos = (repeat(archivo), [b[0] for b in bloques], [b[1] for b in bloques], repeat(indices), repeat(tipo))
+    if ejecutor is not None and len(bloques) > 1:
+        resultados = ejecutor.map(_parsear_bloque, *argumentos)
+    else:
+        resultados = map(_parsear_bloque, *argumentos)
+    
+    # Numerar las filas rechazadas respecto del archivo completo (linea 1 = encabezado)
+    datos = []
+    rechazadas = []
+    linea_base = 1
+    for columnas_bloque, rechazadas_bloque, num_lineas in resultados:
+        datos.append((columnas_bloque, linea_base))
+        rechazadas.extend((linea + linea_base, contenido, motivo) for linea, contenido, motivo in rechazadas_bloque)
+        linea_base += num_lineas
+    return datos, rechazadas
+
+def _guardar_reporte(reporte, archivo):
+    with open(archivo, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['archivo', 'linea', 'motivo', 'contenido'])
+        for nombre_archivo, resumen in reporte.items():
+            for linea, contenido, motivo in resumen['rechazadas']:
+                writer.writerow([nombre_archivo, linea, motivo, contenido])
+
+def cargar_datos_paralelo(grafo, archivo_estudiantes='estudiantes.csv', archivo_amistades='amistades.csv',
+                          procesos=None, tamano_bloque=32 << 20, archivo_reporte=None):
+    """
+    Carga estudiantes y amistades desde CSV grandes usando varios procesos
+    
+    Cada archivo se divide en rangos de bytes que terminan en un salto de
+    linea; cada proceso parsea su rango a columnas (IDs, nombres, pesos) y
+    todas se agregan al grafo de una vez con agregar_estudiantes y
+    agregar_amistades. Las filas con columnas faltantes, pesos no numericos
+    o estudiantes inexistentes se omiten y se informan. Los campos entre
+    comillas no pueden contener saltos de linea.
+    
+    Args:
+        grafo: Instancia del grafo
+        archivo_estudiantes, archivo_amistades: Rutas de los CSV
+        procesos: Numero de procesos (None = numero de CPUs, 1 = sin procesos)
+        tamano_bloque: Bytes por bloque
+        archivo_reporte: Si se indica, guarda las filas rechazadas en CSV
+    
+    Retorna diccionario {archivo: {'cargadas', 'rechazadas'}} con las filas
+    rechazadas como (linea, contenido, motivo), o None si falta un archivo.
+    """
+    for archivo in (archivo_estudiantes, archivo_amistades):
+        if not os.path.exists(archivo):
+            print(f"Archivo {archivo} no encontrado")
+            return None
+    
+    ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos != 1 else None
+    try:
+        bloques_est, rechazadas_est = _parsear_archivo(
+            archivo_estudiantes, ['id', 'nombre', 'carrera'], 'estudiantes', ejecutor, tamano_bloque
+        )
+        bloques_am, rechazadas_am = _parsear_archivo(
+            archivo_amistades, ['id1', 'id2'], 'amistades', ejecutor, tamano_bloque
+        )
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+    
+    # Agregar todo en un paso
+    cargados = 0
+    for (ids, nombres, carreras), _ in bloques_est:
+        cargados += grafo.agregar_estudiantes(zip(ids, nombres, carreras, repeat(None)))
+    print(f"Estudiantes cargados: {cargados} ({len(rechazadas_est)} filas rechazadas)")
+    
+    estudiantes = grafo.estudiantes
+    
+    def validas():
+        for (ids1, ids2, pesos, lineas), linea_base in bloques_am:
+            for id1, id2, peso, linea in zip(ids1, ids2, pesos, lineas):
+                if id1 in estudiantes and id2 in estudiantes:
+                    yield id1, id2, peso
+                else:
+                    rechazadas_am.append((linea + linea_base, f"{id1},{id2},{peso}", 'estudiante inexistente'))
+    
+    agregadas = grafo.agregar_amistades(validas())
+    rechazadas_am.sort(key=lambda r: r[0])
+    print(f"Amistades cargadas: {agregadas} ({len(rechazadas_am)} filas rechazadas)")
+    
+    reporte = {
+        archivo_estudiantes: {'cargadas': cargados, 'rechazadas': rechazadas_est},
+        archivo_amistades: {'cargadas': agregadas, 'rechazadas': rechazadas_am}
+    }
+    if archivo_reporte:
+        _guardar_reporte(reporte, archivo_reporte)
+    return reporte
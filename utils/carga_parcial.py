@@ -0,0 +1,176 @@
+"""
+Carga parcial de redes persistidas
+
+Materializa solo el subgrafo inducido por un conjunto de estudiantes (una
+carrera, la red ego de un estudiante, ...) en lugar de la red completa.
+Con fuentes indexadas (Grafo, GrafoCSR, GrafoSQLite o un archivo .bin/.db)
+se consultan directamente los registros de los estudiantes pedidos; los
+archivos JSON se recorren en streaming descartando lo que no se pide.
+"""
+import os
+
+from .carga_datos import crear_seleccion
+from .persistencia_json import cargar_json, iterar_seccion_json
+
+def _es_ruta(fuente):
+    return isinstance(fuente, (str, os.PathLike))
+
+def _abrir_fuente(fuente):
+    """
+    Retorna un grafo con API de lectura para la fuente, o None si la
+    fuente es un archivo JSON (que solo puede recorrerse en streaming)
+    """
+    if not _es_ruta(fuente):
+        return fuente
+    extension = os.path.splitext(str(fuente))[1]
+    if extension == '.bin':
+        from .persistencia_binaria import cargar_binario
+        return cargar_binario(fuente)
+    if extension == '.db':
+        from models.grafo_sqlite import GrafoSQLite
+        return GrafoSQLite(fuente)
+    return None
+
+def _filas_inducidas(origen, ids):
+    """
+    Retorna (estudiantes, amistades) del subgrafo inducido por ids (en
+    orden), listos para agregar_estudiantes y agregar_amistades
+    """
+    presentes = set()
+    estudiantes = []
+    for id_est in ids:
+        info = origen.estudiantes.get(id_est)
+        if info is not None and id_est not in presentes:
+            presentes.add(id_est)
+            estudiantes.append((id_est, info['nombre'], info['carrera'], list(info.get('intereses', []))))
+    
+    # Cada amistad se agrega una vez, desde el primero de sus extremos
+    procesados = set()
+    amistades = []
+    for id_est, *_ in estudiantes:
+        for amigo_id, peso in origen.adj_list.get(id_est, {}).items():
+            if amigo_id in presentes and amigo_id not in procesados:
+                amistades.append((id_est, amigo_id, peso))
+        procesados.add(id_est)
+    return estudiantes, amistades
+
+def cargar_subgrafo(fuente, grafo, ids=None, filtro=None):
+    """
+    Carga en grafo el subgrafo inducido por los estudiantes seleccionados
+    
+    Args:
+        fuente: Grafo, GrafoCSR, GrafoSQLite o ruta de un archivo .json
+            (o .json.gz/.json.xz), .bin o .db
+        grafo: Instancia del grafo destino (se reemplaza su contenido;
+            puede ser el mismo objeto que fuente)
+        ids: Coleccion de IDs a cargar; con fuentes indexadas solo se leen
+            sus registros
+        filtro: Funcion (id_estudiante, info) -> bool, con info
+            {'nombre', 'carrera', 'intereses'}
+    """
+    if _es_ruta(fuente) and not os.path.exists(fuente):
+        print(f"Archivo {fuente} no encontrado")
+        return False
+    origen = _abrir_fuente(fuente)
+    if origen is None:
+        return cargar_json(grafo, fuente, filtro=filtro, ids=ids)
+    
+    try:
+        if ids is not None:
+            seleccionar = crear_seleccion(filtro)
+            seleccionados = [
+                id_est for id_est in ids
+                if id_est in origen.estudiantes
+                and (seleccionar is None or seleccionar(id_est, origen.estudiantes[id_est]))
+            ]
+        elif filtro is not None:
+            seleccionados = [id_est for id_est, info in origen.estudiantes.items() if filtro(id_est, info)]
+        else:
+            seleccionados = list(origen.estudiantes)
+        # Las filas se copian antes de limpiar: fuente puede ser el propio grafo
+        estudiantes, amistades = _filas_inducidas(origen, seleccionados)
+        grafo.limpiar()
+        grafo.agregar_estudiantes(estudiantes)
+        num_amistades = grafo.agregar_amistades(amistades)
+    finally:
+        if origen is not fuente and hasattr(origen, 'cerrar'):
+            origen.cerrar()
+    
+    print(f"Subgrafo cargado: {len(grafo.estudiantes)} estudiantes, {num_amistades} amistades")
+    return True
+
+def vecindario(fuente, id_inicio, radio=2):
+    """
+    Retorna la lista de estudiantes a lo sumo a `radio` saltos de id_inicio,
+    en el orden en que se alcanzan
+    
+    Con fuentes indexadas se consultan solo los amigos de cada frontera; un
+    archivo JSON se recorre una vez por salto.
+    
+    Args:
+        fuente: Grafo, GrafoCSR, GrafoSQLite o ruta de archivo (ver cargar_subgrafo)
+        id_inicio: ID del estudiante central
+        radio: Numero maximo de saltos
+    """
+    if _es_ruta(fuente) and not os.path.exists(fuente):
+        return []
+    origen = _abrir_fuente(fuente)
+    if origen is None:
+        existe = any(est['id'] == id_inicio for est in iterar_seccion_json(fuente, 'estudiantes'))
+        if not existe:
+            return []
+        # dict como conjunto ordenado
+        visitados = {id_inicio: None}
+        frontera = {id_inicio}
+        for _ in range(radio):
+            nuevos = {}
+            for amistad in iterar_seccion_json(fuente, 'amistades'):
+                id1, id2 = amistad['id1'], amistad['id2']
+                if id1 in frontera and id2 not in visitados:
+                    nuevos[id2] = None
+                if id2 in frontera and id1 not in visitados:
+                    nuevos[id1] = None
+            if not nuevos:
+                break
+            visitados.update(nuevos)
+            frontera = set(nuevos)
+        return list(visitados)
+    
+    try:
+        if id_inicio not in origen.estudiantes:
+            return []
+        visitados = [id_inicio]
+        vistos = {id_inicio}
+        frontera = [id_inicio]
+        for _ in range(radio):
+            siguiente = []
+            for id_est in frontera:
+                for amigo_id in origen.adj_list.get(id_est, {}):
+                    if amigo_id not in vistos:
+                        vistos.add(amigo_id)
+                        siguiente.append(amigo_id)
+            if not siguiente:
+                break
+            visitados.extend(siguiente)
+            frontera = siguiente
+        return visitados
+    finally:
+        if origen is not fuente and hasattr(origen, 'cerrar'):
+            origen.cerrar()
+
+def cargar_ego(fuente, grafo, id_estudiante, radio=2):
+    """
+    Carga en grafo la red ego de un estudiante: el subgrafo inducido por
+    los estudiantes a lo sumo a `radio` saltos de el
+    
+    Args:
+        fuente: Grafo, GrafoCSR, GrafoSQLite o ruta de archivo (ver cargar_subgrafo)
+        grafo: Instancia del grafo destino (se reemplaza su contenido)
+        id_estudiante: ID del estudiante central
+        radio: Numero maximo de saltos
+    """
+    ids = vecindario(fuente, id_estudiante, radio)
+    if not ids:
+        print(f"Estudiante {id_estudiante} no encontrado")
+        return False
+    return cargar_subgrafo(fuente, grafo, ids=ids)
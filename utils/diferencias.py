@@ -0,0 +1,264 @@
+"""
+Diferencias entre dos versiones de la red
+
+Compara dos grafos o snapshots JSON recorriendo sus estudiantes y amistades
+ordenados por ID en paralelo (merge-join), sin cargarlos: la memoria usada
+depende de la cantidad de cambios y no del tamano de la red. La diferencia
+puede aplicarse sobre otro grafo como un parche, en tiempo proporcional a
+los cambios.
+"""
+import heapq
+import json
+import os
+import tempfile
+from itertools import islice
+
+from .persistencia_json import (
+    abrir_archivo, sincronizar_archivo, iterar_seccion_json, iterar_amistades_unicas,
+    leer_metadata_json
+)
+
+class Diferencia:
+    """
+    Cambios que llevan la red de origen a la de destino
+    
+    Atributos:
+        estudiantes_agregados: [(id, nombre, carrera, intereses)]
+        estudiantes_modificados: [(id, nombre, carrera, intereses)] con los datos nuevos
+        estudiantes_eliminados: [id]
+        amistades_agregadas: [(id1, id2, peso)]
+        amistades_eliminadas: [(id1, id2, peso)]
+        pesos_modificados: [(id1, id2, peso_anterior, peso_nuevo)]
+    """
+    
+    def __init__(self):
+        self.estudiantes_agregados = []
+        self.estudiantes_modificados = []
+        self.estudiantes_eliminados = []
+        self.amistades_agregadas = []
+        self.amistades_eliminadas = []
+        self.pesos_modificados = []
+    
+    def __len__(self):
+        return (
+            len(self.estudiantes_agregados) + len(self.estudiantes_modificados)
+            + len(self.estudiantes_eliminados) + len(self.amistades_agregadas)
+            + len(self.amistades_eliminadas) + len(self.pesos_modificados)
+        )
+    
+    def registros(self):
+        """
+        Itera los cambios como registros [operacion, *argumentos] en el
+        formato del registro de cambios, en un orden que puede aplicarse
+        directamente (los estudiantes se eliminan al final)
+        """
+        for id_est, nombre, carrera, intereses in self.estudiantes_agregados + self.estudiantes_modificados:
+            yield ['agregar_estudiante', id_est, nombre, carrera, list(intereses)]
+        for id1, id2, _ in self.amistades_eliminadas:
+            yield ['eliminar_amistad', id1, id2]
+        for id1, id2, peso in self.amistades_agregadas:
+            yield ['agregar_amistad', id1, id2, peso]
+        for id1, id2, _, peso in self.pesos_modificados:
+            yield ['actualizar_peso_amistad', id1, id2, peso]
+        for id_est in self.estudiantes_eliminados:
+            yield ['eliminar_estudiante', id_est]
+    
+    def guardar(self, archivo):
+        """
+        Guarda la diferencia como archivo de registro (una linea JSON por
+        cambio), que puede aplicarse con reaplicar_registro
+        """
+        raiz, extension = os.path.splitext(archivo)
+        temporal = raiz + '.tmp' + extension
+        with abrir_archivo(temporal, 'wt') as f:
+            for registro in self.registros():
+                f.write(json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n')
+        sincronizar_archivo(temporal)
+        os.replace(temporal, archivo)
+    
+    def mostrar(self):
+        """Imprime un resumen de la diferencia"""
+        print(f"Estudiantes: +{len(self.estudiantes_agregados)} -{len(self.estudiantes_eliminados)} "
+              f"~{len(self.estudiantes_modificados)}")
+        print(f"Amistades: +{len(self.amistades_agregadas)} -{len(self.amistades_eliminadas)} "
+              f"(pesos modificados: {len(self.pesos_modificados)})")
+
+def _es_ruta(fuente):
+    return isinstance(fuente, (str, os.PathLike))
+
+def _ordenar_externo(registros, clave, tamano_bloque):
+    """
+    Ordena un flujo de registros con memoria acotada: ordena bloques de
+    tamano_bloque, los escribe en archivos temporales y los mezcla
+    """
+    registros = iter(registros)
+    bloques = []
+    try:
+        while True:
+            lote = list(islice(registros, tamano_bloque))
+            if not lote:
+                break
+            lote.sort(key=clave)
+            if not bloques and len(lote) < tamano_bloque:
+                # Cabe en un solo bloque: no hace falta pasar por disco
+                yield from lote
+                return
+            temporal = tempfile.TemporaryFile('w+t', encoding='utf-8')
+            bloques.append(temporal)
+            for registro in lote:
+                temporal.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            temporal.seek(0)
+        yield from heapq.merge(*(map(json.loads, temporal) for temporal in bloques), key=clave)
+    finally:
+        for temporal in bloques:
+            temporal.close()
+
+def _clave_estudiante(registro):
+    return registro[0]
+
+def _clave_amistad(registro):
+    return registro[0], registro[1]
+
+def _ordenar_ids(ids):
+    try:
+        return sorted(ids)
+    except TypeError:
+        raise ValueError("Los IDs de estudiantes no son comparables entre si") from None
+
+def _estudiantes_ordenados(fuente, tamano_bloque):
+    """Itera (id, nombre, carrera, intereses) por ID creciente"""
+    if not _es_ruta(fuente):
+        for id_est in _ordenar_ids(fuente.estudiantes):
+            info = fuente.estudiantes[id_est]
+            yield id_est, info['nombre'], info['carrera'], info.get('intereses', [])
+        return
+    
+    registros = (
+        (est['id'], est['nombre'], est['carrera'], est.get('intereses', []))
+        for est in iterar_seccion_json(fuente, 'estudiantes')
+    )
+    if leer_metadata_json(fuente).get('ordenado'):
+        yield from registros
+    else:
+        yield from _ordenar_externo(registros, _clave_estudiante, tamano_bloque)
+
+def _amistades_ordenadas(fuente, tamano_bloque):
+    """Itera (id1, id2, peso) con id1 <= id2, por (id1, id2) creciente"""
+    if not _es_ruta(fuente):
+        yield from iterar_amistades_unicas(fuente, _ordenar_ids(fuente.estudiantes))
+        return
+    
+    registros = (
+        (amistad['id1'], amistad['id2'], amistad.get('peso', 1))
+        if amistad['id1'] <= amistad['id2']
+        else (amistad['id2'], amistad['id1'], amistad.get('peso', 1))
+        for amistad in iterar_seccion_json(fuente, 'amistades')
+    )
+    if leer_metadata_json(fuente).get('ordenado'):
+        yield from registros
+    else:
+        yield from _ordenar_externo(registros, _clave_amistad, tamano_bloque)
+
+def _combinar(origen, destino, clave):
+    """
+    Recorre dos flujos ordenados por clave a la vez y empareja sus registros
+    
+    Genera (registro_origen, registro_destino), con None del lado en el que
+    la clave no aparece.
+    """
+    origen = iter(origen)
+    destino = iter(destino)
+    a = next(origen, None)
+    b = next(destino, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and clave(a) < clave(b)):
+            yield a, None
+            a = next(origen, None)
+        elif a is None or clave(b) < clave(a):
+            yield None, b
+            b = next(destino, None)
+        else:
+            yield a, b
+            a = next(origen, None)
+            b = next(destino, None)
+
+def diferenciar(origen, destino, tamano_bloque=100000):
+    """
+    Calcula los cambios que llevan la red de origen a la de destino
+    
+    Los snapshots guardados con guardar_json ya estan ordenados por ID y se
+    leen en streaming; los demas archivos JSON (p.ej. de versiones
+    anteriores) se ordenan por bloques en archivos temporales.
+    
+    Args:
+        origen, destino: Grafo, GrafoCSR, GrafoSQLite o ruta de un archivo
+            JSON (opcionalmente .gz/.xz, como las bases de backups/)
+        tamano_bloque: Registros ordenados en memoria a la vez al ordenar
+            archivos que no lo estan
+    
+    Retorna una Diferencia.
+    """
+    diferencia = Diferencia()
+    
+    for antes, despues in _combinar(
+        _estudiantes_ordenados(origen, tamano_bloque),
+        _estudiantes_ordenados(destino, tamano_bloque),
+        _clave_estudiante
+    ):
+        if antes is None:
+            diferencia.estudiantes_agregados.append(tuple(despues))
+        elif despues is None:
+            diferencia.estudiantes_eliminados.append(antes[0])
+        elif (antes[1], antes[2], list(antes[3])) != (despues[1], despues[2], list(despues[3])):
+            diferencia.estudiantes_modificados.append(tuple(despues))
+    
+    for antes, despues in _combinar(
+        _amistades_ordenadas(origen, tamano_bloque),
+        _amistades_ordenadas(destino, tamano_bloque),
+        _clave_amistad
+    ):
+        if antes is None:
+            diferencia.amistades_agregadas.append(tuple(despues))
+        elif despues is None:
+            diferencia.amistades_eliminadas.append(tuple(antes))
+        elif antes[2] != despues[2]:
+            diferencia.pesos_modificados.append((antes[0], antes[1], antes[2], despues[2]))
+    
+    return diferencia
+
+def aplicar_diferencia(grafo, diferencia):
+    """
+    Aplica una diferencia sobre el grafo (que deberia estar en el estado de origen)
+    
+    El costo es proporcional a la cantidad de cambios. Retorna la cantidad
+    de cambios aplicados.
+    """
+    aplicados = 0
+    for registro in diferencia.registros():
+        getattr(grafo, registro[0])(*registro[1:])
+        aplicados += 1
+    return aplicados
+
+def diferenciar_backups(fecha_origen, fecha_destino=None, directorio='backups'):
+    """
+    Calcula los cambios entre dos backups de un directorio
+    
+    Cada backup se restaura (base y deltas) en un grafo en memoria antes de
+    compararlos. Para comparar directamente dos bases sin restaurarlas,
+    pasar sus rutas a diferenciar.
+    
+    Args:
+        fecha_origen, fecha_destino: datetime o texto ISO, como en
+            restaurar_backup (None = el mas reciente)
+        directorio: Directorio de los backups
+    """
+    from models.grafo import Grafo
+    from .backups import restaurar_backup
+    
+    origen = Grafo()
+    destino = Grafo()
+    if not restaurar_backup(origen, fecha_origen, directorio):
+        return None
+    if not restaurar_backup(destino, fecha_destino, directorio):
+        return None
+    return diferenciar(origen, destino)
@@ -1,51 +1,149 @@
-def mostrar_estadisticas(grafo):
-    """Muestra estadisticas basicas del grafo"""
+import copy
+import weakref
+
+from algorithms.ranking import top_k
+
+# Ultimas estadisticas de cada grafo: (version, top, resultado)
+_cache = weakref.WeakKeyDictionary()
+
+def _agregar_estructurales(grafo, resultado):
+    if 'estructurales' not in resultado:
+        # NumPy solo se carga cuando se piden estas metricas
+        from algorithms.estructura import metricas_estructurales
+        resultado['estructurales'] = metricas_estructurales(grafo)
+
+def _copiar_resultado(resultado, top, estructurales):
+    """Copia independiente del resultado cacheado, para que el llamador pueda modificarla"""
+    copia = {
+        clave: valor for clave, valor in resultado.items()
+        if clave != 'estructurales' or estructurales
+    }
+    copia['populares'] = resultado['populares'][:top]
+    return copy.deepcopy(copia)
+
+def calcular_estadisticas(grafo, top=10, estructurales=False):
+    """
+    Calcula las estadisticas de resumen del grafo en una sola pasada
+    
+    El resultado se guarda por grafo y se reutiliza mientras grafo.version
+    no cambie, por lo que la CLI y el reporte PDF no recorren la red de nuevo.
+    Cada llamada retorna una copia propia que puede modificarse sin afectar
+    al cache.
+    
+    Args:
+        grafo: Instancia del grafo
+        top: Cantidad de estudiantes mas populares a incluir
+        estructurales: Incluir tambien las metricas de
+            algorithms.estructura.metricas_estructurales (triangulos,
+            clustering, asortatividad, diametro efectivo)
+    
+    Retorna diccionario con:
+        num_estudiantes, num_amistades, promedio_amigos, densidad (0-1)
+        carreras: [(carrera, estudiantes)] de mayor a menor
+        populares: [(nombre, amigos, carrera)] de mayor a menor
+        pesos: [(peso, amistades)] por peso creciente
+        estructurales: solo si se piden
+    """
+    version = getattr(grafo, 'version', None)
+    try:
+        guardado = _cache.get(grafo)
+    except TypeError:
+        guardado = None
+    if guardado is not None and version is not None and guardado[0] == version and guardado[1] >= top:
+        resultado = guardado[2]
+        if estructurales:
+            _agregar_estructurales(grafo, resultado)
+        return _copiar_resultado(resultado, top, estructurales)
+    
+    carreras = {}
+    pesos = {}
+    entradas = 0
+    adj_list = grafo.adj_list
+    
+    def recorrer():
+        # Acumula carreras, grados y pesos mientras top_k consume los estudiantes
+        nonlocal entradas
+        for id_est, info in grafo.estudiantes.items():
+            carrera = info['carrera']
+            carreras[carrera] = carreras.get(carrera, 0) + 1
+            amigos = adj_list.get(id_est, {})
+            entradas += len(amigos)
+            for peso in amigos.values():
+                pesos[peso] = pesos.get(peso, 0) + 1
+            yield info['nombre'], len(amigos), carrera
+    
+    populares = top_k(recorrer(), top, clave=lambda x: x[1])
+    num_estudiantes = sum(carreras.values())
+    num_amistades = entradas // 2
+    
+    resultado = {
+        'num_estudiantes': num_estudiantes,
+        'num_amistades': num_amistades,
+        'promedio_amigos': num_amistades * 2 / num_estudiantes if num_estudiantes > 0 else 0,
+        'densidad': num_amistades / (num_estudiantes * (num_estudiantes - 1) / 2) if num_estudiantes > 1 else 0,
+        'carreras': sorted(carreras.items(), key=lambda x: x[1], reverse=True),
+        'populares': populares,
+        'pesos': [(peso, cantidad // 2) for peso, cantidad in sorted(pesos.items())]
+    }
+    if estructurales:
+        _agregar_estructurales(grafo, resultado)
+    if version is not None:
+        try:
+            _cache[grafo] = (version, top, resultado)
+        except TypeError:
+            pass
+    return _copiar_resultado(resultado, top, estructurales)
+
+def mostrar_estadisticas(grafo, estructurales=True):
+    """
+    Muestra estadisticas basicas del grafo
+    
+    Args:
+        grafo: Instancia del grafo
+        estructurales: Mostrar tambien clustering, asortatividad y diametro efectivo
+    """
     print("\n" + "="*50)
     print("ESTADISTICAS DE LA RED")
     print("="*50)
     
-    num_estudiantes = len(grafo.estudiantes)
-    if num_estudiantes == 0:
+    estadisticas = calcular_estadisticas(grafo, estructurales=estructurales)
+    if estadisticas['num_estudiantes'] == 0:
         print("No hay estudiantes en la red")
         return
     
-    num_amistades = sum(len(amigos) for amigos in grafo.adj_list.values()) // 2
-    
-    print(f"Total de estudiantes: {num_estudiantes}")
-    print(f"Total de amistades: {num_amistades}")
+    print(f"Total de estudiantes: {estadisticas['num_estudiantes']}")
+    print(f"Total de amistades: {estadisticas['num_amistades']}")
     
-    if num_amistades > 0:
-        print(f"Promedio de amigos por estudiante: {num_amistades*2/num_estudiantes:.2f}")
+    if estadisticas['num_amistades'] > 0:
+        print(f"Promedio de amigos por estudiante: {estadisticas['promedio_amigos']:.2f}")
     
     # Estudiantes por carrera
-    carreras = {}
-    for info in grafo.estudiantes.values():
-        carrera = info['carrera']
-        carreras[carrera] = carreras.get(carrera, 0) + 1
-    
     print("\nEstudiantes por carrera:")
-    for carrera, cantidad in sorted(carreras.items(), key=lambda x: x[1], reverse=True):
+    for carrera, cantidad in estadisticas['carreras']:
         print(f"  {carrera}: {cantidad} estudiantes")
     
     # Estudiantes mas populares
-    popularidad = []
-    for id_est in grafo.estudiantes:
-        num_amigos = len(grafo.obtener_amigos(id_est))
-        popularidad.append((grafo.estudiantes[id_est]['nombre'], num_amigos))
-    
-    popularidad.sort(key=lambda x: x[1], reverse=True)
     print("\nEstudiantes mas populares:")
-    for nombre, amigos in popularidad[:5]:
+    for nombre, amigos, _ in estadisticas['populares'][:5]:
         print(f"  {nombre}: {amigos} amigos")
     
     # Distribucion de pesos de amistades
-    pesos = {}
-    for id1 in grafo.adj_list:
-        for id2, peso in grafo.adj_list[id1].items():
-            pesos[peso] = pesos.get(peso, 0) + 1
-    
-    if pesos:
+    if estadisticas['pesos']:
         print("\nDistribucion de intensidad de amistades:")
-        for peso, cantidad in sorted(pesos.items()):
+        for peso, cantidad in estadisticas['pesos']:
             tipo = "Normal" if peso == 1 else "Mejor amigo" if peso == 2 else "Amigo cercano"
-            print(f"  Nivel {peso} ({tipo}): {cantidad // 2} amistades")
+            print(f"  Nivel {peso} ({tipo}): {cantidad} amistades")
+    
+    # Metricas estructurales
+    if estructurales:
+        metricas = estadisticas['estructurales']
+        diametro = metricas['diametro']
+        asortatividad = 'n/d' if metricas['asortatividad'] is None else f"{metricas['asortatividad']:.4f}"
+        print("\nMetricas estructurales:")
+        print(f"  Triangulos: {metricas['triangulos']}")
+        print(f"  Clustering global (transitividad): {metricas['clustering_global']:.4f}")
+        print(f"  Clustering local promedio: {metricas['clustering_promedio']:.4f}")
+        print(f"  Asortatividad de grado: {asortatividad}")
+        print(f"  Grado maximo: {metricas['grado_maximo']}")
+        print(f"  Diametro efectivo (90%): {diametro['diametro_efectivo']:.2f} "
+              f"(distancia maxima observada: {diametro['distancia_maxima']}, BFS desde {diametro['fuentes']} estudiantes)")
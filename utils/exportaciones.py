@@ -0,0 +1,33 @@
+"""
+Exportaciones perezosas de los paquetes (PEP 562)
+
+algorithms, models y utils declaran en un diccionario que nombre exporta
+cada modulo; el modulo se importa la primera vez que se usa el nombre, asi
+NumPy, NetworkX, matplotlib o ReportLab no se cargan al importar el paquete.
+"""
+import importlib
+import sys
+
+def exportar_perezoso(nombre_modulo, exportaciones):
+    """
+    Retorna las funciones (__getattr__, __dir__) de un paquete con
+    exportaciones perezosas
+    
+    Args:
+        nombre_modulo: __name__ del paquete
+        exportaciones: Diccionario {nombre exportado: modulo relativo que lo define}
+    """
+    def __getattr__(nombre):
+        """Importa el modulo que define `nombre` la primera vez que se usa"""
+        modulo = exportaciones.get(nombre)
+        if modulo is None:
+            raise AttributeError(f"module {nombre_modulo!r} has no attribute {nombre!r}")
+        valor = getattr(importlib.import_module(modulo, nombre_modulo), nombre)
+        # Las siguientes consultas ya no pasan por __getattr__
+        setattr(sys.modules[nombre_modulo], nombre, valor)
+        return valor
+    
+    def __dir__():
+        return sorted(set(vars(sys.modules[nombre_modulo])) | set(exportaciones))
+    
+    return __getattr__, __dir__
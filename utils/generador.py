@@ -1,4 +1,11 @@
+import csv
+import math
+import os
 import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 NOMBRES = [
     'Ana', 'Luis', 'Maria', 'Carlos', 'Elena', 'Pedro', 'Sofia', 'Miguel',
@@ -24,51 +31,168 @@ INTERESES = [
     'Politica', 'Naturaleza', 'Historia', 'Literatura', 'Programacion'
 ]
 
-def generar_datos_aleatorios(grafo, num_estudiantes=30, densidad_amistades=0.15):
+def _pares_aleatorios(n, probabilidad, rng, inicio=0, fin=None):
+    """
+    Itera los pares (i, j), 0 <= i < j < n, que resultan elegidos cada uno
+    con la probabilidad dada (modelo de Erdos-Renyi G(n, p))
+    
+    En lugar de sortear cada uno de los n*(n-1)/2 pares, se sortea cuantos
+    pares saltar hasta el siguiente elegido, que sigue una distribucion
+    geometrica (Batagelj y Brandes, 2005). El costo es O(n + pares elegidos).
+    Con inicio y fin solo se recorren las filas inicio <= i < fin.
+    """
+    ultima = min(n - 1, n if fin is None else fin)
+    if probabilidad <= 0 or inicio >= ultima:
+        return
+    if probabilidad >= 1:
+        for i in range(inicio, ultima):
+            for j in range(i + 1, n):
+                yield i, j
+        return
+    
+    log_q = math.log(1 - probabilidad)
+    i, j = inicio, inicio
+    while True:
+        j += 1 + int(math.log(1 - rng.random()) / log_q)
+        # Pasar a las filas siguientes del triangulo superior
+        while j >= n:
+            i += 1
+            if i >= ultima:
+                return
+            j = j - n + i + 1
+        yield i, j
+
+def _peso_aleatorio(rng):
+    """Peso aleatorio: 80% peso 1, 15% peso 2, 5% peso 3"""
+    rand = rng.random()
+    if rand < 0.80:
+        return 1
+    elif rand < 0.95:
+        return 2
+    return 3
+
+def _estudiante_aleatorio(i, rng):
+    """Retorna (id, nombre, carrera, intereses) del estudiante numero i (desde 0)"""
+    nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+    carrera = rng.choice(CARRERAS)
+    
+    # Generar intereses aleatorios (2-5 intereses por estudiante)
+    num_intereses = rng.randint(2, 5)
+    intereses = rng.sample(INTERESES, num_intereses)
+    return str(i + 1), nombre, carrera, intereses
+
+def generar_datos_aleatorios(grafo, num_estudiantes=30, densidad_amistades=0.15, semilla=None):
     """
     Genera datos aleatorios para testing
     
+    Las amistades se sortean por saltos geometricos, en tiempo proporcional
+    a la cantidad de estudiantes y amistades generadas.
+    
     Args:
         grafo: Instancia del grafo a poblar
         num_estudiantes: Cantidad de estudiantes a generar
         densidad_amistades: Probabilidad de amistad entre dos estudiantes (0-1)
+        semilla: Semilla para obtener siempre la misma red (None = usa el
+            generador global de random)
     """
+    rng = random if semilla is None else random.Random(semilla)
     print(f"\nGenerando {num_estudiantes} estudiantes aleatorios...")
     
     # Generar estudiantes
-    ids_generados = []
-    for i in range(1, num_estudiantes + 1):
-        nombre = f"{random.choice(NOMBRES)} {random.choice(APELLIDOS)}"
-        carrera = random.choice(CARRERAS)
-        id_est = str(i)
-        
-        # Generar intereses aleatorios (2-5 intereses por estudiante)
-        num_intereses = random.randint(2, 5)
-        intereses = random.sample(INTERESES, num_intereses)
-        
-        grafo.agregar_estudiante(id_est, nombre, carrera, intereses)
-        ids_generados.append(id_est)
+    estudiantes = [_estudiante_aleatorio(i, rng) for i in range(num_estudiantes)]
+    ids_generados = [est[0] for est in estudiantes]
+    grafo.agregar_estudiantes(estudiantes)
     
     print(f"Estudiantes generados: {num_estudiantes}")
     
     # Generar amistades aleatorias
-    amistades_creadas = 0
-    for i, id1 in enumerate(ids_generados):
-        for id2 in ids_generados[i+1:]:
-            if random.random() < densidad_amistades:
-                # Peso aleatorio: 80% peso 1, 15% peso 2, 5% peso 3
-                rand = random.random()
-                if rand < 0.80:
-                    peso = 1
-                elif rand < 0.95:
-                    peso = 2
-                else:
-                    peso = 3
-                
-                grafo.agregar_amistad(id1, id2, peso)
-                amistades_creadas += 1
+    amistades_creadas = grafo.agregar_amistades(
+        (ids_generados[i], ids_generados[j], _peso_aleatorio(rng))
+        for i, j in _pares_aleatorios(num_estudiantes, densidad_amistades, rng)
+    )
     
     print(f"Amistades generadas: {amistades_creadas}")
-    print(f"Densidad real: {amistades_creadas / (num_estudiantes * (num_estudiantes - 1) / 2):.2%}")
+    if num_estudiantes > 1:
+        print(f"Densidad real: {amistades_creadas / (num_estudiantes * (num_estudiantes - 1) / 2):.2%}")
     
     return ids_generados
+
+def _generar_fragmento(directorio, bloque, inicio, fin, num_estudiantes, densidad, semilla):
+    """
+    Escribe los estudiantes inicio..fin-1 y sus amistades con estudiantes
+    posteriores en dos CSV sin encabezado (funcion de los procesos hijos)
+    
+    Cada bloque usa generadores propios derivados de la semilla y del
+    numero de bloque, por lo que su contenido no depende de que proceso
+    lo genere ni de cuantos procesos haya.
+    """
+    rng = random.Random(f"{semilla}:estudiantes:{bloque}")
+    with open(os.path.join(directorio, f'estudiantes_{bloque}.csv'), 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        for i in range(inicio, fin):
+            id_est, nombre, carrera, _ = _estudiante_aleatorio(i, rng)
+            writer.writerow((id_est, nombre, carrera))
+    
+    rng = random.Random(f"{semilla}:amistades:{bloque}")
+    amistades = 0
+    with open(os.path.join(directorio, f'amistades_{bloque}.csv'), 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        for i, j in _pares_aleatorios(num_estudiantes, densidad, rng, inicio, fin):
+            writer.writerow((i + 1, j + 1, _peso_aleatorio(rng)))
+            amistades += 1
+    return amistades
+
+def generar_datos_paralelo(archivo_estudiantes='estudiantes.csv', archivo_amistades='amistades.csv',
+                           num_estudiantes=100000, densidad_amistades=0.0001, semilla=0,
+                           procesos=None, tamano_bloque=10000):
+    """
+    Genera una red aleatoria grande directamente en archivos CSV usando
+    varios procesos
+    
+    Los estudiantes se dividen en bloques de tamano_bloque; cada bloque
+    genera sus estudiantes y las amistades hacia estudiantes posteriores
+    con un generador propio derivado de la semilla y escribe un fragmento.
+    Los fragmentos se unen en orden, por lo que el resultado es identico
+    byte a byte para una misma semilla sin importar el numero de procesos.
+    
+    Args:
+        archivo_estudiantes, archivo_amistades: Rutas de los CSV (formato de guardar_datos)
+        num_estudiantes: Cantidad de estudiantes a generar
+        densidad_amistades: Probabilidad de amistad entre dos estudiantes (0-1)
+        semilla: Semilla maestra
+        procesos: Numero de procesos (None = numero de CPUs, 1 = sin procesos)
+        tamano_bloque: Estudiantes por bloque (cambiarlo cambia la red generada)
+    """
+    print(f"\nGenerando {num_estudiantes} estudiantes aleatorios en {archivo_estudiantes} y {archivo_amistades}...")
+    bloques = list(range((num_estudiantes + tamano_bloque - 1) // tamano_bloque))
+    inicios = [b * tamano_bloque for b in bloques]
+    fines = [min(inicio + tamano_bloque, num_estudiantes) for inicio in inicios]
+    
+    directorio = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(archivo_amistades)))
+    try:
+        argumentos = (
+            repeat(directorio), bloques, inicios, fines,
+            repeat(num_estudiantes), repeat(densidad_amistades), repeat(semilla)
+        )
+        if procesos != 1 and len(bloques) > 1:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                amistades = sum(ejecutor.map(_generar_fragmento, *argumentos))
+        else:
+            amistades = sum(map(_generar_fragmento, *argumentos))
+        
+        # Unir los fragmentos en orden de bloque
+        for archivo, prefijo, encabezado in (
+            (archivo_estudiantes, 'estudiantes', 'id,nombre,carrera'),
+            (archivo_amistades, 'amistades', 'id1,id2,peso')
+        ):
+            with open(archivo, 'wb') as salida:
+                salida.write(encabezado.encode('utf-8') + b'\r\n')
+                for bloque in bloques:
+                    with open(os.path.join(directorio, f'{prefijo}_{bloque}.csv'), 'rb') as fragmento:
+                        shutil.copyfileobj(fragmento, salida)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    
+    print(f"Estudiantes generados: {num_estudiantes}")
+    print(f"Amistades generadas: {amistades}")
+    return amistades
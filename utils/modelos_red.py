@@ -0,0 +1,319 @@
+"""
+Modelos de redes sinteticas para pruebas de rendimiento
+
+Cada modelo genera estudiantes (con los vocabularios de generador.py) y
+amistades como flujos deterministas dada la semilla, por lo que pueden
+recorrerse varias veces y escribirse directamente a CSV, JSON o snapshot
+binario sin armar la red en memoria.
+
+Modelos:
+    BarabasiAlbert: grados con cola pesada (enlace preferencial)
+    WattsStrogatz: mundo pequeno, alto coeficiente de agrupamiento
+    BloquesEstocasticos: comunidades por carrera con homofilia por intereses
+"""
+import csv
+import json
+import math
+import random
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime
+
+from .generador import CARRERAS, INTERESES, _estudiante_aleatorio, _pares_aleatorios, _peso_aleatorio
+from .persistencia_json import abrir_archivo, _en_lotes
+
+class ModeloRed(ABC):
+    """
+    Base de los modelos: genera los estudiantes '1'..'N' y deja las
+    amistades a cada subclase, que debe implementar _aristas()
+    
+    Args:
+        num_estudiantes: Cantidad de estudiantes
+        semilla: Semilla del generador (la misma semilla da la misma red)
+    """
+    
+    def __init__(self, num_estudiantes, semilla=0):
+        self.num_estudiantes = num_estudiantes
+        self.semilla = semilla
+    
+    def _rng(self, etapa):
+        return random.Random(f"{self.semilla}:{etapa}")
+    
+    def _id(self, i):
+        return str(i + 1)
+    
+    def estudiantes(self):
+        """Itera (id, nombre, carrera, intereses)"""
+        rng = self._rng('estudiantes')
+        for i in range(self.num_estudiantes):
+            yield _estudiante_aleatorio(i, rng)
+    
+    def amistades(self):
+        """Itera (id1, id2, peso) con cada amistad una sola vez"""
+        for i, j, peso in self._aristas():
+            yield self._id(i), self._id(j), peso
+    
+    @abstractmethod
+    def _aristas(self):
+        """Itera (i, j, peso) con los indices (desde 0) de cada amistad"""
+    
+    def descripcion(self):
+        return {'modelo': type(self).__name__, 'num_estudiantes': self.num_estudiantes, 'semilla': self.semilla}
+
+class BarabasiAlbert(ModeloRed):
+    """
+    Modelo de Barabasi-Albert: cada estudiante nuevo se hace amigo de m
+    estudiantes existentes elegidos con probabilidad proporcional a su grado
+    
+    Guarda una lista de extremos de todas las amistades (enteros compactos,
+    8 bytes por extremo) para el sorteo proporcional al grado.
+    
+    Args:
+        num_estudiantes: Cantidad de estudiantes
+        m: Amistades de cada estudiante nuevo
+        semilla: Semilla del generador
+    """
+    
+    def __init__(self, num_estudiantes, m=3, semilla=0):
+        super().__init__(num_estudiantes, semilla)
+        if not 1 <= m < num_estudiantes:
+            raise ValueError("m debe cumplir 1 <= m < num_estudiantes")
+        self.m = m
+    
+    def descripcion(self):
+        return dict(super().descripcion(), m=self.m)
+    
+    def _aristas(self):
+        rng = self._rng('amistades')
+        m = self.m
+        extremos = array('q')
+        destinos = list(range(m))
+        for nuevo in range(m, self.num_estudiantes):
+            for destino in destinos:
+                yield nuevo, destino, _peso_aleatorio(rng)
+            extremos.extend(destinos)
+            extremos.extend([nuevo] * m)
+            
+            # Sortear m destinos distintos proporcionalmente al grado
+            elegidos = set()
+            destinos = []
+            while len(destinos) < m:
+                destino = extremos[rng.randrange(len(extremos))]
+                if destino not in elegidos:
+                    elegidos.add(destino)
+                    destinos.append(destino)
+
+class WattsStrogatz(ModeloRed):
+    """
+    Modelo de Watts-Strogatz: anillo donde cada estudiante es amigo de sus k
+    vecinos mas cercanos, con cada amistad reconectada a un estudiante al
+    azar con probabilidad beta
+    
+    Los destinos reconectados nunca son vecinos del anillo; solo se
+    recuerdan las amistades reconectadas (O(beta * N * k) de memoria).
+    
+    Args:
+        num_estudiantes: Cantidad de estudiantes
+        k: Vecinos en el anillo (par)
+        beta: Probabilidad de reconexion (0-1)
+        semilla: Semilla del generador
+    """
+    
+    def __init__(self, num_estudiantes, k=6, beta=0.1, semilla=0):
+        super().__init__(num_estudiantes, semilla)
+        if k % 2 or not 0 < k < num_estudiantes:
+            raise ValueError("k debe ser par y cumplir 0 < k < num_estudiantes")
+        self.k = k
+        self.beta = beta
+    
+    def descripcion(self):
+        return dict(super().descripcion(), k=self.k, beta=self.beta)
+    
+    def _aristas(self):
+        rng = self._rng('amistades')
+        n = self.num_estudiantes
+        medio = self.k // 2
+        # Sin estudiantes fuera del anillo cercano no se puede reconectar
+        puede_reconectar = n - 1 > self.k
+        reconectadas = set()
+        for i in range(n):
+            for salto in range(1, medio + 1):
+                j = (i + salto) % n
+                if puede_reconectar and rng.random() < self.beta:
+                    # Si no se encuentra un destino libre se conserva la amistad del anillo
+                    for _ in range(100):
+                        destino = rng.randrange(n)
+                        distancia = abs(destino - i)
+                        par = (min(i, destino), max(i, destino))
+                        if min(distancia, n - distancia) > medio and par not in reconectadas:
+                            reconectadas.add(par)
+                            j = destino
+                            break
+                yield i, j, _peso_aleatorio(rng)
+
+class BloquesEstocasticos(ModeloRed):
+    """
+    Modelo de bloques estocasticos con las carreras como bloques
+    
+    La probabilidad de amistad depende de si los estudiantes son de la misma
+    carrera (grado medio esperado grado_intra dentro de la carrera y
+    grado_inter fuera de ella) y crece con los intereses en comun:
+    p * (1 + homofilia * jaccard(intereses)). Los pares candidatos se
+    sortean por saltos geometricos con la probabilidad maxima de cada par
+    de bloques y se aceptan con la proporcion correspondiente, en tiempo
+    O(N + amistades).
+    
+    Args:
+        num_estudiantes: Cantidad de estudiantes
+        grado_intra: Amigos esperados dentro de la carrera (sin homofilia)
+        grado_inter: Amigos esperados en otras carreras (sin homofilia)
+        homofilia: Peso de los intereses compartidos (0 = sin efecto)
+        semilla: Semilla del generador
+    """
+    
+    def __init__(self, num_estudiantes, grado_intra=8, grado_inter=2, homofilia=2.0, semilla=0):
+        super().__init__(num_estudiantes, semilla)
+        self.grado_intra = grado_intra
+        self.grado_inter = grado_inter
+        self.homofilia = homofilia
+    
+    def descripcion(self):
+        return dict(
+            super().descripcion(),
+            grado_intra=self.grado_intra, grado_inter=self.grado_inter, homofilia=self.homofilia
+        )
+    
+    def _bloques(self):
+        """Retorna (indices de cada carrera, mascara de bits de intereses de cada estudiante)"""
+        posicion = {interes: b for b, interes in enumerate(INTERESES)}
+        bloques = {carrera: array('q') for carrera in CARRERAS}
+        mascaras = array('q')
+        for i, (_, _, carrera, intereses) in enumerate(self.estudiantes()):
+            bloques[carrera].append(i)
+            mascara = 0
+            for interes in intereses:
+                mascara |= 1 << posicion[interes]
+            mascaras.append(mascara)
+        return [bloques[carrera] for carrera in CARRERAS], mascaras
+    
+    def _aristas(self):
+        rng = self._rng('amistades')
+        bloques, mascaras = self._bloques()
+        n = self.num_estudiantes
+        factor_max = 1 + self.homofilia
+        
+        def aceptar(u, v):
+            comunes = bin(mascaras[u] & mascaras[v]).count('1')
+            jaccard = comunes / bin(mascaras[u] | mascaras[v]).count('1')
+            return rng.random() * factor_max < 1 + self.homofilia * jaccard
+        
+        for a, bloque_a in enumerate(bloques):
+            tamano = len(bloque_a)
+            if tamano > 1:
+                p = min(1.0, self.grado_intra / (tamano - 1))
+                for x, y in _pares_aleatorios(tamano, min(1.0, p * factor_max), rng):
+                    u, v = bloque_a[x], bloque_a[y]
+                    if aceptar(u, v):
+                        yield u, v, _peso_aleatorio(rng)
+            fuera = n - tamano
+            if not fuera:
+                continue
+            p = min(1.0, self.grado_inter / fuera)
+            for bloque_b in bloques[a + 1:]:
+                for x, y in _pares_bipartitos(tamano, len(bloque_b), min(1.0, p * factor_max), rng):
+                    u, v = bloque_a[x], bloque_b[y]
+                    if aceptar(u, v):
+                        yield u, v, _peso_aleatorio(rng)
+
+def _pares_bipartitos(n1, n2, probabilidad, rng):
+    """Como _pares_aleatorios, para los pares (i, j) con i < n1 y j < n2"""
+    total = n1 * n2
+    if probabilidad <= 0 or not total:
+        return
+    if probabilidad >= 1:
+        for k in range(total):
+            yield divmod(k, n2)
+        return
+    
+    log_q = math.log(1 - probabilidad)
+    k = -1
+    while True:
+        k += 1 + int(math.log(1 - rng.random()) / log_q)
+        if k >= total:
+            return
+        yield divmod(k, n2)
+
+def poblar_grafo(modelo, grafo):
+    """Agrega al grafo los estudiantes y amistades del modelo"""
+    for lote in _en_lotes(modelo.estudiantes(), 10000):
+        grafo.agregar_estudiantes(lote)
+    amistades = 0
+    for lote in _en_lotes(modelo.amistades(), 10000):
+        amistades += grafo.agregar_amistades(lote)
+    print(f"{type(modelo).__name__}: {len(grafo.estudiantes)} estudiantes, {amistades} amistades")
+    return amistades
+
+def exportar_csv(modelo, archivo_estudiantes='estudiantes.csv', archivo_amistades='amistades.csv'):
+    """Escribe la red del modelo en el formato CSV de guardar_datos"""
+    with open(archivo_estudiantes, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'nombre', 'carrera'])
+        writer.writerows((id_est, nombre, carrera) for id_est, nombre, carrera, _ in modelo.estudiantes())
+    
+    amistades = 0
+    with open(archivo_amistades, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id1', 'id2', 'peso'])
+        for amistad in modelo.amistades():
+            writer.writerow(amistad)
+            amistades += 1
+    print(f"Red generada en {archivo_estudiantes} y {archivo_amistades} ({amistades} amistades)")
+    return amistades
+
+def exportar_json(modelo, archivo='red_sintetica.json'):
+    """
+    Escribe la red del modelo en el formato de guardar_json (opcionalmente
+    comprimido con .gz/.xz)
+    
+    Los registros quedan en el orden de generacion ('ordenado': False).
+    """
+    metadata = dict(
+        modelo.descripcion(),
+        fecha_exportacion=datetime.now().isoformat(),
+        ordenado=False
+    )
+    amistades = 0
+    with abrir_archivo(archivo, 'wt') as f:
+        f.write('{\n  "metadata": ')
+        f.write(json.dumps(metadata, ensure_ascii=False))
+        
+        f.write(',\n  "estudiantes": [')
+        separador = '\n    '
+        for id_est, nombre, carrera, intereses in modelo.estudiantes():
+            f.write(separador)
+            f.write(json.dumps({
+                'id': id_est,
+                'nombre': nombre,
+                'carrera': carrera,
+                'intereses': intereses
+            }, ensure_ascii=False))
+            separador = ',\n    '
+        
+        f.write('\n  ],\n  "amistades": [')
+        separador = '\n    '
+        for id1, id2, peso in modelo.amistades():
+            f.write(separador)
+            f.write(json.dumps({'id1': id1, 'id2': id2, 'peso': peso}, ensure_ascii=False))
+            separador = ',\n    '
+            amistades += 1
+        f.write('\n  ]\n}\n')
+    print(f"Red generada en {archivo} ({amistades} amistades)")
+    return amistades
+
+def exportar_binario(modelo, archivo='red_sintetica.bin'):
+    """Escribe la red del modelo como snapshot binario (ver cargar_binario)"""
+    from .persistencia_binaria import guardar_binario_flujo
+    
+    guardar_binario_flujo(modelo.estudiantes(), modelo.amistades, archivo)
+    print(f"Red generada en {archivo}")
+    return True
@@ -0,0 +1,354 @@
+"""
+Snapshot binario columnar del grafo con carga mediante mmap
+
+Formato (little-endian, cada seccion alineada a 8 bytes):
+    Encabezado: MAGIA, version, tipo de pesos y numero de nodos, entradas
+        de adyacencia, cadenas e intereses, seguido de la tabla de
+        secciones (desplazamiento, longitud en bytes).
+    Secciones:
+        cadenas_offsets  uint64[C+1]  inicio de cada cadena en cadenas_datos
+        cadenas_datos    bytes        cadenas UTF-8 internadas (IDs, nombres, ...)
+        offsets          int64[N+1]   CSR
+        vecinos          int32[E]     CSR (cada amistad en ambas direcciones)
+        pesos            int32[E] o float64[E]
+        col_id           uint32[N]    indice en la tabla de cadenas
+        col_nombre       uint32[N]
+        col_carrera      uint32[N]
+        intereses_offs   int64[N+1]
+        intereses        uint32[I]
+        ids_ordenados    uint32[N]    nodos ordenados por ID (busqueda binaria)
+
+Los IDs se guardan como texto, por lo que al cargar siempre son cadenas.
+"""
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from models.csr import GrafoCSR
+
+MAGIA = b'GRAFCSR\0'
+VERSION = 1
+SECCIONES = [
+    ('cadenas_offsets', np.uint64),
+    ('cadenas_datos', np.uint8),
+    ('offsets', np.int64),
+    ('vecinos', np.int32),
+    ('pesos', None),
+    ('col_id', np.uint32),
+    ('col_nombre', np.uint32),
+    ('col_carrera', np.uint32),
+    ('intereses_offs', np.int64),
+    ('intereses', np.uint32),
+    ('ids_ordenados', np.uint32),
+]
+_ENCABEZADO = struct.Struct('<8sIIQQQQ')
+_SECCION = struct.Struct('<QQ')
+_PESOS_ENTEROS, _PESOS_REALES = 0, 1
+
+class _TablaCadenas(Sequence):
+    """Tabla de cadenas internadas que se decodifican solo al accederlas"""
+    
+    def __init__(self, offsets, datos):
+        self._offsets = offsets
+        self._datos = datos
+    
+    def __getitem__(self, i):
+        inicio, fin = int(self._offsets[i]), int(self._offsets[i + 1])
+        return bytes(self._datos[inicio:fin]).decode('utf-8')
+    
+    def __len__(self):
+        return len(self._offsets) - 1
+
+class _Columna(Sequence):
+    """Columna de indices a la tabla de cadenas vista como secuencia de textos"""
+    
+    def __init__(self, indices, cadenas):
+        self._indices = indices
+        self._cadenas = cadenas
+    
+    def __getitem__(self, i):
+        return self._cadenas[int(self._indices[i])]
+    
+    def __len__(self):
+        return len(self._indices)
+    
+    def __iter__(self):
+        cadenas = self._cadenas
+        return (cadenas[j] for j in self._indices.tolist())
+
+class _Atributos(Sequence):
+    """Informacion de cada estudiante armada bajo demanda desde las columnas"""
+    
+    def __init__(self, secciones, cadenas):
+        self._nombres = _Columna(secciones['col_nombre'], cadenas)
+        self._carreras = _Columna(secciones['col_carrera'], cadenas)
+        self._intereses_offs = secciones['intereses_offs']
+        self._intereses = secciones['intereses']
+        self._cadenas = cadenas
+    
+    def __getitem__(self, i):
+        inicio, fin = int(self._intereses_offs[i]), int(self._intereses_offs[i + 1])
+        return {
+            'nombre': self._nombres[i],
+            'carrera': self._carreras[i],
+            'intereses': [self._cadenas[j] for j in self._intereses[inicio:fin].tolist()]
+        }
+    
+    def __len__(self):
+        return len(self._nombres)
+
+class _IndiceOrdenado(Mapping):
+    """Mapeo id -> posicion resuelto con busqueda binaria sobre ids_ordenados"""
+    
+    def __init__(self, ids, ordenados):
+        self._ids = ids
+        self._ordenados = ordenados
+        self._claves = _Columna(ordenados, ids)
+    
+    def __getitem__(self, id_est):
+        if not isinstance(id_est, str):
+            raise KeyError(id_est)
+        k = bisect_left(self._claves, id_est)
+        if k < len(self._claves) and self._claves[k] == id_est:
+            return int(self._ordenados[k])
+        raise KeyError(id_est)
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __len__(self):
+        return len(self._ids)
+
+def _alinear(desplazamiento):
+    return (desplazamiento + 7) & ~7
+
+def _escribir_secciones(archivo, arreglos, tipo_pesos, n, entradas, num_cadenas, num_intereses):
+    """
+    Escribe el encabezado y las secciones del snapshot
+    
+    Las secciones de `arreglos` que sean un entero en lugar de un arreglo
+    solo reservan esa cantidad de bytes (en cero) para llenarlas despues.
+    Retorna {seccion: (desplazamiento, longitud)}.
+    """
+    desplazamiento = _alinear(_ENCABEZADO.size + _SECCION.size * len(SECCIONES))
+    tabla = {}
+    for nombre, _ in SECCIONES:
+        arreglo = arreglos[nombre]
+        longitud = arreglo if isinstance(arreglo, int) else arreglo.nbytes
+        tabla[nombre] = (desplazamiento, longitud)
+        desplazamiento = _alinear(desplazamiento + longitud)
+    
+    with open(archivo, 'wb') as f:
+        f.write(_ENCABEZADO.pack(MAGIA, VERSION, tipo_pesos, n, entradas, num_cadenas, num_intereses))
+        for nombre, _ in SECCIONES:
+            f.write(_SECCION.pack(*tabla[nombre]))
+        for nombre, _ in SECCIONES:
+            inicio, longitud = tabla[nombre]
+            if isinstance(arreglos[nombre], int):
+                f.seek(inicio + longitud)
+            else:
+                f.write(b'\0' * (inicio - f.tell()))
+                f.write(arreglos[nombre].tobytes())
+        f.truncate(f.tell())
+    return tabla
+
+def _columnas_cadenas(cadenas):
+    """Retorna (cadenas_offsets, cadenas_datos) para la tabla de cadenas internadas"""
+    textos = [texto.encode('utf-8') for texto in cadenas]
+    cadenas_offsets = np.zeros(len(textos) + 1, dtype=np.uint64)
+    np.cumsum([len(t) for t in textos], out=cadenas_offsets[1:])
+    return cadenas_offsets, np.frombuffer(b''.join(textos), dtype=np.uint8)
+
+def guardar_binario(grafo, archivo='red_universitaria.bin'):
+    """Guarda el grafo completo en el formato binario columnar"""
+    try:
+        csr = GrafoCSR.desde_grafo(grafo)
+        cadenas = {}
+        
+        def internar(texto):
+            return cadenas.setdefault(str(texto), len(cadenas))
+        
+        n = csr.num_nodos
+        col_id = np.fromiter((internar(id_est) for id_est in csr.ids), dtype=np.uint32, count=n)
+        col_nombre = np.empty(n, dtype=np.uint32)
+        col_carrera = np.empty(n, dtype=np.uint32)
+        intereses_offs = np.zeros(n + 1, dtype=np.int64)
+        intereses = []
+        for i, id_est in enumerate(csr.ids):
+            info = grafo.estudiantes[id_est]
+            col_nombre[i] = internar(info['nombre'])
+            col_carrera[i] = internar(info['carrera'])
+            intereses.extend(internar(interes) for interes in info.get('intereses', []))
+            intereses_offs[i + 1] = len(intereses)
+        
+        cadenas_offsets, cadenas_datos = _columnas_cadenas(cadenas)
+        ids_ordenados = np.array(
+            sorted(range(n), key=lambda i: str(csr.ids[i])), dtype=np.uint32
+        )
+        
+        pesos = np.asarray(csr.pesos)
+        enteros = pesos.dtype.kind in 'iu' or bool(np.all(np.mod(pesos, 1) == 0))
+        pesos = pesos.astype(np.int32 if enteros else np.float64)
+        
+        arreglos = {
+            'cadenas_offsets': cadenas_offsets,
+            'cadenas_datos': cadenas_datos,
+            'offsets': np.asarray(csr.offsets, dtype=np.int64),
+            'vecinos': np.asarray(csr.vecinos, dtype=np.int32),
+            'pesos': pesos,
+            'col_id': col_id,
+            'col_nombre': col_nombre,
+            'col_carrera': col_carrera,
+            'intereses_offs': intereses_offs,
+            'intereses': np.array(intereses, dtype=np.uint32),
+            'ids_ordenados': ids_ordenados,
+        }
+        
+        _escribir_secciones(
+            archivo, arreglos, _PESOS_ENTEROS if enteros else _PESOS_REALES,
+            n, len(csr.vecinos), len(cadenas), len(intereses)
+        )
+        return True
+    except Exception as e:
+        print(f"Error al guardar snapshot binario: {e}")
+        return False
+
+def guardar_binario_flujo(estudiantes, amistades, archivo='red_universitaria.bin'):
+    """
+    Escribe un snapshot binario a partir de flujos de registros, sin armar
+    el grafo en memoria
+    
+    La memoria usada es O(N) (indice de IDs y columnas de estudiantes): las
+    amistades se recorren dos veces, una para contar el grado de cada nodo y
+    otra para escribir vecinos y pesos directamente en el archivo (mmap).
+    
+    Args:
+        estudiantes: Iterable de (id, nombre, carrera, intereses)
+        amistades: Funcion sin argumentos que retorna un iterable nuevo de
+            (id1, id2, peso) con cada amistad una sola vez (se llama dos veces)
+        archivo: Ruta del snapshot
+    """
+    cadenas = {}
+    
+    def internar(texto):
+        return cadenas.setdefault(str(texto), len(cadenas))
+    
+    indice = {}
+    col_id = array('I')
+    col_nombre = array('I')
+    col_carrera = array('I')
+    intereses_offs = array('q', [0])
+    intereses = array('I')
+    for id_est, nombre, carrera, intereses_est in estudiantes:
+        indice[str(id_est)] = len(indice)
+        col_id.append(internar(id_est))
+        col_nombre.append(internar(nombre))
+        col_carrera.append(internar(carrera))
+        intereses.extend(internar(interes) for interes in intereses_est)
+        intereses_offs.append(len(intereses))
+    n = len(indice)
+    
+    # Primera pasada: grado de cada nodo (un lazo propio ocupa una sola entrada)
+    grados = array('q', bytes(8 * (n + 1)))
+    enteros = True
+    for id1, id2, peso in amistades():
+        i, j = indice[str(id1)], indice[str(id2)]
+        grados[i + 1] += 1
+        if i != j:
+            grados[j + 1] += 1
+        if enteros and peso != int(peso):
+            enteros = False
+    offsets = np.cumsum(np.frombuffer(grados, dtype=np.int64))
+    entradas = int(offsets[-1])
+    tipo_pesos = np.int32 if enteros else np.float64
+    
+    cadenas_offsets, cadenas_datos = _columnas_cadenas(cadenas)
+    ids = list(indice)
+    ids_ordenados = np.array(sorted(range(n), key=ids.__getitem__), dtype=np.uint32)
+    arreglos = {
+        'cadenas_offsets': cadenas_offsets,
+        'cadenas_datos': cadenas_datos,
+        'offsets': offsets,
+        'vecinos': 4 * entradas,
+        'pesos': np.dtype(tipo_pesos).itemsize * entradas,
+        'col_id': np.frombuffer(col_id, dtype=np.uint32),
+        'col_nombre': np.frombuffer(col_nombre, dtype=np.uint32),
+        'col_carrera': np.frombuffer(col_carrera, dtype=np.uint32),
+        'intereses_offs': np.frombuffer(intereses_offs, dtype=np.int64),
+        'intereses': np.frombuffer(intereses, dtype=np.uint32),
+        'ids_ordenados': ids_ordenados,
+    }
+    tabla = _escribir_secciones(
+        archivo, arreglos, _PESOS_ENTEROS if enteros else _PESOS_REALES,
+        n, entradas, len(cadenas), len(intereses)
+    )
+    if not entradas:
+        return True
+    
+    # Segunda pasada: llenar vecinos y pesos en el archivo
+    vecinos = np.memmap(archivo, dtype=np.int32, mode='r+', offset=tabla['vecinos'][0], shape=(entradas,))
+    pesos = np.memmap(archivo, dtype=tipo_pesos, mode='r+', offset=tabla['pesos'][0], shape=(entradas,))
+    posicion = offsets[:-1].tolist()
+    lote_pos, lote_vecinos, lote_pesos = [], [], []
+    for id1, id2, peso in amistades():
+        i, j = indice[str(id1)], indice[str(id2)]
+        lote_pos.append(posicion[i])
+        lote_vecinos.append(j)
+        lote_pesos.append(peso)
+        posicion[i] += 1
+        if i != j:
+            lote_pos.append(posicion[j])
+            lote_vecinos.append(i)
+            lote_pesos.append(peso)
+            posicion[j] += 1
+        # Escribir por lotes con asignacion vectorizada
+        if len(lote_pos) >= 1 << 16:
+            vecinos[lote_pos] = lote_vecinos
+            pesos[lote_pos] = lote_pesos
+            lote_pos, lote_vecinos, lote_pesos = [], [], []
+    if lote_pos:
+        vecinos[lote_pos] = lote_vecinos
+        pesos[lote_pos] = lote_pesos
+    vecinos.flush()
+    pesos.flush()
+    del vecinos, pesos
+    return True
+
+def cargar_binario(archivo='red_universitaria.bin'):
+    """
+    Abre un snapshot binario como GrafoCSR de solo lectura
+    
+    El archivo se mapea en memoria (mmap) y los arreglos son vistas sobre
+    el, sin copiar ni interpretar su contenido: el tiempo de apertura no
+    depende del tamano de la red. Las cadenas se decodifican al accederlas.
+    """
+    with open(archivo, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    magia, version, tipo_pesos, n, entradas, num_cadenas, num_intereses = _ENCABEZADO.unpack_from(mapa, 0)
+    if magia != MAGIA or version != VERSION:
+        mapa.close()
+        raise ValueError(f"{archivo} no es un snapshot binario compatible")
+    
+    secciones = {}
+    for k, (nombre, tipo) in enumerate(SECCIONES):
+        inicio, longitud = _SECCION.unpack_from(mapa, _ENCABEZADO.size + k * _SECCION.size)
+        if tipo is None:
+            tipo = np.int32 if tipo_pesos == _PESOS_ENTEROS else np.float64
+        secciones[nombre] = np.frombuffer(mapa, dtype=tipo, count=longitud // np.dtype(tipo).itemsize, offset=inicio)
+    
+    cadenas = _TablaCadenas(secciones['cadenas_offsets'], secciones['cadenas_datos'])
+    ids = _Columna(secciones['col_id'], cadenas)
+    csr = GrafoCSR(
+        ids,
+        secciones['offsets'],
+        secciones['vecinos'],
+        secciones['pesos'],
+        _Atributos(secciones, cadenas)
+    )
+    csr._indice = _IndiceOrdenado(ids, secciones['ids_ordenados'])
+    return csr
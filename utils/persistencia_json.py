@@ -1,91 +1,330 @@
+import gzip
 import json
+import lzma
 import os
 from datetime import datetime
+from itertools import islice
 
-def guardar_json(grafo, archivo='red_universitaria.json'):
-    """Guarda el grafo completo en formato JSON"""
-    data = {
-        'metadata': {
-            'fecha_exportacion': datetime.now().isoformat(),
-            'num_estudiantes': len(grafo.estudiantes),
-            'num_amistades': sum(len(amigos) for amigos in grafo.adj_list.values()) // 2
-        },
-        'estudiantes': [],
-        'amistades': []
+from .carga_datos import crear_seleccion
+
+_ESPACIOS = ' \t\n\r'
+
+def abrir_archivo(archivo, modo='rt'):
+    """
+    Abre un archivo comprimiendo o descomprimiendo segun su extension
+    
+    Los archivos .gz usan gzip y los .xz usan lzma, ambos por flujo; el
+    resto se abre normalmente. En modo texto siempre se usa UTF-8.
+    """
+    codificacion = None if 'b' in modo else 'utf-8'
+    if archivo.endswith('.gz'):
+        return gzip.open(archivo, modo, encoding=codificacion)
+    if archivo.endswith('.xz'):
+        return lzma.open(archivo, modo, encoding=codificacion)
+    return open(archivo, modo.replace('t', ''), encoding=codificacion)
+
+def sincronizar_archivo(archivo):
+    """Fuerza la escritura a disco (fsync) de un archivo ya cerrado"""
+    with open(archivo, 'rb') as f:
+        os.fsync(f.fileno())
+
+class _LectorJSON:
+    """Lector incremental de un documento JSON desde un archivo de texto"""
+    
+    def __init__(self, archivo, tamano_buffer=1 << 16):
+        self.archivo = archivo
+        self.tamano_buffer = tamano_buffer
+        self.decodificador = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.fin = False
+    
+    def _leer_mas(self):
+        if self.fin:
+            return False
+        bloque = self.archivo.read(self.tamano_buffer)
+        if not bloque:
+            self.fin = True
+            return False
+        # Descartar lo ya consumido para mantener el buffer acotado
+        self.buffer = self.buffer[self.pos:] + bloque
+        self.pos = 0
+        return True
+    
+    def siguiente_caracter(self, saltar=_ESPACIOS):
+        """Avanza sobre los caracteres de `saltar` y retorna el siguiente (sin consumirlo)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in saltar:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._leer_mas():
+                return ''
+    
+    def consumir(self, esperado):
+        if self.siguiente_caracter() != esperado:
+            raise ValueError(f"JSON invalido: se esperaba '{esperado}'")
+        self.pos += 1
+    
+    def valor(self):
+        """Decodifica el siguiente valor completo"""
+        self.siguiente_caracter()
+        while True:
+            try:
+                valor, fin = self.decodificador.raw_decode(self.buffer, self.pos)
+                # Un numero al final del buffer podria continuar en el siguiente bloque
+                if fin < len(self.buffer) or self.fin:
+                    self.pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self.fin:
+                    raise
+            self._leer_mas()
+    
+    def elementos(self):
+        """Itera los elementos de la lista que empieza en la posicion actual"""
+        self.consumir('[')
+        if self.siguiente_caracter() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.valor()
+            caracter = self.siguiente_caracter()
+            self.pos += 1
+            if caracter == ']':
+                return
+            if caracter != ',':
+                raise ValueError("JSON invalido: se esperaba ',' o ']'")
+
+def iterar_seccion_json(archivo, seccion, tamano_buffer=1 << 16):
+    """
+    Itera los elementos de una lista de primer nivel de un archivo JSON
+    
+    Lee el archivo por bloques, por lo que la memoria usada no depende del
+    tamano del archivo. Las demas secciones se recorren sin guardarlas.
+    
+    Args:
+        archivo: Ruta del archivo JSON (p.ej. el generado por guardar_json),
+            opcionalmente comprimido (.gz o .xz)
+        seccion: Clave de la lista a recorrer ('estudiantes' o 'amistades')
+    """
+    with abrir_archivo(archivo, 'rt') as f:
+        lector = _LectorJSON(f, tamano_buffer)
+        lector.consumir('{')
+        while True:
+            caracter = lector.siguiente_caracter(_ESPACIOS + ',')
+            if caracter in ('}', ''):
+                return
+            clave = lector.valor()
+            lector.consumir(':')
+            es_lista = lector.siguiente_caracter() == '['
+            if clave == seccion and es_lista:
+                yield from lector.elementos()
+                return
+            if es_lista:
+                for _ in lector.elementos():
+                    pass
+            else:
+                lector.valor()
+
+def leer_metadata_json(archivo):
+    """
+    Retorna la seccion 'metadata' de un archivo JSON ({} si no tiene)
+    
+    Solo se lee hasta encontrarla (guardar_json la escribe al principio).
+    """
+    with abrir_archivo(archivo, 'rt') as f:
+        lector = _LectorJSON(f)
+        lector.consumir('{')
+        while True:
+            caracter = lector.siguiente_caracter(_ESPACIOS + ',')
+            if caracter in ('}', ''):
+                return {}
+            clave = lector.valor()
+            lector.consumir(':')
+            if clave == 'metadata':
+                return lector.valor()
+            if lector.siguiente_caracter() == '[':
+                for _ in lector.elementos():
+                    pass
+            else:
+                lector.valor()
+
+def _ids_en_orden(grafo):
+    """
+    Retorna (ids, ordenado): los IDs ordenados si son comparables entre si,
+    o en orden de insercion si no lo son
+    """
+    try:
+        return sorted(grafo.estudiantes), True
+    except TypeError:
+        return list(grafo.estudiantes), False
+
+def iterar_amistades_unicas(grafo, ids=None):
+    """
+    Itera cada amistad (id1, id2, peso) una sola vez
+    
+    En lugar de recordar las amistades ya emitidas, se emite cada una solo
+    desde su extremo que aparece primero en `ids`, asi la memoria extra es
+    O(N) y no O(E). Si `ids` esta ordenado, las amistades salen ordenadas
+    por (id1, id2).
+    """
+    if ids is None:
+        ids, _ = _ids_en_orden(grafo)
+    rango = {id_est: i for i, id_est in enumerate(ids)}
+    for i, id1 in enumerate(ids):
+        amigos = [
+            (rango[id2], id2, peso)
+            for id2, peso in grafo.adj_list[id1].items()
+            if rango[id2] >= i
+        ]
+        amigos.sort(key=lambda x: x[0])
+        for _, id2, peso in amigos:
+            yield id1, id2, peso
+
+def escribir_json(grafo, f):
+    """
+    Escribe el grafo como documento JSON en un archivo de texto ya abierto
+    
+    Escribe estudiantes y amistades a medida que los recorre (un registro
+    por linea), sin armar el documento en memoria. Los registros quedan
+    ordenados por ID cuando los IDs son comparables ('ordenado' en metadata).
+    """
+    ids, ordenado = _ids_en_orden(grafo)
+    metadata = {
+        'fecha_exportacion': datetime.now().isoformat(),
+        'num_estudiantes': len(grafo.estudiantes),
+        'num_amistades': sum(len(amigos) for amigos in grafo.adj_list.values()) // 2,
+        'ordenado': ordenado
     }
     
+    f.write('{\n  "metadata": ')
+    f.write(json.dumps(metadata, ensure_ascii=False))
+    
     # Guardar estudiantes
-    for id_est, info in grafo.estudiantes.items():
-        data['estudiantes'].append({
+    f.write(',\n  "estudiantes": [')
+    separador = '\n    '
+    for id_est in ids:
+        info = grafo.estudiantes[id_est]
+        f.write(separador)
+        f.write(json.dumps({
             'id': id_est,
             'nombre': info['nombre'],
             'carrera': info['carrera'],
             'intereses': info.get('intereses', [])
-        })
-    
-    # Guardar amistades (evitar duplicados)
-    amistades_guardadas = set()
-    for id1 in grafo.adj_list:
-        for id2, peso in grafo.adj_list[id1].items():
-            if (id1, id2) not in amistades_guardadas and (id2, id1) not in amistades_guardadas:
-                data['amistades'].append({
-                    'id1': id1,
-                    'id2': id2,
-                    'peso': peso
-                })
-                amistades_guardadas.add((id1, id2))
+        }, ensure_ascii=False))
+        separador = ',\n    '
+    
+    # Guardar amistades (cada una una sola vez)
+    f.write('\n  ],\n  "amistades": [')
+    separador = '\n    '
+    for id1, id2, peso in iterar_amistades_unicas(grafo, ids):
+        f.write(separador)
+        f.write(json.dumps({'id1': id1, 'id2': id2, 'peso': peso}, ensure_ascii=False))
+        separador = ',\n    '
+    f.write('\n  ]\n}\n')
+
+def guardar_json(grafo, archivo='red_universitaria.json'):
+    """
+    Guarda el grafo completo en formato JSON
     
+    Se escribe en un archivo temporal que reemplaza al destino al terminar.
+    Si el nombre termina en .gz o .xz el archivo se comprime.
+    """
+    raiz, extension = os.path.splitext(archivo)
+    temporal = raiz + '.tmp' + extension
     try:
-        with open(archivo, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with abrir_archivo(temporal, 'wt') as f:
+            escribir_json(grafo, f)
+        sincronizar_archivo(temporal)
+        os.replace(temporal, archivo)
         return True
     except Exception as e:
         print(f"Error al guardar JSON: {e}")
+        if os.path.exists(temporal):
+            os.remove(temporal)
         return False
 
-def cargar_json(grafo, archivo='red_universitaria.json'):
-    """Carga el grafo desde un archivo JSON"""
+def _en_lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+def reemplazar_contenido(grafo, cargado):
+    """
+    Reemplaza el contenido de grafo por el de un Grafo armado aparte
+    
+    Args:
+        grafo: Grafo, GrafoSQLite u otra red con la API de escritura de Grafo
+        cargado: Grafo con el contenido nuevo (no debe seguir usandose)
+    """
+    if hasattr(grafo, 'reemplazar'):
+        grafo.reemplazar(cargado)
+        return
+    from models.grafo import filas_estudiantes, amistades_unicas
+    
+    grafo.limpiar()
+    grafo.agregar_estudiantes(filas_estudiantes(cargado.estudiantes))
+    grafo.agregar_amistades(amistades_unicas(cargado.adj_list))
+
+def cargar_json(grafo, archivo='red_universitaria.json', tamano_lote=10000, filtro=None, ids=None):
+    """
+    Carga el grafo desde un archivo JSON
+    
+    El archivo se lee de forma incremental y los registros se insertan en
+    lotes de tamano_lote, por lo que la memoria usada durante la carga no
+    crece con el tamano del archivo (solo con el grafo resultante). La red
+    se arma aparte y reemplaza el contenido de grafo solo si el archivo se
+    leyo completo: ante un error el grafo queda como estaba.
+    
+    Args:
+        grafo: Instancia del grafo (se reemplaza su contenido)
+        archivo: Ruta del archivo JSON
+        tamano_lote: Registros insertados por lote
+        filtro: Funcion (id_estudiante, info) -> bool; solo se cargan los
+            estudiantes seleccionados y las amistades entre ellos
+        ids: Coleccion de IDs a cargar
+    """
     if not os.path.exists(archivo):
         return False
     
+    from models.grafo import Grafo
+    
+    seleccionar = crear_seleccion(filtro, ids)
     try:
-        with open(archivo, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Limpiar grafo actual
-        grafo.estudiantes.clear()
-        grafo.adj_list.clear()
+        # Se carga en un grafo aparte: si el archivo esta danado el actual no se toca
+        cargado = Grafo()
         
         # Cargar estudiantes
-        for est in data['estudiantes']:
-            grafo.agregar_estudiante(
-                est['id'],
-                est['nombre'],
-                est['carrera'],
-                est.get('intereses', [])
+        estudiantes = (
+            (est['id'], est['nombre'], est['carrera'], est.get('intereses', []))
+            for est in iterar_seccion_json(archivo, 'estudiantes')
+        )
+        if seleccionar:
+            estudiantes = (
+                est for est in estudiantes
+                if seleccionar(est[0], {'nombre': est[1], 'carrera': est[2], 'intereses': est[3]})
             )
+        for lote in _en_lotes(estudiantes, tamano_lote):
+            cargado.agregar_estudiantes(lote)
         
-        # Cargar amistades
-        for amistad in data['amistades']:
-            grafo.agregar_amistad(
-                amistad['id1'],
-                amistad['id2'],
-                amistad.get('peso', 1)
-            )
+        # Cargar amistades (se descartan las de estudiantes no cargados)
+        num_amistades = 0
+        amistades = (
+            (amistad['id1'], amistad['id2'], amistad.get('peso', 1))
+            for amistad in iterar_seccion_json(archivo, 'amistades')
+        )
+        for lote in _en_lotes(amistades, tamano_lote):
+            num_amistades += cargado.agregar_amistades(lote)
+        
+        reemplazar_contenido(grafo, cargado)
         
         print(f"Datos cargados desde {archivo}")
-        print(f"Estudiantes: {len(grafo.estudiantes)}, Amistades: {len(data['amistades'])}")
+        print(f"Estudiantes: {len(grafo.estudiantes)}, Amistades: {num_amistades}")
         return True
     except Exception as e:
         print(f"Error al cargar JSON: {e}")
         return False
-
-def exportar_backup(grafo, directorio='backups'):
-    """Crea un backup con timestamp del grafo"""
-    if not os.path.exists(directorio):
-        os.makedirs(directorio)
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    archivo = os.path.join(directorio, f'backup_{timestamp}.json')
-    
-    return guardar_json(grafo, archivo)
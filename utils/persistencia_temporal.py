@@ -0,0 +1,118 @@
+"""
+Persistencia CSV del historial de una RedTemporal
+
+Los archivos tienen las mismas columnas que los de guardar_datos mas
+'inicio' y 'fin' (fechas ISO o numeros, segun el reloj de la red; fin
+vacio = vigente), asi que cargar_datos tambien puede leerlos. Para guardar la red de una fecha concreta basta
+pasar red.en_fecha(fecha) a guardar_datos o guardar_json.
+"""
+import csv
+from datetime import datetime
+
+def _texto_fecha(fecha):
+    if fecha is None:
+        return ''
+    if isinstance(fecha, datetime):
+        return fecha.isoformat()
+    return str(fecha)
+
+def _leer_fecha(texto):
+    """Convierte el texto de _texto_fecha de vuelta en numero o datetime"""
+    if texto is None or texto == '':
+        return None
+    for tipo in (int, float):
+        try:
+            return tipo(texto)
+        except ValueError:
+            pass
+    return datetime.fromisoformat(texto)
+
+def _fecha_inicial(fechas):
+    """Inicio de los registros sin fecha: el menor valor del tipo de las fechas del archivo"""
+    for fecha in fechas:
+        if fecha is not None:
+            return datetime.min if isinstance(fecha, datetime) else float('-inf')
+    return datetime.min
+
+def guardar_temporal_csv(red, archivo_estudiantes='estudiantes_historial.csv',
+                         archivo_amistades='amistades_historial.csv'):
+    """
+    Guarda todos los intervalos de estudiantes y amistades de una RedTemporal
+    
+    Args:
+        red: Instancia de RedTemporal
+        archivo_estudiantes, archivo_amistades: Rutas de los CSV
+    """
+    try:
+        with open(archivo_estudiantes, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['id', 'nombre', 'carrera', 'inicio', 'fin'])
+            for id_est, inicio, fin, info in red.intervalos_estudiantes():
+                writer.writerow([id_est, info['nombre'], info['carrera'], _texto_fecha(inicio), _texto_fecha(fin)])
+        
+        with open(archivo_amistades, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['id1', 'id2', 'peso', 'inicio', 'fin'])
+            for id1, id2, peso, inicio, fin in red.intervalos_amistades():
+                writer.writerow([id1, id2, peso, _texto_fecha(inicio), _texto_fecha(fin)])
+        print(f"Historial guardado en {archivo_estudiantes} y {archivo_amistades}")
+        return True
+    except Exception as e:
+        print(f"Error al guardar historial: {e}")
+        return False
+
+def cargar_temporal_csv(red, archivo_estudiantes='estudiantes_historial.csv',
+                        archivo_amistades='amistades_historial.csv'):
+    """
+    Carga intervalos de estudiantes y amistades en una RedTemporal
+    
+    Las marcas de tiempo se leen como numeros si lo son y si no como fechas
+    ISO, asi que se recupera el tipo del reloj con que se guardaron. Son
+    opcionales: sin columna o valor 'inicio' el registro se considera
+    vigente desde siempre (la menor fecha del tipo usado en el archivo), y
+    sin 'fin' sigue vigente. Asi tambien se pueden cargar los CSV de
+    guardar_datos.
+    
+    Args:
+        red: Instancia de RedTemporal
+        archivo_estudiantes, archivo_amistades: Rutas de los CSV
+    """
+    try:
+        with open(archivo_estudiantes, 'r', encoding='utf-8') as file:
+            estudiantes = [
+                (row['id'], row['nombre'], row['carrera'],
+                 _leer_fecha(row.get('inicio')), _leer_fecha(row.get('fin')))
+                for row in csv.DictReader(file)
+            ]
+        with open(archivo_amistades, 'r', encoding='utf-8') as file:
+            amistades = [
+                (_leer_fecha(row.get('inicio')), row['id1'], row['id2'],
+                 int(row.get('peso') or 1), _leer_fecha(row.get('fin')))
+                for row in csv.DictReader(file)
+            ]
+        
+        minimo = _fecha_inicial(
+            [fila[3] for fila in estudiantes] + [fila[0] for fila in amistades]
+        )
+        for id_est, nombre, carrera, inicio, fin in estudiantes:
+            red.agregar_estudiante(
+                id_est, nombre, carrera,
+                inicio=minimo if inicio is None else inicio, fin=fin
+            )
+        
+        # Las amistades vigentes se aplican por fecha para que los cambios de peso se encadenen
+        amistades = [
+            (minimo if inicio is None else inicio, id1, id2, peso, fin)
+            for inicio, id1, id2, peso, fin in amistades
+        ]
+        amistades.sort(key=lambda fila: fila[0])
+        for inicio, id1, id2, peso, fin in amistades:
+            red.agregar_amistad(id1, id2, peso, inicio=inicio, fin=fin)
+        print(f"Historial cargado: {len(amistades)} intervalos de amistad")
+        return True
+    except FileNotFoundError as e:
+        print(f"Archivo {e.filename} no encontrado")
+        return False
+    except Exception as e:
+        print(f"Error al cargar historial: {e}")
+        return False
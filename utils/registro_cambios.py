@@ -0,0 +1,249 @@
+"""
+Registro de cambios (write-ahead log) para guardar el grafo sin reescribirlo
+
+Cada modificacion del grafo se agrega al final del registro como una linea
+JSON compacta [operacion, *argumentos], donde operacion es el metodo de
+Grafo que la reproduce. El estado guardado es el ultimo snapshot JSON mas
+los cambios del registro; la compactacion escribe un snapshot nuevo en
+segundo plano y vacia el registro.
+"""
+import json
+import os
+import shutil
+import threading
+
+from .persistencia_json import guardar_json, cargar_json, abrir_archivo
+
+# Metodos de Grafo que pueden aparecer en el registro
+OPERACIONES = {
+    'agregar_estudiante',
+    'eliminar_estudiante',
+    'agregar_amistad',
+    'actualizar_peso_amistad',
+    'eliminar_amistad',
+    'limpiar'
+}
+
+def reaplicar_registro(grafo, archivo, truncar=False):
+    """
+    Reaplica sobre el grafo los cambios guardados en un archivo de registro
+    
+    Se detiene en la primera linea incompleta o invalida (una escritura
+    cortada por una caida). Con truncar=True ese resto se elimina del
+    archivo para que los registros nuevos queden a continuacion de los validos
+    (se ignora en archivos comprimidos).
+    
+    Retorna la cantidad de cambios aplicados.
+    """
+    if not os.path.exists(archivo):
+        return 0
+    
+    aplicados = 0
+    validos = 0
+    with abrir_archivo(archivo, 'rb') as f:
+        for linea in f:
+            if not linea.endswith(b'\n'):
+                break
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                break
+            if not isinstance(registro, list) or not registro or registro[0] not in OPERACIONES:
+                break
+            getattr(grafo, registro[0])(*registro[1:])
+            aplicados += 1
+            validos += len(linea)
+    
+    if truncar and not archivo.endswith(('.gz', '.xz')) and validos < os.path.getsize(archivo):
+        with open(archivo, 'r+b') as f:
+            f.truncate(validos)
+    return aplicados
+
+class RegistroCambios:
+    """
+    Guarda cada modificacion del grafo como un registro al final de un archivo
+    
+    Se registra como observador del grafo. Las escrituras se sincronizan a
+    disco en grupo (group commit): un hilo hace fsync cada
+    intervalo_sincronizacion segundos para todos los registros pendientes,
+    en lugar de uno por cambio. Con intervalo_sincronizacion=None cada
+    registro se sincroniza al escribirse. Al superar umbral_compactacion
+    registros se escribe un snapshot nuevo en segundo plano.
+    
+    Uso:
+        registro = RegistroCambios()
+        if registro.existe():
+            registro.recuperar(grafo)
+        registro.iniciar(grafo)
+        ...
+        registro.cerrar()
+    
+    Args:
+        archivo: Archivo del registro de cambios
+        archivo_snapshot: Snapshot JSON sobre el que se aplica el registro
+        intervalo_sincronizacion: Segundos entre sincronizaciones a disco
+        umbral_compactacion: Registros tras los cuales se compacta
+    """
+    
+    def __init__(self, archivo='cambios.wal', archivo_snapshot='snapshot.json',
+                 intervalo_sincronizacion=0.05, umbral_compactacion=10000):
+        self.archivo = archivo
+        self.archivo_snapshot = archivo_snapshot
+        # Registro en compactacion (ya incluido en el snapshot que se esta escribiendo)
+        self.archivo_rotado = archivo + '.1'
+        self.intervalo_sincronizacion = intervalo_sincronizacion
+        self.umbral_compactacion = umbral_compactacion
+        self.grafo = None
+        self.registros = 0
+        self._file = None
+        self._pendientes = 0
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo_sincronizacion = None
+        self._hilo_compactacion = None
+    
+    def existe(self):
+        """Indica si hay un estado guardado (snapshot o registro) para recuperar"""
+        return any(
+            os.path.exists(ruta)
+            for ruta in (self.archivo_snapshot, self.archivo, self.archivo_rotado)
+        )
+    
+    def recuperar(self, grafo):
+        """
+        Reconstruye el grafo desde el ultimo snapshot y los registros posteriores
+        
+        Los registros fijan estados (agregar o eliminar un elemento, fijar un
+        peso), por lo que reaplicar un registro rotado que ya alcanzo a
+        incluirse en el snapshot no cambia el resultado.
+        """
+        if os.path.exists(self.archivo_snapshot):
+            if not cargar_json(grafo, self.archivo_snapshot):
+                return False
+        else:
+            grafo.limpiar()
+        
+        aplicados = reaplicar_registro(grafo, self.archivo_rotado)
+        self.registros = reaplicar_registro(grafo, self.archivo, truncar=True)
+        print(f"Cambios recuperados del registro: {aplicados + self.registros}")
+        return True
+    
+    def iniciar(self, grafo):
+        """Empieza a registrar las modificaciones del grafo"""
+        self.grafo = grafo
+        # Sin snapshot, o con una compactacion interrumpida, se parte de uno nuevo
+        if not os.path.exists(self.archivo_snapshot) or os.path.exists(self.archivo_rotado):
+            if not guardar_json(grafo, self.archivo_snapshot):
+                return False
+            if os.path.exists(self.archivo_rotado):
+                os.remove(self.archivo_rotado)
+            open(self.archivo, 'wb').close()
+            self.registros = 0
+        
+        self._file = open(self.archivo, 'ab')
+        if self.intervalo_sincronizacion:
+            self._detener.clear()
+            self._hilo_sincronizacion = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+            self._hilo_sincronizacion.start()
+        grafo.registrar_observador(self._al_modificar)
+        return True
+    
+    def cerrar(self):
+        """Deja de registrar, espera la compactacion en curso y sincroniza a disco"""
+        if self.grafo is not None:
+            self.grafo.eliminar_observador(self._al_modificar)
+        if self._hilo_sincronizacion is not None:
+            self._detener.set()
+            self._hilo_sincronizacion.join()
+            self._hilo_sincronizacion = None
+        if self._hilo_compactacion is not None:
+            self._hilo_compactacion.join()
+            self._hilo_compactacion = None
+        self.sincronizar()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def sincronizar(self):
+        """Escribe a disco (fsync) todos los registros pendientes"""
+        with self._lock:
+            if self._file is not None and self._pendientes:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._pendientes = 0
+    
+    def _sincronizar_periodicamente(self):
+        while not self._detener.wait(self.intervalo_sincronizacion):
+            self.sincronizar()
+    
+    def _escribir(self, registro):
+        linea = json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(linea.encode('utf-8'))
+            self.registros += 1
+            self._pendientes += 1
+            if self._hilo_sincronizacion is None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._pendientes = 0
+        if self.umbral_compactacion and self.registros >= self.umbral_compactacion:
+            self.compactar()
+    
+    def _al_modificar(self, evento, *datos):
+        if evento in ('agregar_estudiante', 'actualizar_estudiante'):
+            id_est = datos[0]
+            info = self.grafo.estudiantes[id_est]
+            self._escribir(['agregar_estudiante', id_est, info['nombre'], info['carrera'], info.get('intereses', [])])
+        elif evento == 'eliminar_estudiante':
+            self._escribir(['eliminar_estudiante', datos[0]])
+        elif evento == 'agregar_amistad':
+            self._escribir(['agregar_amistad', *datos])
+        elif evento == 'actualizar_peso_amistad':
+            self._escribir(['actualizar_peso_amistad', *datos[:3]])
+        elif evento == 'eliminar_amistad':
+            self._escribir(['eliminar_amistad', *datos[:2]])
+        elif evento == 'limpiar':
+            self._escribir(['limpiar'])
+    
+    def compactar(self, esperar=False):
+        """
+        Escribe un snapshot con el estado actual y descarta el registro
+        
+        El registro actual se rota y se sigue escribiendo en uno vacio; el
+        snapshot se genera en un hilo a partir de una copia del grafo, asi
+        las modificaciones no se detienen mientras se escribe. Debe llamarse
+        desde el hilo que modifica el grafo.
+        
+        Retorna False si ya hay una compactacion en curso.
+        """
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            if esperar:
+                self._hilo_compactacion.join()
+            return False
+        
+        copia = self.grafo.copiar()
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if os.path.exists(self.archivo_rotado):
+                # Una compactacion anterior fallo: conservar sus registros
+                with open(self.archivo_rotado, 'ab') as rotado, open(self.archivo, 'rb') as actual:
+                    shutil.copyfileobj(actual, rotado)
+                os.remove(self.archivo)
+            else:
+                os.replace(self.archivo, self.archivo_rotado)
+            self._file = open(self.archivo, 'ab')
+            self.registros = 0
+            self._pendientes = 0
+        
+        self._hilo_compactacion = threading.Thread(target=self._escribir_snapshot, args=(copia,), daemon=True)
+        self._hilo_compactacion.start()
+        if esperar:
+            self._hilo_compactacion.join()
+        return True
+    
+    def _escribir_snapshot(self, copia):
+        if guardar_json(copia, self.archivo_snapshot):
+            os.remove(self.archivo_rotado)
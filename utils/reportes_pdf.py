@@ -10,7 +10,12 @@ import networkx as nx
 import os
 import tempfile
 
-def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_grafico=True):
+from algorithms.esqueleto import extraer_esqueleto
+from algorithms.nucleos import subgrafo_nucleo
+from .estadisticas import calcular_estadisticas
+
+def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_grafico=True, nucleo_minimo=None,
+                        esqueleto=False):
     """
     Genera un reporte PDF completo con estadisticas de la red
     
@@ -18,6 +23,9 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
         grafo: Instancia del grafo
         archivo: Nombre del archivo PDF de salida
         incluir_grafico: Si incluir visualizacion del grafo
+        nucleo_minimo: Si se indica, el grafico muestra solo el k-nucleo con
+            k >= nucleo_minimo (las tablas siguen describiendo toda la red)
+        esqueleto: Si el grafico muestra solo el esqueleto de amistades mas fuertes
     """
     doc = SimpleDocTemplate(archivo, pagesize=letter)
     elementos = []
@@ -50,15 +58,16 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
     # Seccion 1: Resumen Ejecutivo
     elementos.append(Paragraph("1. Resumen Ejecutivo", subtitulo_style))
     
-    num_estudiantes = len(grafo.estudiantes)
-    num_amistades = sum(len(amigos) for amigos in grafo.adj_list.values()) // 2
+    estadisticas = calcular_estadisticas(grafo, top=10)
+    num_estudiantes = estadisticas['num_estudiantes']
+    num_amistades = estadisticas['num_amistades']
     
     resumen = [
         ['Metrica', 'Valor'],
         ['Total de estudiantes', str(num_estudiantes)],
         ['Total de amistades', str(num_amistades)],
-        ['Promedio de amigos', f'{num_amistades*2/num_estudiantes:.2f}' if num_estudiantes > 0 else '0'],
-        ['Densidad de red', f'{(num_amistades / (num_estudiantes * (num_estudiantes - 1) / 2) * 100):.2f}%' if num_estudiantes > 1 else '0%']
+        ['Promedio de amigos', f"{estadisticas['promedio_amigos']:.2f}" if num_estudiantes > 0 else '0'],
+        ['Densidad de red', f"{estadisticas['densidad'] * 100:.2f}%" if num_estudiantes > 1 else '0%']
     ]
     
     tabla_resumen = Table(resumen, colWidths=[3*inch, 2*inch])
@@ -79,13 +88,8 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
     # Seccion 2: Distribucion por Carrera
     elementos.append(Paragraph("2. Distribucion por Carrera", subtitulo_style))
     
-    carreras = {}
-    for info in grafo.estudiantes.values():
-        carrera = info['carrera']
-        carreras[carrera] = carreras.get(carrera, 0) + 1
-    
     datos_carreras = [['Carrera', 'Estudiantes', 'Porcentaje']]
-    for carrera, cantidad in sorted(carreras.items(), key=lambda x: x[1], reverse=True):
+    for carrera, cantidad in estadisticas['carreras']:
         porcentaje = (cantidad / num_estudiantes * 100) if num_estudiantes > 0 else 0
         datos_carreras.append([carrera, str(cantidad), f'{porcentaje:.1f}%'])
     
@@ -108,15 +112,8 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
     # Seccion 3: Estudiantes Mas Populares
     elementos.append(Paragraph("3. Estudiantes Mas Populares", subtitulo_style))
     
-    popularidad = []
-    for id_est in grafo.estudiantes:
-        num_amigos = len(grafo.obtener_amigos(id_est))
-        popularidad.append((grafo.estudiantes[id_est]['nombre'], num_amigos, grafo.estudiantes[id_est]['carrera']))
-    
-    popularidad.sort(key=lambda x: x[1], reverse=True)
-    
     datos_populares = [['Nombre', 'Amigos', 'Carrera']]
-    for nombre, amigos, carrera in popularidad[:10]:
+    for nombre, amigos, carrera in estadisticas['populares']:
         datos_populares.append([nombre, str(amigos), carrera])
     
     tabla_populares = Table(datos_populares, colWidths=[2.5*inch, 1*inch, 2*inch])
@@ -137,15 +134,9 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
     # Seccion 4: Distribucion de Pesos de Amistades
     elementos.append(Paragraph("4. Intensidad de Amistades", subtitulo_style))
     
-    pesos = {}
-    for id1 in grafo.adj_list:
-        for id2, peso in grafo.adj_list[id1].items():
-            pesos[peso] = pesos.get(peso, 0) + 1
-    
     datos_pesos = [['Nivel', 'Tipo', 'Cantidad']]
     tipos = {1: 'Normal', 2: 'Mejor amigo', 3: 'Amigo cercano'}
-    for peso in sorted(pesos.keys()):
-        cantidad = pesos[peso] // 2
+    for peso, cantidad in estadisticas['pesos']:
         datos_pesos.append([str(peso), tipos.get(peso, 'Especial'), str(cantidad)])
     
     tabla_pesos = Table(datos_pesos, colWidths=[1.5*inch, 2*inch, 1.5*inch])
@@ -161,33 +152,82 @@ def generar_reporte_pdf(grafo, archivo='reporte_red_universitaria.pdf', incluir_
     ]))
     
     elementos.append(tabla_pesos)
+    elementos.append(Spacer(1, 0.3*inch))
+    
+    # Seccion 5: Metricas Estructurales
+    elementos.append(Paragraph("5. Metricas Estructurales", subtitulo_style))
+    
+    metricas = calcular_estadisticas(grafo, top=10, estructurales=True)['estructurales']
+    diametro = metricas['diametro']
+    datos_estructura = [
+        ['Metrica', 'Valor'],
+        ['Triangulos', str(metricas['triangulos'])],
+        ['Clustering global', f"{metricas['clustering_global']:.4f}"],
+        ['Clustering local promedio', f"{metricas['clustering_promedio']:.4f}"],
+        ['Asortatividad de grado', 'n/d' if metricas['asortatividad'] is None else f"{metricas['asortatividad']:.4f}"],
+        ['Grado maximo', str(metricas['grado_maximo'])],
+        ['Diametro efectivo (90%)', f"{diametro['diametro_efectivo']:.2f}"],
+        ['Distancia maxima observada', str(diametro['distancia_maxima'])]
+    ]
+    
+    tabla_estructura = Table(datos_estructura, colWidths=[3*inch, 2*inch])
+    tabla_estructura.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#16A085')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elementos.append(tabla_estructura)
     
     # Agregar grafico si se solicita
+    temp_img = None
     if incluir_grafico and num_estudiantes > 0:
         elementos.append(PageBreak())
-        elementos.append(Paragraph("5. Visualizacion de la Red", subtitulo_style))
+        elementos.append(Paragraph("6. Visualizacion de la Red", subtitulo_style))
         
         # Generar grafico temporal
         temp_img = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
         temp_img.close()
         
+        dibujado = grafo
+        if nucleo_minimo:
+            dibujado = subgrafo_nucleo(grafo, nucleo_minimo)
+            elementos.append(Paragraph(
+                f"Se muestra el {nucleo_minimo}-nucleo: {len(dibujado.estudiantes)} de "
+                f"{num_estudiantes} estudiantes con al menos {nucleo_minimo} amigos dentro del grupo.",
+                styles['Normal']
+            ))
+        if esqueleto:
+            dibujado = extraer_esqueleto(dibujado)
+            num_aristas = sum(len(amigos) for amigos in dibujado.adj_list.values()) // 2
+            elementos.append(Paragraph(
+                f"Se muestra el esqueleto de amistades mas fuertes: {num_aristas} de "
+                f"{num_amistades} amistades.",
+                styles['Normal']
+            ))
+        
         try:
-            _generar_grafico_para_pdf(grafo, temp_img.name)
+            _generar_grafico_para_pdf(dibujado, temp_img.name)
             img = Image(temp_img.name, width=6*inch, height=4.5*inch)
             elementos.append(img)
         except Exception as e:
             elementos.append(Paragraph(f"Error al generar grafico: {str(e)}", styles['Normal']))
-        finally:
-            if os.path.exists(temp_img.name):
-                os.unlink(temp_img.name)
     
-    # Construir PDF
+    # Construir PDF (la imagen temporal se lee recien aqui)
     try:
         doc.build(elementos)
         return True
     except Exception as e:
         print(f"Error al generar PDF: {e}")
         return False
+    finally:
+        if temp_img is not None and os.path.exists(temp_img.name):
+            os.unlink(temp_img.name)
 
 def _generar_grafico_para_pdf(grafo, archivo):
     """Genera un grafico del grafo para incluir en el PDF"""
@@ -1,8 +1,24 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 
-def visualizar_grafo(grafo):
-    """Visualiza el grafo usando networkx y matplotlib"""
+from algorithms.esqueleto import extraer_esqueleto
+from algorithms.nucleos import subgrafo_nucleo
+
+def visualizar_grafo(grafo, nucleo_minimo=None, esqueleto=False):
+    """
+    Visualiza el grafo usando networkx y matplotlib
+    
+    Args:
+        grafo: Instancia del grafo
+        nucleo_minimo: Si se indica, dibuja solo el k-nucleo con k >= nucleo_minimo
+            (util en redes grandes, donde el dibujo completo es ilegible)
+        esqueleto: Dibujar solo el esqueleto de amistades mas fuertes
+            (ver algorithms.esqueleto.extraer_esqueleto)
+    """
+    if nucleo_minimo:
+        grafo = subgrafo_nucleo(grafo, nucleo_minimo)
+    if esqueleto:
+        grafo = extraer_esqueleto(grafo)
     G = nx.Graph()
     
     # Agregar nodos
@@ -26,7 +42,7 @@ def visualizar_grafo(grafo):
     for i, carrera in enumerate(carreras):
         color_map[carrera] = colores_disponibles[i % len(colores_disponibles)]
     
-    node_colors = [color_map[grafo.estudiantes[id]['carrera']] for id in grafo.estudiantes]
+    node_colors = [color_map[G.nodes[nombre]['carrera']] for nombre in G.nodes()]
     
     # Layout
     pos = nx.spring_layout(G, k=1.5, iterations=50)
@@ -47,7 +63,12 @@ def visualizar_grafo(grafo):
         plt.plot([], [], 'o', color=color, label=carrera, markersize=10)
     plt.legend(loc='upper left', fontsize=10)
     
-    plt.title("Red de Amistades Universitarias", fontsize=16, fontweight='bold')
+    titulo = "Red de Amistades Universitarias"
+    if nucleo_minimo:
+        titulo += f" ({nucleo_minimo}-nucleo)"
+    if esqueleto:
+        titulo += " (esqueleto)"
+    plt.title(titulo, fontsize=16, fontweight='bold')
     plt.axis('off')
     plt.tight_layout()
     plt.show()
@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 
+from algorithms.esqueleto import extraer_esqueleto
+from algorithms.nucleos import subgrafo_nucleo
+
 LAYOUTS = {
     'spring': lambda G: nx.spring_layout(G, k=1.5, iterations=50),
     'circular': lambda G: nx.circular_layout(G),
@@ -10,7 +13,8 @@ LAYOUTS = {
     'random': lambda G: nx.random_layout(G)
 }
 
-def visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True, mostrar_comunidades=False, comunidades=None):
+def visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True, mostrar_comunidades=False, comunidades=None,
+                              nucleo_minimo=None, esqueleto=False):
     """
     Visualiza el grafo con opciones avanzadas de layout y estilo
     
@@ -20,7 +24,13 @@ def visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True, mostra
         mostrar_pesos: Si mostrar los pesos de las aristas
         mostrar_comunidades: Si colorear nodos por comunidades
         comunidades: Diccionario de comunidades (id_est: comunidad)
+        nucleo_minimo: Si se indica, dibuja solo el k-nucleo con k >= nucleo_minimo
+        esqueleto: Dibujar solo el esqueleto de amistades mas fuertes
     """
+    if nucleo_minimo:
+        grafo = subgrafo_nucleo(grafo, nucleo_minimo)
+    if esqueleto:
+        grafo = extraer_esqueleto(grafo)
     G = nx.Graph()
     
     # Agregar nodos
@@ -88,12 +98,17 @@ def visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True, mostra
     titulo = f"Red de Amistades - Layout: {layout.capitalize()}"
     if mostrar_comunidades:
         titulo += " (Comunidades)"
+    if nucleo_minimo:
+        titulo += f" ({nucleo_minimo}-nucleo)"
+    if esqueleto:
+        titulo += " (esqueleto)"
     
     plt.title(titulo, fontsize=18, fontweight='bold', pad=20)
     plt.axis('off')
     plt.tight_layout()
     plt.show()
 
-def visualizar_grafo(grafo):
+def visualizar_grafo(grafo, nucleo_minimo=None, esqueleto=False):
     """Visualizacion basica para compatibilidad"""
-    visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True)
+    visualizar_grafo_avanzado(grafo, layout='spring', mostrar_pesos=True, nucleo_minimo=nucleo_minimo,
+                              esqueleto=esqueleto)